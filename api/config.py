@@ -14,6 +14,7 @@ class Settings(BaseSettings):
 
     # API Keys
     OPENROUTER_API_KEY: str = ""
+    ANTHROPIC_API_KEY: str = ""  # Only needed for LLM_BATCH_MODE
 
     # AWS (optional, for S3 support)
     AWS_ACCESS_KEY_ID: str = ""
@@ -37,6 +38,7 @@ class Settings(BaseSettings):
 
     # LLM Settings
     LLM_MODEL: str = "anthropic/claude-sonnet-4"
+    LLM_BATCH_MODE: bool = False  # Anthropic Message Batches: half price, results can take hours
 
     # LangWatch Integration
     LANGWATCH_API_KEY: str = ""
@@ -112,7 +112,9 @@ class JobManager:
                 jobs_base_dir=settings.JOBS_DIR,
                 openrouter_api_key=settings.OPENROUTER_API_KEY,
                 llm_model=settings.LLM_MODEL,
-                progress_callback=update_progress
+                progress_callback=update_progress,
+                llm_batch_mode=settings.LLM_BATCH_MODE,
+                anthropic_api_key=settings.ANTHROPIC_API_KEY
             )
 
             results = orchestrator.run_pipeline(
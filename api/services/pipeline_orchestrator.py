@@ -84,7 +84,9 @@ class PipelineOrchestrator:
         jobs_base_dir: str = "./jobs",
         openrouter_api_key: str = None,
         llm_model: str = "anthropic/claude-sonnet-4",
-        progress_callback: Optional[Callable[[str, int, str], None]] = None
+        progress_callback: Optional[Callable[[str, int, str], None]] = None,
+        llm_batch_mode: bool = False,
+        anthropic_api_key: str = None
     ):
         """
         Initialize the pipeline orchestrator.
@@ -95,12 +97,16 @@ class PipelineOrchestrator:
             openrouter_api_key: API key for OpenRouter
             llm_model: LLM model to use for transformation
             progress_callback: Callback function(stage, percent, message)
+            llm_batch_mode: Use the Anthropic Message Batches API for Stage 2
+            anthropic_api_key: API key for Anthropic (required for batch mode)
         """
         self.job_id = job_id
         self.job_dir = Path(jobs_base_dir) / job_id
         self.jobs_base_dir = jobs_base_dir
         self.api_key = openrouter_api_key
         self.llm_model = llm_model
+        self.llm_batch_mode = llm_batch_mode
+        self.anthropic_api_key = anthropic_api_key
         self.progress_callback = progress_callback
 
         # Create job directories
@@ -516,7 +522,9 @@ class PipelineOrchestrator:
             model=self.llm_model,
             enable_ahri_enrichment=enable_ahri,
             job_id=self.job_id,
-            job_logger=self.job_logger
+            job_logger=self.job_logger,
+            batch_mode=self.llm_batch_mode,
+            anthropic_api_key=self.anthropic_api_key
         )
 
         result = transformer.transform(
@@ -17,8 +17,8 @@ from .classifiers import (
     should_skip_sheet, classify_sheets,
     should_skip_table, classify_tables
 )
-from .pipelines import process_excel_bronze, process_pdf_bronze
-from .llm_client import LLMClient
+from .pipelines import process_excel_bronze, iter_excel_bronze, process_pdf_bronze
+from .llm_client import LLMClient, CircuitOpenError, RateLimitError
 
 # LEGACY: Code generation approach
 from .architect import Architect
@@ -46,9 +46,12 @@ __all__ = [
     'classify_tables',
     # Pipelines
     'process_excel_bronze',
+    'iter_excel_bronze',
     'process_pdf_bronze',
     # LLM client
     'LLMClient',
+    'CircuitOpenError',
+    'RateLimitError',
     # Legacy classes
     'Architect',
     'CSVSampler'
@@ -3,7 +3,14 @@ Batchers for grouping data by source (sheet/table) before LLM processing
 """
 
 from .sheet_batcher import batch_by_sheet, get_sheet_stats, batch_large_sheet
-from .table_batcher import batch_by_table, get_table_stats, batch_large_table, batch_raw_docling_tables
+from .table_batcher import (
+    batch_by_table,
+    get_table_stats,
+    batch_large_table,
+    batch_raw_docling_tables,
+    estimate_tokens_per_record,
+    compute_batch_size,
+)
 
 __all__ = [
     'batch_by_sheet',
@@ -13,4 +20,6 @@ __all__ = [
     'get_table_stats',
     'batch_large_table',
     'batch_raw_docling_tables',
+    'estimate_tokens_per_record',
+    'compute_batch_size',
 ]
@@ -5,8 +5,16 @@ Utility for batching bronze layer JSON records by source table (PDF)
 import logging
 from typing import Dict, List
 
+import orjson
+
 logger = logging.getLogger(__name__)
 
+# Row-marshaling defaults for legacy flattened tables
+DEFAULT_RECORD_TOKEN_BUDGET = 8000  # Estimated input tokens of records per LLM call
+MIN_BATCH_SIZE = 30                 # Never batch smaller than the old fixed size
+MAX_BATCH_SIZE = 100                # Output grows with input; keeps responses under max_tokens
+TOKEN_ESTIMATE_SAMPLE = 50          # Records sampled for the token estimate
+
 
 def batch_by_table(bronze_data: List[dict]) -> Dict[str, List[dict]]:
     """
@@ -84,6 +92,49 @@ def batch_large_table(records: List[dict], batch_size: int = 30) -> List[List[di
     return batches
 
 
+def estimate_tokens_per_record(records: List[dict]) -> float:
+    """
+    Estimate average prompt tokens per record (~4 characters per token)
+
+    Args:
+        records: List of records from a table
+
+    Returns:
+        Estimated tokens per record (0 for an empty list)
+    """
+    if not records:
+        return 0.0
+
+    sample = records[:TOKEN_ESTIMATE_SAMPLE]
+    serialized = orjson.dumps(sample, option=orjson.OPT_NON_STR_KEYS, default=str)
+    return len(serialized) / 4 / len(sample)
+
+
+def compute_batch_size(records: List[dict], max_tokens_budget: int = DEFAULT_RECORD_TOKEN_BUDGET) -> int:
+    """
+    Pick how many records to marshal into one LLM call
+
+    Fills max_tokens_budget with as many records as fit, clamped to
+    [MIN_BATCH_SIZE, MAX_BATCH_SIZE], so fewer round trips are needed for
+    tables with small rows.
+
+    Args:
+        records: List of records from a table
+        max_tokens_budget: Estimated input tokens of records allowed per call
+
+    Returns:
+        Records per batch
+    """
+    tokens_per_record = estimate_tokens_per_record(records)
+    if tokens_per_record <= 0:
+        return MIN_BATCH_SIZE
+
+    batch_size = int(max_tokens_budget // tokens_per_record)
+    batch_size = max(MIN_BATCH_SIZE, min(batch_size, MAX_BATCH_SIZE))
+    logger.info(f"Batch size {batch_size} (~{tokens_per_record:.0f} tokens/record, budget {max_tokens_budget})")
+    return batch_size
+
+
 def batch_raw_docling_tables(docling_data: dict) -> Dict[str, dict]:
     """
     Batch raw Docling PDF tables for individual processing
@@ -69,7 +69,9 @@ class BronzeJSONTransformer:
         model: str = "anthropic/claude-sonnet-4.5",
         enable_ahri_enrichment: bool = False,
         job_id: Optional[str] = None,
-        job_logger: Optional[Any] = None
+        job_logger: Optional[Any] = None,
+        batch_mode: bool = False,
+        anthropic_api_key: Optional[str] = None
     ):
         """
         Initialize transformer
@@ -80,9 +82,17 @@ class BronzeJSONTransformer:
             enable_ahri_enrichment: Enable AHRI enrichment for missing data
             job_id: Optional job ID for lineage tracking
             job_logger: Optional JobLogger for structured logging
+            batch_mode: Transform Excel sheets via the Anthropic Message Batches API
+                        (half price, results can take hours - for non-interactive runs)
+            anthropic_api_key: Anthropic API key, required for batch_mode
         """
         self.api_key = api_key
-        self.llm_client = LLMClient(api_key, model=model)
+        self.llm_client = LLMClient(
+            api_key,
+            model=model,
+            batch_mode=batch_mode,
+            anthropic_api_key=anthropic_api_key
+        )
         self.enable_ahri_enrichment = enable_ahri_enrichment
         self.job_id = job_id
         self.job_logger = job_logger
@@ -90,6 +100,8 @@ class BronzeJSONTransformer:
         logger.info(f"Initialized BronzeJSONTransformer with model: {model}")
         if enable_ahri_enrichment:
             logger.info("AHRI enrichment: ENABLED")
+        if batch_mode:
+            logger.info("Batch mode: ENABLED (Anthropic Message Batches API)")
 
     def _load_prompt_template(self, source_type: str) -> str:
         """
@@ -167,7 +179,8 @@ class BronzeJSONTransformer:
             pipeline_result = process_excel_bronze(
                 bronze_data,
                 llm_transform_fn=self._transform_source,
-                prompt_template=self.prompt_template
+                prompt_template=self.prompt_template,
+                batch_transform_fn=self._transform_sources_batch if self.llm_client.batch_mode else None
             )
             source_results_key = 'sheet_results'
         elif source_type == 'pdf':
@@ -175,7 +188,8 @@ class BronzeJSONTransformer:
             pipeline_result = process_pdf_bronze(
                 bronze_data,
                 llm_transform_fn=self._transform_source,
-                prompt_template=self.prompt_template
+                prompt_template=self.prompt_template,
+                group_transform_fn=self._transform_tables_group
             )
             source_results_key = 'table_results'
         else:
@@ -381,24 +395,17 @@ class BronzeJSONTransformer:
             input_type = "records"
 
         # Call LLM with increased max_tokens for larger outputs
+        # Systems are parsed incrementally as the response streams in
         start_time = datetime.now()
-        response = self.llm_client.transform_data(
+        systems = list(self.llm_client.stream_transform_data(
             prompt,
             max_tokens=25000,
             job_logger=self.job_logger
-        )
+        ))
         end_time = datetime.now()
 
         processing_time = (end_time - start_time).total_seconds()
 
-        # Parse response
-        silver_data = json.loads(response)
-
-        if "systems" not in silver_data:
-            raise ValueError(f"LLM response missing 'systems' key")
-
-        systems = silver_data["systems"]
-
         metadata = {
             "source_name": source_name,
             f"input_{input_type}": input_count,
@@ -409,6 +416,90 @@ class BronzeJSONTransformer:
 
         return systems, metadata
 
+    def _transform_sources_batch(self, sources: List[tuple]) -> Dict[str, Any]:
+        """
+        Transform many sources (sheets/batches) in a single LLM batch
+
+        Args:
+            sources: List of (source_name, records) tuples
+
+        Returns:
+            Dictionary mapping source_name to (systems_list, metadata_dict),
+            or to the Exception that made that source fail
+        """
+        prompts = [(source_name, self._build_prompt(source_name, records)) for source_name, records in sources]
+
+        start_time = datetime.now()
+        batch_results = self.llm_client.batch_transform_data(
+            prompts,
+            max_tokens=25000,
+            job_logger=self.job_logger
+        )
+        processing_time = (datetime.now() - start_time).total_seconds()
+
+        results = {}
+        for source_name, records in sources:
+            systems = batch_results.get(source_name)
+            if systems is None or isinstance(systems, Exception):
+                results[source_name] = systems or Exception(f"No batch result for '{source_name}'")
+                continue
+
+            results[source_name] = (systems, {
+                "source_name": source_name,
+                "input_records": len(records),
+                "output_systems": len(systems),
+                "processing_time_seconds": round(processing_time, 2),
+                "format": "flat_records",
+                "batch_mode": True
+            })
+
+        return results
+
+    def _transform_tables_group(self, group_name: str, tables: List[tuple]) -> Dict[str, Any]:
+        """
+        Transform several small Docling tables in a single LLM call
+
+        The model tags each system with metadata.source_table, which is used
+        to split the response back into per-table results.
+
+        Args:
+            group_name: Label for the group (used in logs)
+            tables: List of (table_name, table_data) tuples in cell format
+
+        Returns:
+            Dictionary mapping table_name to (systems_list, metadata_dict)
+        """
+        prompt = self._build_prompt_for_table_group(tables)
+
+        start_time = datetime.now()
+        systems = list(self.llm_client.stream_transform_data(
+            prompt,
+            max_tokens=25000,
+            job_logger=self.job_logger
+        ))
+        processing_time = (datetime.now() - start_time).total_seconds()
+
+        systems_by_table = {table_name: [] for table_name, _ in tables}
+        for system in systems:
+            table_name = (system.get('metadata') or {}).get('source_table')
+            if table_name not in systems_by_table:
+                raise Exception(f"{group_name}: system not attributed to a known table (source_table={table_name!r})")
+            systems_by_table[table_name].append(system)
+
+        results = {}
+        for table_name, table_data in tables:
+            table_systems = systems_by_table[table_name]
+            results[table_name] = (table_systems, {
+                "source_name": table_name,
+                "input_cells": len(table_data.get('cells', [])),
+                "output_systems": len(table_systems),
+                "processing_time_seconds": round(processing_time, 2),
+                "format": "cell_based",
+                "group": group_name
+            })
+
+        return results
+
     def _build_prompt(self, source_name: str, records: List[dict]) -> str:
         """
         Build complete prompt for LLM (flat records format)
@@ -497,6 +588,58 @@ Remember to output ONLY the JSON object (starting with {{ and ending with }}).
 
         return full_prompt
 
+    def _build_prompt_for_table_group(self, tables: List[tuple]) -> str:
+        """
+        Build one prompt covering several small Docling tables
+
+        Args:
+            tables: List of (table_name, table_data) tuples in cell format
+
+        Returns:
+            Complete prompt string
+        """
+        table_names = ", ".join(f"**{table_name}**" for table_name, _ in tables)
+
+        # Add context about the sources
+        source_context = f"""
+## SOURCE CONTEXT
+
+You are processing {len(tables)} small PDF tables in one request: {table_names}
+
+Each table is introduced by a `---TABLE: <name>---` line. Each cell has:
+- text: The cell content
+- row, col: Position in the table (0-indexed)
+- row_span, col_span: How many rows/columns the cell spans
+- is_column_header: True if this is a column header
+- is_row_header: True if this is a row header
+
+Treat every table independently: never combine cells from different tables into one system.
+"""
+
+        # Add the input data, one delimited section per table (compact JSON)
+        sections = "\n".join(
+            f"---TABLE: {table_name}---\n{json.dumps(table_data)}" for table_name, table_data in tables
+        )
+        input_data = f"""
+## INPUT DATA (Bronze Layer JSON - Docling Cell Format)
+
+{sections}
+"""
+
+        # Add instruction
+        instruction = """
+
+Transform the above bronze layer data into silver layer format following the schema and guidelines provided above.
+Use the cell positions (row, col) and header flags to reconstruct each table's structure.
+Set metadata.source_table on EVERY system to the exact name from its ---TABLE: <name>--- line.
+Remember to output ONLY the JSON object (starting with {{ and ending with }}).
+"""
+
+        # Combine: base prompt + source context + input data + instruction
+        full_prompt = self.prompt_template + source_context + input_data + instruction
+
+        return full_prompt
+
     def _save_silver_json(self, bronze_path: str, silver_data: dict, output_dir: str = None) -> str:
         """Save silver layer JSON"""
         # Determine output directory
@@ -531,17 +674,19 @@ def main():
     # Try to load API key from .env file
     env_path = Path(__file__).parent.parent.parent / '.env'
     api_key = None
+    anthropic_api_key = os.environ.get('ANTHROPIC_API_KEY')
 
     if env_path.exists():
         with open(env_path) as f:
             for line in f:
                 if line.startswith('OPENROUTER_API_KEY='):
                     api_key = line.strip().split('=', 1)[1]
-                    break
+                elif line.startswith('ANTHROPIC_API_KEY=') and not anthropic_api_key:
+                    anthropic_api_key = line.strip().split('=', 1)[1]
 
     # Check command line arguments
     if len(sys.argv) < 2:
-        print("Usage: python -m src.stage2_architect.bronze_json_transformer <bronze_json_path> [api_key] [model] [--enable-ahri-enrichment] [--verbose]")
+        print("Usage: python -m src.stage2_architect.bronze_json_transformer <bronze_json_path> [api_key] [model] [--enable-ahri-enrichment] [--batch-mode] [--verbose]")
         print("Example: python -m src.stage2_architect.bronze_json_transformer data/bronze/GE_NDP_UPDATE_09_2025.json")
         print("Example with enrichment: python -m src.stage2_architect.bronze_json_transformer data/bronze/GE_NDP_UPDATE_09_2025.json --enable-ahri-enrichment")
         print("Example with verbose logging: python -m src.stage2_architect.bronze_json_transformer data/bronze/GE_NDP_UPDATE_09_2025.json --verbose")
@@ -553,6 +698,7 @@ def main():
         print("  Alternative: anthropic/claude-sonnet-4-20250514")
         print("\nOptions:")
         print("  --enable-ahri-enrichment    Enable AHRI enrichment for systems with missing data")
+        print("  --batch-mode                Use the Anthropic Message Batches API (half price, slow; needs ANTHROPIC_API_KEY)")
         print("  --verbose                   Enable verbose (DEBUG) logging with detailed API info")
         sys.exit(1)
 
@@ -560,6 +706,7 @@ def main():
 
     # Check for flags (can be anywhere in args)
     enable_ahri_enrichment = '--enable-ahri-enrichment' in sys.argv
+    batch_mode = '--batch-mode' in sys.argv
     verbose = '--verbose' in sys.argv
 
     # Set up logging based on verbose flag
@@ -606,7 +753,13 @@ def main():
         model = sys.argv[3]
 
     try:
-        transformer = BronzeJSONTransformer(api_key, model=model, enable_ahri_enrichment=enable_ahri_enrichment)
+        transformer = BronzeJSONTransformer(
+            api_key,
+            model=model,
+            enable_ahri_enrichment=enable_ahri_enrichment,
+            batch_mode=batch_mode,
+            anthropic_api_key=anthropic_api_key
+        )
         result = transformer.transform(bronze_json_path)
 
         print("\n=== Transformation Complete ===")
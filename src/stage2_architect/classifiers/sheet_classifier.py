@@ -13,7 +13,10 @@ Processes:
 - Multi-component sheets with efficiency ratings
 """
 
+import hashlib
 import logging
+import threading
+from collections import OrderedDict
 from typing import List, Dict, Tuple
 
 logger = logging.getLogger(__name__)
@@ -52,6 +55,13 @@ SYSTEM_INDICATOR_KEYS = [
 
 MIN_INDICATORS_FOR_SYSTEM = 3  # Need at least 3 populated indicators to be a system sheet
 
+# Classification only looks at the sheet name and its first 10 records, so results
+# are memoized on a hash of those (reruns of the same workbook skip the analysis)
+CLASSIFICATION_SAMPLE_SIZE = 10
+CLASSIFICATION_CACHE_SIZE = 1024
+_classification_cache: "OrderedDict[str, Tuple[bool, str]]" = OrderedDict()
+_classification_cache_lock = threading.Lock()
+
 
 def should_skip_sheet(sheet_name: str, records: List[dict]) -> Tuple[bool, str]:
     """
@@ -204,6 +214,39 @@ def _calculate_non_null_ratio(records: List[dict]) -> float:
     return non_null_cells / total_cells
 
 
+def _classification_key(sheet_name: str, records: List[dict]) -> str:
+    """
+    Hash the inputs should_skip_sheet() depends on (BLAKE2b: fast, fine for a cache key)
+
+    Records are keyed on repr, not JSON: JSON writes NaN and None both as null
+    (and 1 and "1" keys alike), but should_skip_sheet treats them differently.
+    """
+    digest = hashlib.blake2b(sheet_name.encode('utf-8'), digest_size=8)
+    digest.update(repr(records[:CLASSIFICATION_SAMPLE_SIZE]).encode('utf-8'))
+    return digest.hexdigest()
+
+
+def _classify_sheet_cached(sheet_name: str, records: List[dict]) -> Tuple[bool, str]:
+    """should_skip_sheet() memoized on sheet content"""
+    key = _classification_key(sheet_name, records)
+
+    with _classification_cache_lock:
+        cached = _classification_cache.get(key)
+        if cached is not None:
+            _classification_cache.move_to_end(key)
+            logger.debug(f"Using cached classification for sheet '{sheet_name}'")
+            return cached
+
+    result = should_skip_sheet(sheet_name, records)
+
+    with _classification_cache_lock:
+        _classification_cache[key] = result
+        if len(_classification_cache) > CLASSIFICATION_CACHE_SIZE:
+            _classification_cache.popitem(last=False)
+
+    return result
+
+
 def classify_sheets(sheets_dict: Dict[str, List[dict]]) -> Dict[str, Dict]:
     """
     Classify all sheets and return classification results
@@ -217,7 +260,7 @@ def classify_sheets(sheets_dict: Dict[str, List[dict]]) -> Dict[str, Dict]:
     results = {}
 
     for sheet_name, records in sheets_dict.items():
-        should_skip, reason = should_skip_sheet(sheet_name, records)
+        should_skip, reason = _classify_sheet_cached(sheet_name, records)
 
         results[sheet_name] = {
             'skip': should_skip,
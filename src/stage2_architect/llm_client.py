@@ -4,24 +4,112 @@ OpenRouter API client for calling Claude Sonnet 4.5
 Includes LangWatch integration for LLM tracing and observability.
 """
 
-import requests
-import json
+import httpx
+import atexit
+import hashlib
 import logging
+import orjson
+import random
+import re
+import threading
 import time
-from typing import Dict, Any, Optional, Callable
-from requests.exceptions import ChunkedEncodingError, ConnectionError, Timeout
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Dict, Any, Optional, Callable, Iterator, List, Tuple, Union
 
 logger = logging.getLogger(__name__)
 
 # Retry configuration for transient API failures
 MAX_RETRIES = 3
-RETRY_DELAY_BASE = 2  # seconds (exponential backoff: 2s, 4s, 8s)
+RETRY_DELAY_BASE = 2  # seconds (full-jitter exponential backoff: up to 2s, 4s, 8s)
 RETRYABLE_EXCEPTIONS = (
-    ChunkedEncodingError,  # Response ended prematurely
-    ConnectionError,       # Network connectivity issues
-    Timeout,              # Request took too long
+    httpx.RemoteProtocolError,  # Response ended prematurely
+    httpx.NetworkError,         # Network connectivity issues
+    httpx.TimeoutException,     # Request took too long
 )
 
+# Circuit breaker configuration: fail fast once OpenRouter is known to be down
+BREAKER_FAILURE_THRESHOLD = 5  # retryable failures...
+BREAKER_WINDOW = 60            # ...within this many seconds open the breaker
+BREAKER_COOLDOWN = 30          # seconds to fail fast before trying again
+
+# Anthropic Message Batches API (batch mode: ~50% cheaper, results within 24h)
+ANTHROPIC_BATCHES_ENDPOINT = "https://api.anthropic.com/v1/messages/batches"
+ANTHROPIC_VERSION = "2023-06-01"
+BATCH_POLL_INITIAL = 30        # seconds between status polls, doubling...
+BATCH_POLL_MAX = 600           # ...up to this cap
+BATCH_TIMEOUT = 24 * 60 * 60   # Anthropic expires unfinished batches after 24h
+
+# OpenRouter model ids whose Anthropic name isn't a simple prefix strip
+_ANTHROPIC_MODEL_ALIASES = {
+    "anthropic/claude-sonnet-4": "claude-sonnet-4-0",
+    "anthropic/claude-sonnet-4.5": "claude-sonnet-4-5",
+}
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling OpenRouter while the circuit breaker is open"""
+    pass
+
+
+class RateLimitError(Exception):
+    """Raised when OpenRouter answers 429; retry_after holds the server's hint in seconds, if any"""
+
+    def __init__(self, message: str, retry_after: Optional[float] = None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+def _parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Parse a Retry-After header given in seconds (HTTP-date values are ignored)"""
+    try:
+        return max(float(value), 0.0) if value is not None else None
+    except ValueError:
+        return None
+
+
+class _CircuitBreaker:
+    """
+    Thread-safe circuit breaker shared by all LLMClient instances
+
+    Opens for BREAKER_COOLDOWN seconds after BREAKER_FAILURE_THRESHOLD retryable
+    failures within BREAKER_WINDOW seconds. Any successful call resets the count.
+    """
+
+    def __init__(self, threshold: int, window: float, cooldown: float):
+        self.threshold = threshold
+        self.window = window
+        self.cooldown = cooldown
+        self.open_until = 0.0
+        self._failures = deque()
+        self._lock = threading.Lock()
+
+    def is_open(self) -> bool:
+        return time.monotonic() < self.open_until
+
+    def check(self) -> None:
+        """Raise CircuitOpenError if calls should currently fail fast"""
+        remaining = self.open_until - time.monotonic()
+        if remaining > 0:
+            raise CircuitOpenError(f"OpenRouter circuit breaker is open, failing fast for another {remaining:.0f}s")
+
+    def record_failure(self) -> None:
+        now = time.monotonic()
+        with self._lock:
+            while self._failures and now - self._failures[0] > self.window:
+                self._failures.popleft()
+            self._failures.append(now)
+            if len(self._failures) >= self.threshold:
+                self.open_until = now + self.cooldown
+                self._failures.clear()
+                logger.error(f"❌ {self.threshold} LLM API failures within {self.window}s - "
+                             f"circuit breaker open for {self.cooldown}s")
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._failures.clear()
+
 # LangWatch integration - import with graceful fallback
 try:
     from api.services.langwatch_service import (
@@ -38,11 +126,271 @@ except ImportError:
     @contextmanager
     def create_llm_span(name): yield None
 
+# Incremental JSON parsing for streamed responses - import with graceful fallback
+try:
+    import ijson
+    _ijson_available = True
+except ImportError:
+    _ijson_available = False
+
+# HTTP/2 support needs the optional h2 package (httpx[http2])
+try:
+    import h2  # noqa: F401
+    _http2_available = True
+except ImportError:
+    _http2_available = False
+
+# Lenient JSON5 parser used as the last repair tier - import with graceful fallback
+try:
+    import json5
+    _json5_available = True
+except ImportError:
+    _json5_available = False
+
+_TRAILING_COMMA_RE = re.compile(r',(\s*[}\]])')
+_SMART_QUOTES = str.maketrans({'\u201c': '"', '\u201d': '"'})
+_CONTROL_CHAR_ESCAPES = {'\n': '\\n', '\r': '\\r', '\t': '\\t'}
+
+
+def _strip_code_fences(content: str) -> str:
+    """Remove markdown code blocks (```json ... ```) wrapped around LLM output"""
+    if not content.startswith('```'):
+        return content
+
+    logger.debug("Removing markdown code blocks from response")
+    lines = content.split('\n')
+    # Find first line after ``` and last line before ```
+    start_idx = 1
+    end_idx = len(lines) - 1
+    while start_idx < len(lines) and (lines[start_idx].strip() == '' or lines[start_idx].strip().startswith('```') or lines[start_idx].strip() == 'json'):
+        start_idx += 1
+    while end_idx > 0 and (lines[end_idx].strip() == '' or lines[end_idx].strip().startswith('```')):
+        end_idx -= 1
+    content = '\n'.join(lines[start_idx:end_idx + 1])
+    logger.debug(f"Cleaned content length: {len(content)} characters")
+    return content
+
+
+def _safe_body_preview(response, n: int = 1000) -> str:
+    """
+    First n bytes of a response body for error logs
+
+    Decodes only the preview (never the whole body), and reads just enough of an
+    unread streamed response instead of buffering all of it.
+    """
+    if response is None:
+        return ''
+    try:
+        body = response.content
+    except httpx.ResponseNotRead:
+        body = b''
+        for chunk in response.iter_bytes():
+            body += chunk
+            if len(body) >= n:
+                break
+        response.close()
+    return body[:n].decode('utf-8', errors='replace')
+
+
+def _escape_control_chars_in_strings(text: str) -> str:
+    """Escape raw newlines, tabs and other control characters inside JSON string literals"""
+    out = []
+    in_string = False
+    escaped = False
+    for ch in text:
+        if in_string:
+            if escaped:
+                escaped = False
+            elif ch == '\\':
+                escaped = True
+            elif ch == '"':
+                in_string = False
+            elif ch < ' ':
+                out.append(_CONTROL_CHAR_ESCAPES.get(ch, f'\\u{ord(ch):04x}'))
+                continue
+        elif ch == '"':
+            in_string = True
+        out.append(ch)
+    return ''.join(out)
+
+
+def _try_parse_json(content: str) -> Optional[Any]:
+    """
+    Parse LLM JSON output, repairing common syntax slips before giving up
+
+    Tiers, cheapest first: strict orjson, then trailing commas and unescaped
+    control characters, then smart quotes, then json5 (if installed).
+    A repaired parse saves re-running the whole LLM call.
+
+    Returns:
+        Parsed JSON value, or None if no tier could parse it
+    """
+    try:
+        return orjson.loads(content)
+    except orjson.JSONDecodeError as e:
+        logger.warning(f"⚠️ Strict JSON parse failed, attempting repair: {e}")
+
+    repaired = _TRAILING_COMMA_RE.sub(r'\1', _escape_control_chars_in_strings(content))
+    try:
+        parsed = orjson.loads(repaired)
+        logger.info("🔧 Repaired LLM JSON (tier: trailing commas/control characters)")
+        return parsed
+    except orjson.JSONDecodeError:
+        pass
+
+    try:
+        parsed = orjson.loads(repaired.translate(_SMART_QUOTES))
+        logger.info("🔧 Repaired LLM JSON (tier: smart quotes)")
+        return parsed
+    except orjson.JSONDecodeError:
+        pass
+
+    if _json5_available:
+        try:
+            parsed = json5.loads(repaired)
+            logger.info("🔧 Repaired LLM JSON (tier: json5)")
+            return parsed
+        except Exception as e:
+            logger.debug(f"json5 parse failed: {e}")
+
+    return None
+
+
+def _iter_sse_events(response) -> Iterator[Dict[str, Any]]:
+    """
+    Iterate the JSON events of an OpenRouter server-sent-events stream
+
+    Skips keep-alive comments (": OPENROUTER PROCESSING") and stops at "data: [DONE]".
+    """
+    for line in response.iter_lines():
+        if not line or not line.startswith('data:'):
+            continue
+        data = line[5:].strip()
+        if data == '[DONE]':
+            break
+        yield orjson.loads(data)
+
+
+class _StreamedContentFilter:
+    """
+    Strips markdown code fences from streamed content before it reaches the JSON parser
+
+    Drops everything before the first '{' (e.g. "```json\n") and everything from
+    the closing fence onwards. Trailing backticks are held back between chunks in
+    case the closing fence is split across two deltas.
+    """
+
+    def __init__(self):
+        self._started = False
+        self._finished = False
+        self._pending = ''
+
+    def feed(self, chunk: str) -> str:
+        if self._finished:
+            return ''
+
+        chunk = self._pending + chunk
+        self._pending = ''
+
+        if not self._started:
+            start = chunk.find('{')
+            if start < 0:
+                self._pending = chunk
+                return ''
+            self._started = True
+            chunk = chunk[start:]
+
+        end = chunk.find('```')
+        if end >= 0:
+            self._finished = True
+            return chunk[:end]
+
+        stripped = chunk.rstrip('`')
+        self._pending = chunk[len(stripped):]
+        return stripped
+
+    def flush(self) -> str:
+        tail = '' if self._finished or not self._started else self._pending
+        self._pending = ''
+        return tail
+
+
+# Background pool for post-response bookkeeping (JobLogger + LineageService writes)
+_obs_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="llm-obs")
+atexit.register(_obs_executor.shutdown, wait=True)  # Drain pending records on exit
+
+
+@dataclass
+class _ObsPayload:
+    """Everything needed to record one LLM call after the response is returned"""
+    prompt: str
+    prompt_hash: str
+    content: str
+    usage: Dict[str, Any]
+    elapsed_time: float
+    model: str
+    job_logger: Any
+    trace_id: Optional[str]
+
+
+def _record_observability(payload: _ObsPayload) -> None:
+    """Forward a completed LLM call to JobLogger and LineageService (runs on _obs_executor)"""
+    tokens = {
+        "prompt_tokens": payload.usage.get('prompt_tokens', 0),
+        "completion_tokens": payload.usage.get('completion_tokens', 0),
+        "total_tokens": payload.usage.get('total_tokens', 0),
+    }
+    duration_ms = int(payload.elapsed_time * 1000)
+    job_logger = payload.job_logger
+
+    # Structured logging via JobLogger
+    try:
+        job_logger.llm_call(
+            prompt_preview=payload.prompt,
+            response_preview=payload.content,
+            tokens=tokens,
+            duration_ms=duration_ms,
+            model=payload.model,
+            trace_id=payload.trace_id
+        )
+    except Exception as e:
+        logger.debug(f"Failed to log LLM call to job logger: {e}")
+
+    # Also record to LineageService for database storage (powers dashboard metrics)
+    if hasattr(job_logger, 'job_id') and job_logger.job_id:
+        try:
+            from api.services.lineage_service import LineageService
+            from api.database.connection import get_db
+
+            with get_db() as db:
+                lineage_service = LineageService(db)
+                lineage_service.record_llm_call(
+                    job_id=job_logger.job_id,
+                    prompt_hash=payload.prompt_hash,
+                    prompt_preview=payload.prompt[:500],
+                    response_preview=payload.content[:500],
+                    tokens=tokens,
+                    duration_ms=duration_ms,
+                    model=payload.model,
+                    trace_id=payload.trace_id
+                )
+        except Exception as e:
+            logger.debug(f"Failed to record LLM call to lineage: {e}")
+
 
 class LLMClient:
     """Client for OpenRouter API"""
 
-    def __init__(self, api_key: str, model: str = "anthropic/claude-sonnet-4.5"):
+    # Shared across instances: an OpenRouter outage affects every client
+    _breaker = _CircuitBreaker(BREAKER_FAILURE_THRESHOLD, BREAKER_WINDOW, BREAKER_COOLDOWN)
+
+    def __init__(
+        self,
+        api_key: str,
+        model: str = "anthropic/claude-sonnet-4.5",
+        batch_mode: bool = False,
+        anthropic_api_key: Optional[str] = None
+    ):
         """
         Initialize LLM client
 
@@ -52,11 +400,44 @@ class LLMClient:
                    Common alternatives:
                    - "anthropic/claude-sonnet-4.5" (default)
                    - "anthropic/claude-sonnet-4-20250514" (if above doesn't work)
+            batch_mode: Send bulk transformations through the Anthropic Message
+                        Batches API (half price, but results can take hours)
+            anthropic_api_key: Anthropic API key, required when batch_mode is enabled
         """
+        if batch_mode and not anthropic_api_key:
+            raise ValueError("batch_mode requires an Anthropic API key (OpenRouter has no batch API)")
+
         self.api_key = api_key
+        self.batch_mode = batch_mode
         self.endpoint = "https://openrouter.ai/api/v1/chat/completions"
         self.model = model
 
+        # Shared client: one keep-alive connection to OpenRouter, multiplexed over HTTP/2
+        # when h2 is installed, so concurrent calls don't each open a TLS connection.
+        # httpx requests gzip-compressed responses by default.
+        # Request bodies are pre-serialized with orjson and sent as raw bytes.
+        self.client = httpx.Client(
+            http2=_http2_available,
+            timeout=180,  # Longer timeout for data transformation
+            headers={
+                "Authorization": f"Bearer {self.api_key}",
+                "Content-Type": "application/json",
+                "HTTP-Referer": "https://github.com/hvac-etl",
+            }
+        )
+
+        # Separate client so the OpenRouter key is never sent to Anthropic
+        self.anthropic_client = None
+        if batch_mode:
+            self.anthropic_client = httpx.Client(
+                timeout=180,
+                headers={
+                    "x-api-key": anthropic_api_key,
+                    "anthropic-version": ANTHROPIC_VERSION,
+                    "Content-Type": "application/json",
+                }
+            )
+
     def generate_transformer(self, prompt: str) -> str:
         """
         Call LLM to generate transformer code
@@ -73,9 +454,6 @@ class LLMClient:
         logger.info(f"Calling LLM: {self.model}")
 
         headers = {
-            "Authorization": f"Bearer {self.api_key}",
-            "Content-Type": "application/json",
-            "HTTP-Referer": "https://github.com/hvac-etl",
             "X-Title": "HVAC ETL Pipeline"
         }
 
@@ -92,7 +470,7 @@ class LLMClient:
         }
 
         try:
-            response = requests.post(
+            response = self.client.post(
                 self.endpoint,
                 headers=headers,
                 json=payload,
@@ -126,28 +504,201 @@ class LLMClient:
 
             return code
 
-        except requests.exceptions.RequestException as e:
+        except httpx.HTTPError as e:
             logger.error(f"API request failed: {e}")
             raise Exception(f"LLM API call failed: {str(e)}")
         except Exception as e:
             logger.error(f"Unexpected error: {e}")
             raise
 
+    @classmethod
+    def is_circuit_open(cls) -> bool:
+        """True while the circuit breaker is failing calls fast"""
+        return cls._breaker.is_open()
+
+    def _transform_headers(self) -> Dict[str, str]:
+        """Build per-request headers for data transformation calls (auth lives on the client)"""
+        return {
+            "X-Title": "HVAC ETL Pipeline - Data Transformation"
+        }
+
+    def _transform_payload(
+        self,
+        prompt: str,
+        max_tokens: int,
+        temperature: float,
+        track_cost: bool = True
+    ) -> Dict[str, Any]:
+        """Build request payload for data transformation calls"""
+        payload = {
+            "model": self.model,
+            "messages": [
+                {
+                    "role": "user",
+                    "content": prompt
+                }
+            ],
+            "max_tokens": max_tokens,
+            "temperature": temperature,
+        }
+        if track_cost:
+            payload["usage"] = {"include": True}  # Request detailed token usage from OpenRouter
+        return payload
+
+    def _backoff_or_raise(self, attempt: int, error: Exception) -> None:
+        """
+        Count a retryable failure and sleep before the next attempt
+
+        Raises:
+            CircuitOpenError if the circuit breaker opened while backing off
+            Exception if this was the last attempt
+        """
+        self._breaker.record_failure()
+        if attempt < MAX_RETRIES:
+            # Full jitter keeps concurrent callers from retrying in lockstep
+            delay = random.uniform(0, RETRY_DELAY_BASE * (2 ** attempt))
+            logger.warning(f"⚠️ Retryable error on attempt {attempt + 1}/{MAX_RETRIES + 1}: {type(error).__name__}: {error}")
+            logger.warning(f"Retrying in {delay:.1f} seconds...")
+            time.sleep(delay)
+            self._breaker.check()
+        else:
+            logger.error(f"❌ All {MAX_RETRIES + 1} attempts failed")
+            raise Exception(f"LLM API call failed after {MAX_RETRIES + 1} attempts: {str(error)}")
+
+    def _post_with_retries(self, headers: Dict[str, str], body: bytes, stream: bool = False):
+        """
+        POST the request body to OpenRouter, retrying transient network failures
+
+        Args:
+            headers: Per-request headers (merged with the client headers)
+            body: JSON payload already serialized with orjson
+            stream: Return as soon as headers arrive and leave the body unread
+
+        Returns:
+            httpx.Response with a 2xx status
+
+        Raises:
+            CircuitOpenError if the circuit breaker is open
+            RateLimitError if the API returns 429
+            Exception if all attempts fail or the API returns an HTTP error
+        """
+        self._breaker.check()
+        logger.debug(f"Sending POST request to {self.endpoint}")
+        response = None
+
+        for attempt in range(MAX_RETRIES + 1):
+            try:
+                request = self.client.build_request("POST", self.endpoint, headers=headers, content=body)
+                response = self.client.send(request, stream=stream)
+                response.raise_for_status()
+                self._breaker.record_success()
+                return response
+
+            except RETRYABLE_EXCEPTIONS as e:
+                self._backoff_or_raise(attempt, e)
+
+            except httpx.HTTPStatusError as e:
+                # Don't retry HTTP errors (4xx, 5xx) - they're not transient
+                logger.error(f"❌ HTTP error occurred: {e}")
+                logger.error(f"Response status: {response.status_code}")
+                logger.error(f"Response body: {_safe_body_preview(response)}")
+                if response.status_code == 429:
+                    # Callers running many requests may back off and retry these
+                    raise RateLimitError(
+                        f"LLM API HTTP error ({response.status_code}): {str(e)}",
+                        retry_after=_parse_retry_after(response.headers.get("Retry-After"))
+                    )
+                raise Exception(f"LLM API HTTP error ({response.status_code}): {str(e)}")
+
+    def _record_usage(
+        self,
+        prompt: str,
+        prompt_hash: str,
+        content: str,
+        usage: Optional[Dict[str, Any]],
+        elapsed_time: float,
+        span: Optional[Any],
+        job_logger: Optional[Any],
+        response_headers,
+        track_cost: bool = True
+    ) -> None:
+        """Log token usage, update the LangWatch span and queue JobLogger/LineageService records"""
+        # Log token usage and estimate cost (lazy %-formatting: free when INFO is filtered)
+        estimated_cost = 0.0
+        if usage and track_cost:
+            prompt_tokens = usage.get('prompt_tokens', 'N/A')
+            completion_tokens = usage.get('completion_tokens', 'N/A')
+            if logger.isEnabledFor(logging.INFO):
+                logger.info("Token usage - Prompt: %s, Completion: %s, Total: %s",
+                            prompt_tokens, completion_tokens, usage.get('total_tokens', 'N/A'))
+
+            # Calculate cost estimate if tokens are available
+            # Claude Sonnet 4.5 pricing: $3/1M input, $15/1M output tokens
+            if isinstance(prompt_tokens, int) and isinstance(completion_tokens, int):
+                estimated_cost = (prompt_tokens * 0.000003) + (completion_tokens * 0.000015)
+                logger.debug("Estimated cost: $%.4f", estimated_cost)
+
+        # Log rate limit info if available
+        if 'x-ratelimit-remaining' in response_headers:
+            logger.debug("Rate limit remaining: %s", response_headers.get('x-ratelimit-remaining'))
+
+        # Update LangWatch span with output and metrics. This stays on the calling
+        # thread: the span ends when create_llm_span exits, so an update queued on
+        # _obs_executor would usually land on a closed span and be dropped.
+        # span.update only sets attributes; exporting is batched by LangWatch.
+        if span and usage:
+            try:
+                span.update(
+                    output=content[:2000],  # Truncate for display
+                    metrics={
+                        "prompt_tokens": usage.get('prompt_tokens'),
+                        "completion_tokens": usage.get('completion_tokens'),
+                        "total_tokens": usage.get('total_tokens'),
+                        "duration_ms": int(elapsed_time * 1000),
+                        "cost": estimated_cost,
+                    }
+                )
+            except Exception as e:
+                logger.debug(f"Failed to update span output: {e}")
+
+        # JobLogger and lineage DB writes run in the background so the caller only
+        # waits for the network round trip and parsing
+        if job_logger and usage:
+            langwatch_service = get_langwatch_service()
+            trace_id = langwatch_service.get_current_trace_id() if langwatch_service else None
+
+            _obs_executor.submit(_record_observability, _ObsPayload(
+                prompt=prompt,
+                prompt_hash=prompt_hash,
+                content=content,
+                usage=usage,
+                elapsed_time=elapsed_time,
+                model=self.model,
+                job_logger=job_logger,
+                trace_id=trace_id
+            ))
+
     def transform_data(
         self,
         prompt: str,
         max_tokens: int = 16000,
         temperature: float = 0.1,
-        job_logger: Optional[Any] = None
+        job_logger: Optional[Any] = None,
+        track_cost: bool = True
     ) -> str:
         """
         Call LLM to transform bronze data to silver format
 
+        Buffers the whole response. Prefer stream_transform_data() for large outputs.
+
         Args:
             prompt: Full prompt with transformation instructions and data
             max_tokens: Maximum tokens for response (default 16000 for larger outputs)
             temperature: Temperature for sampling (default 0.1 for consistency)
             job_logger: Optional JobLogger instance for structured logging
+            track_cost: Request OpenRouter usage accounting and log token usage/cost.
+                        Without it the response may carry no usage, so JobLogger and
+                        lineage records are skipped too
 
         Returns:
             JSON string from LLM (should be valid silver layer JSON)
@@ -156,34 +707,20 @@ class LLMClient:
             Exception if API call fails or response is invalid
         """
         logger.info(f"Calling LLM for data transformation: {self.model}")
-        logger.info(f"Prompt size: {len(prompt)} characters ({len(prompt.split())} words)")
+        prompt_bytes = prompt.encode('utf-8')
+        prompt_hash = hashlib.sha256(prompt_bytes).hexdigest()[:16]
+        logger.info(f"Prompt size: {len(prompt)} characters, {len(prompt_bytes):,} bytes (~{prompt.count(' ') + 1} words)")
         logger.debug(f"Request parameters: max_tokens={max_tokens}, temperature={temperature}, timeout=180s")
 
-        headers = {
-            "Authorization": f"Bearer {self.api_key}",
-            "Content-Type": "application/json",
-            "HTTP-Referer": "https://github.com/hvac-etl",
-            "X-Title": "HVAC ETL Pipeline - Data Transformation"
-        }
-
-        payload = {
-            "model": self.model,
-            "messages": [
-                {
-                    "role": "user",
-                    "content": prompt
-                }
-            ],
-            "max_tokens": max_tokens,
-            "temperature": temperature,
-            "usage": {"include": True}  # Request detailed token usage from OpenRouter
-        }
+        headers = self._transform_headers()
+        payload = self._transform_payload(prompt, max_tokens, temperature, track_cost)
 
-        payload_size = len(json.dumps(payload))
-        logger.debug(f"Request payload size: {payload_size:,} bytes ({payload_size/1024:.1f} KB)")
+        body = orjson.dumps(payload)
+        logger.debug(f"Request payload size: {len(body):,} bytes ({len(body)/1024:.1f} KB)")
 
         # Wrap entire LLM call in a LangWatch span for proper tracing
         with create_llm_span("llm_transform") as span:
+            response = None
             try:
                 # Update span with input at start
                 if span:
@@ -196,47 +733,14 @@ class LLMClient:
                     except Exception as e:
                         logger.debug(f"Failed to update span input: {e}")
 
-                logger.debug(f"Sending POST request to {self.endpoint}")
                 start_time = time.time()
-
-                # Retry loop for transient failures
-                last_exception = None
-                response = None
-
-                for attempt in range(MAX_RETRIES + 1):
-                    try:
-                        response = requests.post(
-                            self.endpoint,
-                            headers=headers,
-                            json=payload,
-                            timeout=180  # Longer timeout for data transformation
-                        )
-                        response.raise_for_status()
-                        break  # Success - exit retry loop
-
-                    except RETRYABLE_EXCEPTIONS as e:
-                        last_exception = e
-                        if attempt < MAX_RETRIES:
-                            delay = RETRY_DELAY_BASE * (2 ** attempt)  # 2s, 4s, 8s
-                            logger.warning(f"⚠️ Retryable error on attempt {attempt + 1}/{MAX_RETRIES + 1}: {type(e).__name__}: {e}")
-                            logger.warning(f"Retrying in {delay} seconds...")
-                            time.sleep(delay)
-                        else:
-                            logger.error(f"❌ All {MAX_RETRIES + 1} attempts failed")
-                            raise Exception(f"LLM API call failed after {MAX_RETRIES + 1} attempts: {str(e)}")
-
-                    except requests.exceptions.HTTPError as e:
-                        # Don't retry HTTP errors (4xx, 5xx) - they're not transient
-                        logger.error(f"❌ HTTP error occurred: {e}")
-                        logger.error(f"Response status: {response.status_code}")
-                        logger.error(f"Response body: {response.text[:1000]}")
-                        raise Exception(f"LLM API HTTP error ({response.status_code}): {str(e)}")
+                response = self._post_with_retries(headers, body)
 
                 elapsed_time = time.time() - start_time
                 logger.info(f"API response received in {elapsed_time:.2f} seconds")
                 logger.debug(f"Response status code: {response.status_code}")
 
-                result = response.json()
+                result = orjson.loads(response.content)
                 logger.debug(f"Response JSON parsed successfully")
 
                 if 'choices' not in result or len(result['choices']) == 0:
@@ -247,122 +751,397 @@ class LLMClient:
                 logger.debug(f"Raw content length: {len(content)} characters")
 
                 # Remove markdown code blocks if present
-                if content.startswith('```'):
-                    logger.debug("Removing markdown code blocks from response")
-                    lines = content.split('\n')
-                    # Find first line after ``` and last line before ```
-                    start_idx = 1
-                    end_idx = len(lines) - 1
-                    while start_idx < len(lines) and (lines[start_idx].strip() == '' or lines[start_idx].strip().startswith('```') or lines[start_idx].strip() == 'json'):
-                        start_idx += 1
-                    while end_idx > 0 and (lines[end_idx].strip() == '' or lines[end_idx].strip().startswith('```')):
-                        end_idx -= 1
-                    content = '\n'.join(lines[start_idx:end_idx + 1])
-                    logger.debug(f"Cleaned content length: {len(content)} characters")
+                content = _strip_code_fences(content)
 
-                # Verify it's valid JSON
-                try:
-                    parsed = json.loads(content)
-                    if isinstance(parsed, dict) and 'systems' in parsed:
-                        logger.debug(f"Validated JSON contains {len(parsed['systems'])} systems")
-                except json.JSONDecodeError as e:
-                    logger.error(f"LLM returned invalid JSON: {e}")
+                # Verify it's valid JSON (repairing minor syntax errors if needed)
+                parsed = _try_parse_json(content)
+                if parsed is None:
+                    logger.error("LLM returned invalid JSON")
                     logger.error(f"Content preview (first 500 chars): {content[:500]}")
                     logger.error(f"Content preview (last 500 chars): {content[-500:]}")
                     logger.debug(f"Full invalid content: {content}")
-                    raise Exception(f"LLM returned invalid JSON: {str(e)}")
+                    raise Exception("LLM returned invalid JSON that could not be repaired")
+                if isinstance(parsed, dict) and 'systems' in parsed:
+                    logger.debug(f"Validated JSON contains {len(parsed['systems'])} systems")
 
                 logger.info(f"✅ Received valid JSON ({len(content)} characters)")
 
-                # Log token usage if available
-                estimated_cost = 0.0
-                if 'usage' in result:
-                    usage = result['usage']
-                    prompt_tokens = usage.get('prompt_tokens', 'N/A')
-                    completion_tokens = usage.get('completion_tokens', 'N/A')
-                    total_tokens = usage.get('total_tokens', 'N/A')
-                    logger.info(f"Token usage - Prompt: {prompt_tokens}, Completion: {completion_tokens}, Total: {total_tokens}")
-
-                    # Calculate cost estimate if tokens are available
-                    # Claude Sonnet 4.5 pricing: $3/1M input, $15/1M output tokens
-                    if isinstance(prompt_tokens, int) and isinstance(completion_tokens, int):
-                        estimated_cost = (prompt_tokens * 0.000003) + (completion_tokens * 0.000015)
-                        logger.debug(f"Estimated cost: ${estimated_cost:.4f}")
-
-                # Log rate limit info if available
-                if 'x-ratelimit-remaining' in response.headers:
-                    logger.debug(f"Rate limit remaining: {response.headers.get('x-ratelimit-remaining')}")
-
-                # Update LangWatch span with output and metrics
-                if span and 'usage' in result:
-                    usage = result['usage']
-                    try:
-                        span.update(
-                            output=content[:2000],  # Truncate for display
-                            metrics={
-                                "prompt_tokens": usage.get('prompt_tokens'),
-                                "completion_tokens": usage.get('completion_tokens'),
-                                "total_tokens": usage.get('total_tokens'),
-                                "duration_ms": int(elapsed_time * 1000),
-                                "cost": estimated_cost,
-                            }
-                        )
-                    except Exception as e:
-                        logger.debug(f"Failed to update span output: {e}")
-
-                # Structured logging via JobLogger if provided
-                if job_logger and 'usage' in result:
-                    usage = result['usage']
-                    langwatch_service = get_langwatch_service()
-                    trace_id = langwatch_service.get_current_trace_id() if langwatch_service else None
-
-                    job_logger.llm_call(
-                        prompt_preview=prompt,
-                        response_preview=content,
-                        tokens={
-                            "prompt_tokens": usage.get('prompt_tokens', 0),
-                            "completion_tokens": usage.get('completion_tokens', 0),
-                            "total_tokens": usage.get('total_tokens', 0),
-                        },
-                        duration_ms=int(elapsed_time * 1000),
-                        model=self.model,
-                        trace_id=trace_id
-                    )
-
-                    # Also record to LineageService for database storage (powers dashboard metrics)
-                    if hasattr(job_logger, 'job_id') and job_logger.job_id:
-                        try:
-                            from api.services.lineage_service import LineageService
-                            from api.database.connection import get_db
-                            import hashlib
-
-                            with get_db() as db:
-                                lineage_service = LineageService(db)
-                                lineage_service.record_llm_call(
-                                    job_id=job_logger.job_id,
-                                    prompt_hash=hashlib.sha256(prompt.encode()).hexdigest()[:16],
-                                    prompt_preview=prompt[:500],
-                                    response_preview=content[:500],
-                                    tokens={
-                                        "prompt_tokens": usage.get('prompt_tokens', 0),
-                                        "completion_tokens": usage.get('completion_tokens', 0),
-                                        "total_tokens": usage.get('total_tokens', 0),
-                                    },
-                                    duration_ms=int(elapsed_time * 1000),
-                                    model=self.model,
-                                    trace_id=trace_id
-                                )
-                        except Exception as e:
-                            logger.debug(f"Failed to record LLM call to lineage: {e}")
+                usage = result.get('usage')
+                self._record_usage(
+                    prompt, prompt_hash, content, usage, elapsed_time,
+                    span, job_logger, response.headers, track_cost
+                )
 
                 return content
 
-            except json.JSONDecodeError as e:
+            except orjson.JSONDecodeError as e:
                 logger.error(f"❌ Failed to parse API response as JSON: {e}")
-                if response:
-                    logger.error(f"Response text: {response.text[:1000]}")
+                if response is not None:
+                    logger.error(f"Response text: {_safe_body_preview(response)}")
                 raise Exception(f"Invalid JSON response from API: {str(e)}")
             except Exception as e:
                 logger.error(f"❌ Unexpected error during API call: {e}")
                 logger.error(f"Error type: {type(e).__name__}", exc_info=True)
                 raise
+
+    def stream_transform_data(
+        self,
+        prompt: str,
+        max_tokens: int = 16000,
+        temperature: float = 0.1,
+        job_logger: Optional[Any] = None,
+        track_cost: bool = True
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Call LLM to transform bronze data, yielding silver systems as they stream in
+
+        Requests an SSE stream from OpenRouter and feeds the content deltas into an
+        incremental ijson parser, so each entry of the "systems" array is handed to
+        the caller as soon as it is complete instead of after the last byte arrives.
+        Falls back to a single parse of the accumulated content when ijson is not
+        installed or the streamed JSON cannot be parsed incrementally.
+
+        Args:
+            prompt: Full prompt with transformation instructions and data
+            max_tokens: Maximum tokens for response (default 16000 for larger outputs)
+            temperature: Temperature for sampling (default 0.1 for consistency)
+            job_logger: Optional JobLogger instance for structured logging
+            track_cost: Request OpenRouter usage accounting and log token usage/cost.
+                        Without it the response may carry no usage, so JobLogger and
+                        lineage records are skipped too
+
+        Yields:
+            System dicts from the response's "systems" array, in order
+
+        Raises:
+            Exception if API call fails or response is invalid
+            ValueError if the response has no "systems" key
+        """
+        logger.info(f"Calling LLM for data transformation (streaming): {self.model}")
+        prompt_bytes = prompt.encode('utf-8')
+        prompt_hash = hashlib.sha256(prompt_bytes).hexdigest()[:16]
+        logger.info(f"Prompt size: {len(prompt)} characters, {len(prompt_bytes):,} bytes (~{prompt.count(' ') + 1} words)")
+        logger.debug(f"Request parameters: max_tokens={max_tokens}, temperature={temperature}, timeout=180s")
+
+        headers = self._transform_headers()
+        payload = self._transform_payload(prompt, max_tokens, temperature, track_cost)
+        payload["stream"] = True
+        body = orjson.dumps(payload)
+        logger.debug(f"Request payload size: {len(body):,} bytes ({len(body)/1024:.1f} KB)")
+
+        with create_llm_span("llm_transform") as span:
+            if span:
+                try:
+                    span.update(
+                        input=prompt[:2000],  # Truncate for display
+                        model=self.model,
+                        metadata={"max_tokens": max_tokens, "temperature": temperature, "stream": True}
+                    )
+                except Exception as e:
+                    logger.debug(f"Failed to update span input: {e}")
+
+            start_time = time.time()
+            yielded = 0
+
+            # A connection dropped mid-stream is retried like a failed send. The
+            # parser restarts on each attempt, and systems already handed to the
+            # caller are skipped when the new response repeats them.
+            for attempt in range(MAX_RETRIES + 1):
+                response = self._post_with_retries(headers, body, stream=True)
+
+                # Raw content is still accumulated once for the LangWatch/lineage previews
+                # and for the non-incremental fallback parse
+                chunks = []
+                usage = None
+                seen = 0
+                incremental = _ijson_available
+                if incremental:
+                    content_filter = _StreamedContentFilter()
+                    parsed_systems = ijson.sendable_list()
+                    parser = ijson.items_coro(parsed_systems, 'systems.item', use_float=True)
+
+                try:
+                    for event in _iter_sse_events(response):
+                        if 'error' in event:
+                            raise Exception(f"LLM API stream error: {event['error']}")
+                        if event.get('usage'):
+                            usage = event['usage']
+
+                        choices = event.get('choices') or []
+                        if not choices:
+                            continue
+                        delta = (choices[0].get('delta') or {}).get('content')
+                        if not delta:
+                            continue
+                        chunks.append(delta)
+
+                        if not incremental:
+                            continue
+                        # ijson treats an empty send as end-of-input, so skip empty pieces
+                        piece = content_filter.feed(delta)
+                        if not piece:
+                            continue
+                        try:
+                            parser.send(piece.encode('utf-8'))
+                        except ijson.JSONError as e:
+                            logger.warning(f"Incremental JSON parse failed, falling back to full parse: {e}")
+                            incremental = False
+                            continue
+
+                        # Hand over completed systems and drop our reference to them
+                        for system in parsed_systems:
+                            seen += 1
+                            if seen > yielded:
+                                yield system
+                                yielded += 1
+                        del parsed_systems[:]
+
+                    if incremental:
+                        try:
+                            tail = content_filter.flush()
+                            if tail:
+                                parser.send(tail.encode('utf-8'))
+                            parser.close()
+                        except ijson.JSONError as e:
+                            logger.warning(f"Incremental JSON parse failed, falling back to full parse: {e}")
+                            incremental = False
+                        else:
+                            for system in parsed_systems:
+                                seen += 1
+                                if seen > yielded:
+                                    yield system
+                                    yielded += 1
+                            del parsed_systems[:]
+                except RETRYABLE_EXCEPTIONS as e:
+                    self._backoff_or_raise(attempt, e)
+                    continue
+                except orjson.JSONDecodeError as e:
+                    logger.error(f"❌ Failed to parse API stream event as JSON: {e}")
+                    raise Exception(f"Invalid JSON response from API: {str(e)}")
+                finally:
+                    response.close()
+                break
+
+            elapsed_time = time.time() - start_time
+            content = ''.join(chunks).strip()
+            del chunks
+            logger.info(f"API stream completed in {elapsed_time:.2f} seconds ({len(content)} characters)")
+
+            # Full parse when incremental parsing was unavailable or failed, and to
+            # confirm the "systems" key exists when the stream produced no systems
+            if not incremental or yielded == 0:
+                content = _strip_code_fences(content)
+                parsed = _try_parse_json(content)
+                if parsed is None:
+                    logger.error("LLM returned invalid JSON")
+                    logger.error(f"Content preview (first 500 chars): {content[:500]}")
+                    logger.error(f"Content preview (last 500 chars): {content[-500:]}")
+                    logger.debug(f"Full invalid content: {content}")
+                    raise Exception("LLM returned invalid JSON that could not be repaired")
+
+                if not isinstance(parsed, dict) or 'systems' not in parsed:
+                    raise ValueError("LLM response missing 'systems' key")
+
+                for system in parsed['systems'][yielded:]:
+                    yield system
+                    yielded += 1
+
+            logger.info(f"✅ Streamed {yielded} systems")
+
+            self._record_usage(
+                prompt, prompt_hash, content, usage, elapsed_time,
+                span, job_logger, response.headers, track_cost
+            )
+
+    def _anthropic_model(self) -> str:
+        """Map the OpenRouter model id to its Anthropic API name"""
+        if self.model in _ANTHROPIC_MODEL_ALIASES:
+            return _ANTHROPIC_MODEL_ALIASES[self.model]
+        return self.model.split('/', 1)[-1].replace('.', '-')
+
+    def submit_batch(
+        self,
+        prompts: List[Tuple[str, str]],
+        max_tokens: int = 16000,
+        temperature: float = 0.1
+    ) -> Dict[str, Any]:
+        """
+        Submit prompts as a single Anthropic Message Batch
+
+        Args:
+            prompts: List of (batch_id, prompt) tuples; batch_id can be any string
+            max_tokens: Maximum tokens per response
+            temperature: Temperature for sampling
+
+        Returns:
+            Batch handle to pass to poll_batch()
+
+        Raises:
+            Exception if batch mode is disabled or the submission fails
+        """
+        if not self.batch_mode:
+            raise Exception("submit_batch() requires batch_mode=True")
+
+        # custom_id must match ^[a-zA-Z0-9_-]{1,64}$, so sheet labels are mapped to indexes
+        custom_ids = {f"req-{i}": batch_id for i, (batch_id, _) in enumerate(prompts)}
+        body = orjson.dumps({
+            "requests": [
+                {
+                    "custom_id": f"req-{i}",
+                    "params": {
+                        "model": self._anthropic_model(),
+                        "max_tokens": max_tokens,
+                        "temperature": temperature,
+                        "messages": [{"role": "user", "content": prompt}],
+                    }
+                }
+                for i, (_, prompt) in enumerate(prompts)
+            ]
+        })
+        logger.info(f"Submitting batch of {len(prompts)} prompts to Anthropic ({len(body)/1024:.1f} KB)")
+
+        try:
+            response = self.anthropic_client.post(ANTHROPIC_BATCHES_ENDPOINT, content=body)
+            response.raise_for_status()
+        except httpx.HTTPStatusError as e:
+            logger.error(f"❌ Batch submission failed: {e}")
+            logger.error(f"Response body: {_safe_body_preview(e.response)}")
+            raise Exception(f"Anthropic batch submission failed ({e.response.status_code}): {str(e)}")
+        except httpx.HTTPError as e:
+            raise Exception(f"Anthropic batch submission failed: {str(e)}")
+
+        batch = orjson.loads(response.content)
+        logger.info(f"✅ Batch submitted: {batch['id']}")
+        return {"id": batch["id"], "custom_ids": custom_ids, "usage": {}}
+
+    def poll_batch(self, handle: Dict[str, Any]) -> Dict[str, str]:
+        """
+        Wait for a submitted batch to finish and download its results
+
+        Polls with exponential backoff (BATCH_POLL_INITIAL up to BATCH_POLL_MAX seconds).
+
+        Args:
+            handle: Handle returned by submit_batch(); per-request token usage
+                    is stored in handle["usage"]
+
+        Returns:
+            Dictionary mapping batch_id to response text for every request that
+            succeeded. Failed requests are logged and left out.
+
+        Raises:
+            Exception if the batch does not finish within BATCH_TIMEOUT
+        """
+        status_url = f"{ANTHROPIC_BATCHES_ENDPOINT}/{handle['id']}"
+        deadline = time.monotonic() + BATCH_TIMEOUT
+        delay = BATCH_POLL_INITIAL
+
+        while True:
+            try:
+                response = self.anthropic_client.get(status_url)
+                response.raise_for_status()
+                batch = orjson.loads(response.content)
+                if batch.get("processing_status") == "ended":
+                    break
+                logger.info(f"Batch {handle['id']} still processing: {batch.get('request_counts')}")
+            except httpx.HTTPError as e:
+                # Keep polling through transient errors until the deadline
+                logger.warning(f"⚠️ Batch status poll failed: {e}")
+
+            if time.monotonic() + delay > deadline:
+                raise Exception(f"Anthropic batch {handle['id']} did not finish within {BATCH_TIMEOUT}s")
+            time.sleep(delay)
+            delay = min(delay * 2, BATCH_POLL_MAX)
+
+        logger.info(f"✅ Batch {handle['id']} ended: {batch.get('request_counts')}")
+
+        response = self.anthropic_client.get(batch["results_url"])
+        response.raise_for_status()
+
+        contents = {}
+        for line in response.iter_lines():
+            if not line:
+                continue
+            entry = orjson.loads(line)
+            batch_id = handle["custom_ids"].get(entry.get("custom_id"))
+            result = entry.get("result") or {}
+
+            if result.get("type") != "succeeded":
+                logger.error(f"❌ Batch request '{batch_id}' {result.get('type')}: {result.get('error')}")
+                continue
+
+            message = result["message"]
+            contents[batch_id] = ''.join(
+                block.get("text", "") for block in message.get("content", []) if block.get("type") == "text"
+            ).strip()
+            usage = message.get("usage") or {}
+            handle["usage"][batch_id] = {
+                "prompt_tokens": usage.get("input_tokens", 0),
+                "completion_tokens": usage.get("output_tokens", 0),
+                "total_tokens": usage.get("input_tokens", 0) + usage.get("output_tokens", 0),
+            }
+
+        return contents
+
+    def batch_transform_data(
+        self,
+        prompts: List[Tuple[str, str]],
+        max_tokens: int = 16000,
+        temperature: float = 0.1,
+        job_logger: Optional[Any] = None
+    ) -> Dict[str, Union[List[dict], Exception]]:
+        """
+        Transform many prompts through one Anthropic Message Batch
+
+        Blocks until the batch finishes, which can take minutes to hours.
+
+        Args:
+            prompts: List of (batch_id, prompt) tuples
+            max_tokens: Maximum tokens per response
+            temperature: Temperature for sampling
+            job_logger: Optional JobLogger instance for structured logging
+
+        Returns:
+            Dictionary mapping batch_id to its list of systems, or to the
+            Exception explaining why that entry failed
+        """
+        with create_llm_span("llm_transform_batch") as span:
+            if span:
+                try:
+                    span.update(
+                        model=self.model,
+                        metadata={"max_tokens": max_tokens, "temperature": temperature, "batch_size": len(prompts)}
+                    )
+                except Exception as e:
+                    logger.debug(f"Failed to update span input: {e}")
+
+            start_time = time.time()
+            handle = self.submit_batch(prompts, max_tokens, temperature)
+            contents = self.poll_batch(handle)
+            elapsed_time = time.time() - start_time
+            logger.info(f"Batch completed in {elapsed_time:.0f} seconds ({len(contents)}/{len(prompts)} succeeded)")
+
+            results = {}
+            for batch_id, prompt in prompts:
+                if batch_id not in contents:
+                    results[batch_id] = Exception(f"Batch request for '{batch_id}' did not succeed")
+                    continue
+
+                content = _strip_code_fences(contents[batch_id])
+                parsed = _try_parse_json(content)
+                if parsed is None:
+                    logger.error(f"LLM returned invalid JSON for '{batch_id}'")
+                    logger.debug(f"Full invalid content: {content}")
+                    results[batch_id] = Exception("LLM returned invalid JSON that could not be repaired")
+                    continue
+                if not isinstance(parsed, dict) or 'systems' not in parsed:
+                    results[batch_id] = ValueError("LLM response missing 'systems' key")
+                    continue
+
+                results[batch_id] = parsed['systems']
+                prompt_hash = hashlib.sha256(prompt.encode('utf-8')).hexdigest()[:16]
+                self._record_usage(
+                    prompt, prompt_hash, content, handle["usage"].get(batch_id), elapsed_time,
+                    span, job_logger, {}
+                )
+
+            return results
@@ -2,10 +2,14 @@
 Processing pipelines for different source types
 """
 
-from .excel_pipeline import process_excel_bronze
-from .pdf_pipeline import process_pdf_bronze
+from .excel_pipeline import process_excel_bronze, iter_excel_bronze, build_work_units, WorkUnit
+from .pdf_pipeline import process_pdf_bronze, process_pdf_bronze_async
 
 __all__ = [
     'process_excel_bronze',
+    'iter_excel_bronze',
+    'build_work_units',
+    'WorkUnit',
     'process_pdf_bronze',
+    'process_pdf_bronze_async',
 ]
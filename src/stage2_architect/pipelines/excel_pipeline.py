@@ -5,38 +5,118 @@ Flow:
 1. Load bronze JSON
 2. Batch by source_sheet
 3. Classify sheets (filter non-system sheets)
-4. Transform each sheet using LLM (via architect)
+4. Transform sheets/batches concurrently using LLM (via architect)
 5. Combine and return results
 """
 
+import contextvars
 import logging
-from typing import List, Dict, Any
+from contextlib import ExitStack
+from concurrent.futures import ThreadPoolExecutor, CancelledError, Future
+from dataclasses import dataclass
+from typing import List, Dict, Any, Iterator, Tuple, Optional, Callable
 
 from ..batchers import batch_by_sheet, get_sheet_stats, batch_large_sheet
 from ..classifiers import classify_sheets
+from ..llm_client import CircuitOpenError
 
 logger = logging.getLogger(__name__)
 
+# Sheets with more records than this are split into batches of this size
+SHEET_BATCH_SIZE = 30
 
-def process_excel_bronze(
+
+@dataclass(frozen=True)
+class WorkUnit:
+    """One LLM call: a whole sheet, or one batch of a large sheet"""
+    sheet_name: str
+    batch_idx: int      # 1-based
+    total_batches: int
+    records: List[dict]
+
+    @property
+    def label(self) -> str:
+        """Source name passed to the LLM transform function"""
+        if self.total_batches == 1:
+            return self.sheet_name
+        return f"{self.sheet_name} (batch {self.batch_idx})"
+
+
+def build_work_units(sheets_to_process: Dict[str, List[dict]]) -> List[WorkUnit]:
+    """
+    Expand sheets into a flat list of LLM work units, splitting large sheets up front
+
+    Args:
+        sheets_to_process: Dictionary of {sheet_name: [records]}
+
+    Returns:
+        List of WorkUnit in sheet order; a sheet's batches are contiguous
+    """
+    work_units = []
+    for sheet_name, sheet_records in sheets_to_process.items():
+        # Check if sheet needs batching (>30 records)
+        if len(sheet_records) > SHEET_BATCH_SIZE:
+            record_batches = batch_large_sheet(sheet_records, batch_size=SHEET_BATCH_SIZE)
+            logger.info(f"Large sheet '{sheet_name}' ({len(sheet_records)} records) split into {len(record_batches)} batches")
+        else:
+            record_batches = [sheet_records]
+
+        for batch_idx, batch_records in enumerate(record_batches, 1):
+            work_units.append(WorkUnit(sheet_name, batch_idx, len(record_batches), batch_records))
+
+    return work_units
+
+
+def _batch_futures(batch_transform_fn: Callable, work_units: List[WorkUnit]) -> List[Future]:
+    """Run all work units through one batch call and wrap each outcome in a completed Future"""
+    try:
+        batch_results = batch_transform_fn([(unit.label, unit.records) for unit in work_units])
+    except Exception as e:
+        logger.error(f"❌ Batch transformation failed: {e}")
+        batch_results = {unit.label: e for unit in work_units}
+
+    futures = []
+    for unit in work_units:
+        future = Future()
+        outcome = batch_results.get(unit.label, Exception(f"No batch result for '{unit.label}'"))
+        if isinstance(outcome, Exception):
+            future.set_exception(outcome)
+        else:
+            future.set_result(outcome)
+        futures.append(future)
+    return futures
+
+
+def iter_excel_bronze(
     bronze_data: List[dict],
     llm_transform_fn,
-    prompt_template: str
-) -> Dict[str, Any]:
+    prompt_template: str,
+    max_workers: int = 8,
+    batch_transform_fn: Optional[Callable] = None
+) -> Iterator[Tuple[str, Dict[str, Any]]]:
     """
-    Process Excel bronze data through classification, batching, and LLM transformation
+    Process Excel bronze data, yielding results as each LLM batch completes
+
+    Lets callers persist systems while later sheets are still being transformed,
+    without holding the whole result set in memory.
 
     Args:
         bronze_data: List of bronze records with source_sheet field
         llm_transform_fn: Function to call for LLM transformation
             Signature: (sheet_name: str, records: List[dict]) -> tuple[list, dict]
+            Called concurrently from worker threads, so it must be thread-safe
         prompt_template: Base prompt template for LLM
+        max_workers: Maximum concurrent LLM calls
+        batch_transform_fn: Optional batch-mode replacement for the per-sheet calls.
+            Receives every (label, records) work unit at once and returns a dict
+            mapping each label to a (systems, metadata) tuple or an Exception
 
-    Returns:
-        Dictionary with:
-        - systems: List of all extracted systems
-        - sheet_results: List of per-sheet processing results
-        - stats: Processing statistics
+    Yields:
+        (kind, item) tuples:
+        - ("system", system_dict) for every extracted system
+        - ("sheet_result", result_dict) once per sheet (processed or skipped)
+        - ("stats", stats_dict) once, last
+        Systems from the completed batches of a sheet that later fails are still yielded.
     """
     logger.info("=== Excel Pipeline: Starting ===")
 
@@ -58,73 +138,102 @@ def process_excel_bronze(
 
     logger.info(f"Processing {len(sheets_to_process)} sheets, skipping {len(sheets_skipped)} sheets")
 
-    # Step 3: Transform each sheet using LLM (with batching for large sheets)
-    logger.info(f"Step 3: Transforming {len(sheets_to_process)} sheets using LLM")
-    all_systems = []
-    sheet_results = []
+    # Step 3: Transform sheets using LLM (with batching for large sheets)
+    # Every sheet/batch is an independent LLM call, so they run concurrently
+    logger.info(f"Step 3: Transforming {len(sheets_to_process)} sheets using LLM ({max_workers} workers)")
+    work_units = build_work_units(sheets_to_process)
+    sheet_system_counts = {name: 0 for name in sheets_to_process}
+    sheet_errors = {}
+    sheet_metadata = {}
+    total_systems = 0
+    circuit_error = None  # Set once the LLM circuit breaker opens
 
-    for sheet_name, sheet_records in sheets_to_process.items():
-        logger.info(f"\n--- Processing sheet: {sheet_name} ---")
-        logger.info(f"Records: {len(sheet_records)}")
-
-        try:
-            # Check if sheet needs batching (>30 records)
-            if len(sheet_records) > 30:
-                logger.info(f"Large sheet detected, splitting into batches...")
-                record_batches = batch_large_sheet(sheet_records, batch_size=30)
-
-                sheet_systems = []
-                for batch_idx, batch_records in enumerate(record_batches, 1):
-                    logger.info(f"  Processing batch {batch_idx}/{len(record_batches)} ({len(batch_records)} records)")
-
-                    batch_systems, batch_meta = llm_transform_fn(
-                        f"{sheet_name} (batch {batch_idx})",
-                        batch_records
-                    )
-                    sheet_systems.extend(batch_systems)
-                    logger.info(f"  ✅ Batch {batch_idx}: {len(batch_records)} records → {len(batch_systems)} systems")
-
-                all_systems.extend(sheet_systems)
-                sheet_results.append({
-                    "sheet_name": sheet_name,
-                    "input_records": len(sheet_records),
-                    "output_systems": len(sheet_systems),
-                    "batches": len(record_batches),
-                    "success": True
-                })
+    # The thread pool is only started for per-sheet calls; batch mode submits nothing to it
+    with ExitStack() as stack:
+        if batch_transform_fn is not None:
+            # Batch mode: one provider-side batch for every unit (cheaper, slower)
+            logger.info(f"Batch mode: submitting {len(work_units)} LLM requests as one batch")
+            futures = _batch_futures(batch_transform_fn, work_units)
+        else:
+            executor = stack.enter_context(ThreadPoolExecutor(max_workers=max_workers))
+            # Each call runs in a copy of the current context so LangWatch spans
+            # still attach to the caller's trace
+            futures = [
+                executor.submit(contextvars.copy_context().run, llm_transform_fn, unit.label, unit.records)
+                for unit in work_units
+            ]
+
+        # Consume in submission order so the silver output order stays deterministic
+        for unit, future in zip(work_units, futures):
+            sheet_name = unit.sheet_name
+            try:
+                unit_systems, unit_meta = future.result()
+
+            except CancelledError:
+                # Never started: cancelled after the circuit breaker opened
+                sheet_errors.setdefault(sheet_name, circuit_error)
+
+            except CircuitOpenError as e:
+                if circuit_error is None:
+                    logger.error(f"❌ LLM circuit breaker open, cancelling remaining LLM calls: {e}")
+                    circuit_error = str(e)
+                    for pending in futures:
+                        pending.cancel()
+                sheet_errors.setdefault(sheet_name, str(e))
 
-                logger.info(f"✅ {sheet_name}: {len(sheet_records)} records → {len(sheet_systems)} systems (via {len(record_batches)} batches)")
+            except Exception as e:
+                logger.error(f"❌ Failed to process '{unit.label}': {e}")
+                sheet_errors.setdefault(sheet_name, str(e))
 
             else:
-                # Process entire sheet in one call
-                systems, sheet_meta = llm_transform_fn(sheet_name, sheet_records)
+                for system in unit_systems:
+                    yield "system", system
+                sheet_system_counts[sheet_name] += len(unit_systems)
+                total_systems += len(unit_systems)
+                if unit.total_batches > 1:
+                    logger.info(f"  ✅ {unit.label}: {len(unit.records)} records → {len(unit_systems)} systems")
+                else:
+                    sheet_metadata[sheet_name] = unit_meta
 
-                all_systems.extend(systems)
-                sheet_results.append({
+            if unit.batch_idx < unit.total_batches:
+                continue
+
+            # Last unit of this sheet is done - emit its result
+            input_records = len(sheets_to_process[sheet_name])
+            output_systems = sheet_system_counts[sheet_name]
+            if sheet_name in sheet_errors:
+                logger.error(f"❌ Failed to process sheet '{sheet_name}': {sheet_errors[sheet_name]}")
+                yield "sheet_result", {
+                    "sheet_name": sheet_name,
+                    "input_records": input_records,
+                    "output_systems": output_systems,
+                    "batches": 0,
+                    "success": False,
+                    "error": sheet_errors[sheet_name]
+                }
+            elif unit.total_batches > 1:
+                logger.info(f"✅ {sheet_name}: {input_records} records → {output_systems} systems (via {unit.total_batches} batches)")
+                yield "sheet_result", {
+                    "sheet_name": sheet_name,
+                    "input_records": input_records,
+                    "output_systems": output_systems,
+                    "batches": unit.total_batches,
+                    "success": True
+                }
+            else:
+                logger.info(f"✅ {sheet_name}: {input_records} records → {output_systems} systems")
+                yield "sheet_result", {
                     "sheet_name": sheet_name,
-                    "input_records": len(sheet_records),
-                    "output_systems": len(systems),
+                    "input_records": input_records,
+                    "output_systems": output_systems,
                     "batches": 1,
                     "success": True,
-                    "metadata": sheet_meta
-                })
-
-                logger.info(f"✅ {sheet_name}: {len(sheet_records)} records → {len(systems)} systems")
-
-        except Exception as e:
-            logger.error(f"❌ Failed to process sheet '{sheet_name}': {e}")
-            sheet_results.append({
-                "sheet_name": sheet_name,
-                "input_records": len(sheet_records),
-                "output_systems": 0,
-                "batches": 0,
-                "success": False,
-                "error": str(e)
-            })
+                    "metadata": sheet_metadata[sheet_name]
+                }
 
     # Add skipped sheets to results
     for sheet_name, records in sheets_skipped.items():
-        sheet_results.append({
+        yield "sheet_result", {
             "sheet_name": sheet_name,
             "input_records": len(records),
             "output_systems": 0,
@@ -132,18 +241,60 @@ def process_excel_bronze(
             "success": True,
             "skipped": True,
             "skip_reason": classifications[sheet_name]['reason']
-        })
+        }
 
     logger.info("=== Excel Pipeline: Complete ===")
-    logger.info(f"Processed {len(sheets_to_process)} sheets, extracted {len(all_systems)} systems")
+    logger.info(f"Processed {len(sheets_to_process)} sheets, extracted {total_systems} systems")
+
+    yield "stats", {
+        "total_sheets": sheet_stats['total_sheets'],
+        "processed_sheets": len(sheets_to_process),
+        "skipped_sheets": len(sheets_skipped),
+        "total_systems": total_systems
+    }
+
+
+def process_excel_bronze(
+    bronze_data: List[dict],
+    llm_transform_fn,
+    prompt_template: str,
+    max_workers: int = 8,
+    batch_transform_fn: Optional[Callable] = None
+) -> Dict[str, Any]:
+    """
+    Process Excel bronze data through classification, batching, and LLM transformation
+
+    Materializes iter_excel_bronze() for callers that need the full result at once.
+
+    Args:
+        bronze_data: List of bronze records with source_sheet field
+        llm_transform_fn: Function to call for LLM transformation
+            Signature: (sheet_name: str, records: List[dict]) -> tuple[list, dict]
+        prompt_template: Base prompt template for LLM
+        max_workers: Maximum concurrent LLM calls
+        batch_transform_fn: Optional batch-mode replacement for the per-sheet calls
+
+    Returns:
+        Dictionary with:
+        - systems: List of all extracted systems
+        - sheet_results: List of per-sheet processing results
+        - stats: Processing statistics
+    """
+    all_systems = []
+    sheet_results = []
+    stats = {}
+
+    for kind, item in iter_excel_bronze(bronze_data, llm_transform_fn, prompt_template,
+                                        max_workers, batch_transform_fn):
+        if kind == "system":
+            all_systems.append(item)
+        elif kind == "sheet_result":
+            sheet_results.append(item)
+        else:
+            stats = item
 
     return {
         "systems": all_systems,
         "sheet_results": sheet_results,
-        "stats": {
-            "total_sheets": sheet_stats['total_sheets'],
-            "processed_sheets": len(sheets_to_process),
-            "skipped_sheets": len(sheets_skipped),
-            "total_systems": len(all_systems)
-        }
+        "stats": stats
     }
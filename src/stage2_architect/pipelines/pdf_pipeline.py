@@ -5,42 +5,480 @@ Flow:
 1. Load bronze JSON (raw Docling format)
 2. Batch by table (preserves cell structure)
 3. Classify tables (filter non-system tables)
-4. Transform each table using LLM with cell data
+4. Transform tables concurrently using LLM with cell data
 5. Combine and return results
 
 Unified Pipeline: All PDFs use raw Docling format with cell structure
 """
 
+import asyncio
+import inspect
+import itertools
 import logging
-from typing import List, Dict, Any, Union
-
-from ..batchers import batch_by_table, get_table_stats, batch_large_table, batch_raw_docling_tables
+import random
+import time
+from dataclasses import dataclass
+from typing import Awaitable, Callable, List, Dict, Any, Optional, Union, Tuple
+
+from ..batchers import (
+    batch_by_table,
+    get_table_stats,
+    batch_large_table,
+    batch_raw_docling_tables,
+    estimate_tokens_per_record,
+    compute_batch_size,
+)
+from ..batchers.table_batcher import DEFAULT_RECORD_TOKEN_BUDGET
 from ..classifiers import classify_tables
+from ..classifiers.table_classifier import MIN_TABLE_ROWS
+from ..llm_client import RateLimitError
 
 logger = logging.getLogger(__name__)
 
+# Default cap on concurrent LLM calls
+DEFAULT_MAX_CONCURRENCY = 10
+
+# Typical seconds per transform call, used to size concurrency from an RPM limit
+DEFAULT_AVG_LATENCY_S = 30.0
+
+# Docling tables with fewer cells than this are coalesced into shared LLM calls
+SMALL_TABLE_MAX_CELLS = 10
+
+# Retries for calls rejected with HTTP 429, with full-jitter backoff (up to 2s, 4s, 8s, 16s)
+RATE_LIMIT_RETRIES = 4
+RATE_LIMIT_BACKOFF_BASE = 2.0
+
+# Upper bound on tables coalesced into one call (keeps per-table attribution reliable)
+MAX_TABLES_PER_GROUP = 20
+
+
+def _concurrency_limit(
+    max_concurrency: int,
+    rpm_limit: Optional[int] = None,
+    avg_latency_s: float = DEFAULT_AVG_LATENCY_S
+) -> int:
+    """
+    Size the LLM call semaphore
+
+    With an RPM limit, in-flight calls are capped at rpm_limit / 60 * avg_latency_s
+    (Little's law), so parallel calls stay under the provider's rate limit.
+
+    Returns:
+        Number of LLM calls allowed in flight at once
+    """
+    if not rpm_limit:
+        return max_concurrency
+    return max(1, min(max_concurrency, int(rpm_limit / 60 * avg_latency_s)))
+
+
+def _presplit_tiny_tables(
+    tables: Dict[str, Any],
+    fmt: "_TableFormat"
+) -> Tuple[Dict[str, Any], Dict[str, Dict]]:
+    """
+    Skip tables too small to hold system data before running the classifier
+
+    Uses the classifier's own MIN_TABLE_ROWS rule, so results match what
+    classify_tables() would return; for Docling tables only distinct row
+    indices are counted instead of building pseudo-records.
+
+    Returns:
+        Tuple of (candidate_tables, classifications_for_tiny_tables)
+    """
+    candidates = {}
+    tiny = {}
+    count_label = fmt.count_label
+    for table_name, table_data in tables.items():
+        rows = fmt.row_count(table_data)
+        if rows >= MIN_TABLE_ROWS:
+            candidates[table_name] = table_data
+            continue
+
+        count = fmt.input_count(table_data)
+        reason = f"Too small ({rows} rows, need {MIN_TABLE_ROWS}+)"
+        tiny[table_name] = {'skip': True, 'reason': reason, f'{count_label}_count': count}
+        logger.info(f"⏭️  SKIP: {table_name} ({count} {count_label}) - {reason}")
+
+    return candidates, tiny
+
+
+class AsyncRateLimiter:
+    """
+    Token bucket that spaces LLM calls to a requests-per-minute limit
+
+    Holds up to `burst` tokens and refills at rpm_limit / 60 tokens per second;
+    acquire() waits until a token is available.
+    """
+
+    def __init__(self, rpm_limit: int, burst: int = 1):
+        self.rate = rpm_limit / 60
+        self.capacity = max(1, burst)
+        self._tokens = float(self.capacity)
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        """Wait for and take one token"""
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+
+@dataclass
+class _LLMCallGate:
+    """Concurrency cap plus optional RPM limiter shared by every LLM call in a run"""
+    semaphore: asyncio.Semaphore
+    limiter: Optional[AsyncRateLimiter] = None
+
+
+async def _call_transform(llm_transform_fn, name: str, data, gate: _LLMCallGate) -> tuple:
+    """
+    Await an async transform function, or run a sync one in a worker thread
+
+    Calls rejected with RateLimitError are retried with full-jitter backoff
+    (or the server's Retry-After), sleeping outside the concurrency slot.
+    """
+    for attempt in range(RATE_LIMIT_RETRIES + 1):
+        if gate.limiter:
+            await gate.limiter.acquire()
+        try:
+            # Held per LLM call (not per table) so a table's batches never wait on their own table
+            async with gate.semaphore:
+                if inspect.iscoroutinefunction(llm_transform_fn):
+                    return await llm_transform_fn(name, data)
+                # to_thread copies the current context, so LangWatch spans keep their parent trace
+                return await asyncio.to_thread(llm_transform_fn, name, data)
+        except RateLimitError as e:
+            if attempt == RATE_LIMIT_RETRIES:
+                raise
+            delay = e.retry_after if e.retry_after is not None else random.uniform(0, RATE_LIMIT_BACKOFF_BASE * (2 ** attempt))
+            logger.warning(f"⚠️ Rate limited on '{name}' (attempt {attempt + 1}/{RATE_LIMIT_RETRIES + 1}), retrying in {delay:.1f}s")
+            await asyncio.sleep(delay)
+
+
+async def _transform_docling_table(
+    table_name: str,
+    table_data: Dict,
+    llm_transform_fn,
+    gate: _LLMCallGate
+) -> Tuple[List[dict], Dict[str, Any]]:
+    """Transform a raw Docling table (dict with cells) in a single LLM call"""
+    num_cells = len(table_data.get('cells', []))
+    logger.info(f"Cells: {num_cells}")
+
+    # For now, process entire table in one call
+    # TODO: Add cell-based batching for very large tables
+    systems, table_meta = await _call_transform(llm_transform_fn, table_name, table_data, gate)
+
+    logger.info(f"✅ {table_name}: {num_cells} cells → {len(systems)} systems")
+    return systems, {
+        "table_name": table_name,
+        "input_cells": num_cells,
+        "output_systems": len(systems),
+        "batches": 1,
+        "success": True,
+        "metadata": table_meta
+    }
+
+
+async def _transform_legacy_table(
+    table_name: str,
+    table_records: List[dict],
+    llm_transform_fn,
+    gate: _LLMCallGate,
+    max_tokens_budget: int = DEFAULT_RECORD_TOKEN_BUDGET
+) -> Tuple[List[dict], Dict[str, Any]]:
+    """Transform a legacy flattened table, splitting large ones into concurrent record batches"""
+    logger.info(f"Records: {len(table_records)}")
+
+    # Check if table needs batching (row-marshaled: batch size adapts to record size)
+    batch_size = compute_batch_size(table_records, max_tokens_budget)
+    if len(table_records) > batch_size:
+        logger.info(f"Large table detected, splitting into batches...")
+        record_batches = batch_large_table(table_records, batch_size=batch_size)
+
+        logger.info(f"  Dispatching {len(record_batches)} batches concurrently")
+        batch_outcomes = await asyncio.gather(
+            *[
+                _call_transform(llm_transform_fn, f"{table_name} (batch {batch_idx})", batch_records, gate)
+                for batch_idx, batch_records in enumerate(record_batches, 1)
+            ],
+            return_exceptions=True
+        )
+
+        # gather() keeps input order, so systems stay in batch order
+        system_chunks = []
+        for batch_idx, (batch_records, outcome) in enumerate(zip(record_batches, batch_outcomes), 1):
+            if isinstance(outcome, Exception):
+                # Any failed batch fails the whole table, as with sequential batching
+                raise outcome
+            batch_systems, batch_meta = outcome
+            system_chunks.append(batch_systems)
+            logger.info(f"  ✅ Batch {batch_idx}: {len(batch_records)} records → {len(batch_systems)} systems")
+        table_systems = list(itertools.chain.from_iterable(system_chunks))
+
+        logger.info(f"✅ {table_name}: {len(table_records)} records → {len(table_systems)} systems (via {len(record_batches)} batches)")
+        return table_systems, {
+            "table_name": table_name,
+            "input_records": len(table_records),
+            "output_systems": len(table_systems),
+            "batches": len(record_batches),
+            "success": True
+        }
+
+    # Process entire table in one call
+    systems, table_meta = await _call_transform(llm_transform_fn, table_name, table_records, gate)
+
+    logger.info(f"✅ {table_name}: {len(table_records)} records → {len(systems)} systems")
+    return systems, {
+        "table_name": table_name,
+        "input_records": len(table_records),
+        "output_systems": len(systems),
+        "batches": 1,
+        "success": True,
+        "metadata": table_meta
+    }
+
+
+@dataclass(frozen=True)
+class _TableFormat:
+    """Per-format table handling, chosen once per bronze document"""
+    name: str
+    count_label: str
+    input_count: Callable[[Any], int]
+    row_count: Callable[[Any], int]
+    transform: Callable[..., Awaitable[Tuple[List[dict], Dict[str, Any]]]]
+    groupable: bool = False
+    batched: bool = False  # transform takes max_tokens_budget to size record batches
+
+    @property
+    def count_key(self) -> str:
+        return f"input_{self.count_label}"
+
+
+_DOCLING_FORMAT = _TableFormat(
+    name="raw_docling",
+    count_label="cells",
+    input_count=lambda table: len(table.get('cells', [])),
+    row_count=lambda table: len({cell.get('row', 0) for cell in table.get('cells', [])}),
+    transform=_transform_docling_table,
+    groupable=True,
+)
+
+_LEGACY_FORMAT = _TableFormat(
+    name="flattened",
+    count_label="records",
+    input_count=len,
+    row_count=len,
+    transform=_transform_legacy_table,
+    batched=True,
+)
+
+
+async def _transform_table(
+    table_name: str,
+    table_data: Union[Dict, List[dict]],
+    fmt: _TableFormat,
+    llm_transform_fn,
+    gate: _LLMCallGate,
+    max_tokens_budget: int = DEFAULT_RECORD_TOKEN_BUDGET
+) -> Tuple[List[dict], Dict[str, Any]]:
+    """
+    Transform a single table using LLM
+
+    Returns:
+        Tuple of (systems, table_result); raises if the LLM call fails
+    """
+    logger.info(f"\n--- Processing table: {table_name} ---")
+    if fmt.batched:
+        return await fmt.transform(table_name, table_data, llm_transform_fn, gate, max_tokens_budget)
+    return await fmt.transform(table_name, table_data, llm_transform_fn, gate)
+
+
+def _group_small_tables(
+    tables: Dict[str, Any],
+    fmt: _TableFormat,
+    max_tokens_budget: int = DEFAULT_RECORD_TOKEN_BUDGET
+) -> List[List[Tuple[str, Any]]]:
+    """
+    Pack small tables into groups that share one LLM call
+
+    Tables under SMALL_TABLE_MAX_CELLS are packed greedily, in document order,
+    until the estimated input tokens would exceed max_tokens_budget.
+
+    Returns:
+        List of groups (each a list of (table_name, table_data)); groups of
+        one table are left out so they keep the regular per-table path
+    """
+    if not fmt.groupable:
+        return []
+
+    groups = []
+    current, current_tokens = [], 0
+    for table_name, table_data in tables.items():
+        count = fmt.input_count(table_data)
+        if count >= SMALL_TABLE_MAX_CELLS:
+            continue
+
+        tokens = estimate_tokens_per_record(table_data.get('cells', [])) * count
+        if current and (current_tokens + tokens > max_tokens_budget or len(current) >= MAX_TABLES_PER_GROUP):
+            groups.append(current)
+            current, current_tokens = [], 0
+        current.append((table_name, table_data))
+        current_tokens += tokens
+
+    if current:
+        groups.append(current)
+    return [group for group in groups if len(group) > 1]
+
+
+async def _transform_group(
+    group: List[Tuple[str, Any]],
+    group_transform_fn,
+    fmt: _TableFormat,
+    llm_transform_fn,
+    gate: _LLMCallGate,
+    max_tokens_budget: int = DEFAULT_RECORD_TOKEN_BUDGET
+) -> Dict[str, Any]:
+    """
+    Transform a group of small tables in one LLM call
+
+    Tables the group call fails on (or cannot attribute systems to) are
+    retried one by one with llm_transform_fn.
+
+    Returns:
+        Dictionary mapping table_name to (systems, table_result) or Exception
+    """
+    table_names = [table_name for table_name, _ in group]
+    group_name = f"tables {table_names[0]}..{table_names[-1]} ({len(group)} tables)"
+    logger.info(f"\n--- Processing table group: {group_name} ---")
+
+    try:
+        group_results = await _call_transform(group_transform_fn, group_name, group, gate)
+    except Exception as e:
+        logger.warning(f"⚠️  Group call failed for {group_name}, retrying tables individually: {e}")
+        group_results = {}
+
+    outcomes = {}
+    retry = []
+    for table_name, table_data in group:
+        result = group_results.get(table_name)
+        if result is None or isinstance(result, Exception):
+            retry.append((table_name, table_data))
+            continue
+
+        systems, table_meta = result
+        count = fmt.input_count(table_data)
+        logger.info(f"✅ {table_name}: {count} {fmt.count_label} → {len(systems)} systems (grouped)")
+        outcomes[table_name] = (systems, {
+            "table_name": table_name,
+            fmt.count_key: count,
+            "output_systems": len(systems),
+            "batches": 1,
+            "success": True,
+            "grouped": True,
+            "metadata": table_meta
+        })
+
+    if retry:
+        retry_outcomes = await asyncio.gather(
+            *[
+                _transform_table(table_name, table_data, fmt, llm_transform_fn, gate, max_tokens_budget)
+                for table_name, table_data in retry
+            ],
+            return_exceptions=True
+        )
+        outcomes.update(zip((table_name for table_name, _ in retry), retry_outcomes))
+
+    return outcomes
+
 
 def process_pdf_bronze(
     bronze_data: Union[Dict, List[dict]],
     llm_transform_fn,
-    prompt_template: str
+    prompt_template: str,
+    max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+    max_tokens_budget: int = DEFAULT_RECORD_TOKEN_BUDGET,
+    rpm_limit: Optional[int] = None,
+    avg_latency_s: float = DEFAULT_AVG_LATENCY_S,
+    group_transform_fn=None
+) -> Dict[str, Any]:
+    """
+    Process PDF bronze data through classification, batching, and LLM transformation
+
+    Synchronous wrapper around process_pdf_bronze_async(); must not be called
+    from a running event loop (await process_pdf_bronze_async() there instead).
+
+    Args:
+        bronze_data: Raw Docling dict or legacy flattened record list
+        llm_transform_fn: Sync or async function to call for LLM transformation
+            Signature: (table_name: str, table_data) -> tuple[list, dict]
+        prompt_template: Base prompt template for LLM
+        max_concurrency: Maximum concurrent LLM calls
+        max_tokens_budget: Estimated record tokens per LLM call for legacy tables
+        rpm_limit: Provider requests-per-minute limit (None = max_concurrency only)
+        avg_latency_s: Expected seconds per LLM call, used with rpm_limit
+        group_transform_fn: Optional function that transforms several small tables in one call
+            Signature: (group_name: str, tables: list[tuple[str, data]]) -> dict[str, tuple[list, dict]]
+
+    Returns:
+        Dictionary with systems, table_results and stats
+    """
+    return asyncio.run(process_pdf_bronze_async(
+        bronze_data,
+        llm_transform_fn,
+        prompt_template,
+        max_concurrency=max_concurrency,
+        max_tokens_budget=max_tokens_budget,
+        rpm_limit=rpm_limit,
+        avg_latency_s=avg_latency_s,
+        group_transform_fn=group_transform_fn
+    ))
+
+
+async def process_pdf_bronze_async(
+    bronze_data: Union[Dict, List[dict]],
+    llm_transform_fn,
+    prompt_template: str,
+    max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+    max_tokens_budget: int = DEFAULT_RECORD_TOKEN_BUDGET,
+    rpm_limit: Optional[int] = None,
+    avg_latency_s: float = DEFAULT_AVG_LATENCY_S,
+    group_transform_fn=None
 ) -> Dict[str, Any]:
     """
     Process PDF bronze data through classification, batching, and LLM transformation
 
     Unified Pipeline: Handles raw Docling format (preferred) with cell structure.
     Legacy flattened format supported for backward compatibility.
+    Tables, and the record batches of large legacy tables, are transformed
+    concurrently; in-flight LLM calls are capped by max_concurrency and rpm_limit.
 
     Args:
         bronze_data: Either:
             - Dict with raw Docling format: {source_file, source_type, tables: [{table_id, cells}]}
             - List with flattened format: [{source_table, ...}, ...] (legacy)
-        llm_transform_fn: Function to call for LLM transformation
+        llm_transform_fn: Function to call for LLM transformation (sync functions
+            run in worker threads, so they must be thread-safe)
             Signature: (table_name: str, table_data: dict) -> tuple[list, dict]
             table_data is either:
                 - Dict with cells: {"table_id": 0, "cells": [...]} (Docling)
                 - List of records: [{...}, {...}] (flattened)
         prompt_template: Base prompt template for LLM
+        max_concurrency: Maximum concurrent LLM calls
+        max_tokens_budget: Estimated record tokens per LLM call for legacy tables
+            (larger batches mean fewer round trips)
+        rpm_limit: Provider requests-per-minute limit (None = max_concurrency only)
+        avg_latency_s: Expected seconds per LLM call, used to size concurrency from rpm_limit
+        group_transform_fn: Optional function that transforms several small Docling tables
+            in one LLM call; tables it misses fall back to llm_transform_fn
+            Signature: (group_name: str, tables: list[tuple[str, data]]) -> dict[str, tuple[list, dict]]
 
     Returns:
         Dictionary with:
@@ -67,116 +505,81 @@ def process_pdf_bronze(
     # Step 2: Classify tables (filter out non-system tables)
     num_tables = len(tables)
     logger.info(f"Step 2: Classifying {num_tables} tables")
-    classifications = classify_tables(tables, is_docling_format=is_raw_docling)
+    fmt = _DOCLING_FORMAT if is_raw_docling else _LEGACY_FORMAT
+    candidates, classifications = _presplit_tiny_tables(tables, fmt)
+    classifications.update(classify_tables(candidates, is_docling_format=is_raw_docling))
 
-    # Separate processable and skipped tables
-    tables_to_process = {name: table_data for name, table_data in tables.items()
-                        if not classifications[name]['skip']}
-    tables_skipped = {name: table_data for name, table_data in tables.items()
-                     if classifications[name]['skip']}
+    # Separate processable and skipped tables (single pass)
+    tables_to_process, tables_skipped = {}, {}
+    for name, table_data in tables.items():
+        target = tables_skipped if classifications[name]['skip'] else tables_to_process
+        target[name] = table_data
 
     logger.info(f"Processing {len(tables_to_process)} tables, skipping {len(tables_skipped)} tables")
 
-    # Step 3: Transform each table using LLM
-    logger.info(f"Step 3: Transforming {len(tables_to_process)} tables using LLM")
-    all_systems = []
+    # Step 3: Transform tables concurrently using LLM
+    concurrency = _concurrency_limit(max_concurrency, rpm_limit, avg_latency_s)
+    logger.info(f"Step 3: Transforming {len(tables_to_process)} tables using LLM (max {concurrency} concurrent calls)")
+    system_chunks = []
     table_results = []
-
-    for table_name, table_data in tables_to_process.items():
-        logger.info(f"\n--- Processing table: {table_name} ---")
-
-        try:
-            if is_raw_docling:
-                # Raw Docling: table_data is dict with cells
-                num_cells = len(table_data.get('cells', []))
-                logger.info(f"Cells: {num_cells}")
-
-                # For now, process entire table in one call
-                # TODO: Add cell-based batching for very large tables
-                systems, table_meta = llm_transform_fn(table_name, table_data)
-
-                all_systems.extend(systems)
-                table_results.append({
-                    "table_name": table_name,
-                    "input_cells": num_cells,
-                    "output_systems": len(systems),
-                    "batches": 1,
-                    "success": True,
-                    "metadata": table_meta
-                })
-
-                logger.info(f"✅ {table_name}: {num_cells} cells → {len(systems)} systems")
-
-            else:
-                # Legacy flattened: table_data is list of records
-                table_records = table_data
-                logger.info(f"Records: {len(table_records)}")
-
-                # Check if table needs batching (>30 records)
-                if len(table_records) > 30:
-                    logger.info(f"Large table detected, splitting into batches...")
-                    record_batches = batch_large_table(table_records, batch_size=30)
-
-                    table_systems = []
-                    for batch_idx, batch_records in enumerate(record_batches, 1):
-                        logger.info(f"  Processing batch {batch_idx}/{len(record_batches)} ({len(batch_records)} records)")
-
-                        batch_systems, batch_meta = llm_transform_fn(
-                            f"{table_name} (batch {batch_idx})",
-                            batch_records
-                        )
-                        table_systems.extend(batch_systems)
-                        logger.info(f"  ✅ Batch {batch_idx}: {len(batch_records)} records → {len(batch_systems)} systems")
-
-                    all_systems.extend(table_systems)
-                    table_results.append({
-                        "table_name": table_name,
-                        "input_records": len(table_records),
-                        "output_systems": len(table_systems),
-                        "batches": len(record_batches),
-                        "success": True
-                    })
-
-                    logger.info(f"✅ {table_name}: {len(table_records)} records → {len(table_systems)} systems (via {len(record_batches)} batches)")
-
-                else:
-                    # Process entire table in one call
-                    systems, table_meta = llm_transform_fn(table_name, table_records)
-
-                    all_systems.extend(systems)
-                    table_results.append({
-                        "table_name": table_name,
-                        "input_records": len(table_records),
-                        "output_systems": len(systems),
-                        "batches": 1,
-                        "success": True,
-                        "metadata": table_meta
-                    })
-
-                    logger.info(f"✅ {table_name}: {len(table_records)} records → {len(systems)} systems")
-
-        except Exception as e:
-            logger.error(f"❌ Failed to process table '{table_name}': {e}")
+    gate = _LLMCallGate(
+        semaphore=asyncio.Semaphore(concurrency),
+        limiter=AsyncRateLimiter(rpm_limit, burst=concurrency) if rpm_limit else None
+    )
+
+    # Coalesce small tables so they share LLM calls instead of one call each
+    groups = _group_small_tables(tables_to_process, fmt, max_tokens_budget) if group_transform_fn else []
+    grouped_names = {table_name for group in groups for table_name, _ in group}
+    single_tables = [(name, data) for name, data in tables_to_process.items() if name not in grouped_names]
+    if groups:
+        logger.info(f"Grouped {len(grouped_names)} small tables into {len(groups)} LLM calls")
+
+    single_outcomes, group_outcomes = await asyncio.gather(
+        asyncio.gather(
+            *[
+                _transform_table(name, data, fmt, llm_transform_fn, gate, max_tokens_budget)
+                for name, data in single_tables
+            ],
+            return_exceptions=True
+        ),
+        asyncio.gather(
+            *[
+                _transform_group(group, group_transform_fn, fmt, llm_transform_fn, gate, max_tokens_budget)
+                for group in groups
+            ]
+        )
+    )
+
+    outcome_by_table = dict(zip((name for name, _ in single_tables), single_outcomes))
+    for group_outcome in group_outcomes:
+        outcome_by_table.update(group_outcome)
+
+    # Reassemble in document order, so systems stay in table order
+    for table_name in tables_to_process:
+        outcome = outcome_by_table[table_name]
+        if isinstance(outcome, Exception):
+            logger.error(f"❌ Failed to process table '{table_name}': {outcome}")
             table_results.append({
                 "table_name": table_name,
                 "output_systems": 0,
                 "batches": 0,
                 "success": False,
-                "error": str(e)
+                "error": str(outcome)
             })
+            continue
+
+        systems, table_result = outcome
+        system_chunks.append(systems)
+        table_results.append(table_result)
+
+    # Flatten once instead of growing a list table by table
+    all_systems = list(itertools.chain.from_iterable(system_chunks))
 
     # Add skipped tables to results
     for table_name, table_data in tables_skipped.items():
-        if is_raw_docling:
-            input_count = len(table_data.get('cells', []))
-            count_key = "input_cells"
-        else:
-            input_count = len(table_data)
-            count_key = "input_records"
-
         table_results.append({
             "table_name": table_name,
-            count_key: input_count,
+            fmt.count_key: fmt.input_count(table_data),
             "output_systems": 0,
             "batches": 0,
             "success": True,
@@ -195,6 +598,6 @@ def process_pdf_bronze(
             "processed_tables": len(tables_to_process),
             "skipped_tables": len(tables_skipped),
             "total_systems": len(all_systems),
-            "format": "raw_docling" if is_raw_docling else "flattened"
+            "format": fmt.name
         }
     }
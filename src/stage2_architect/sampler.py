@@ -1,14 +1,42 @@
 """
 Smart sampling for LLM consumption
 Strategy: First 10 + Middle 10 + Last 10 rows per sheet (or all if ≤30)
+
+The CSV is streamed in chunks (one pass to count rows per sheet, one pass to
+pick the sampled rows), so memory scales with the sample, not the file.
 """
 
+import numpy as np
 import pandas as pd
-from typing import Tuple
+from typing import Dict, Iterator, List, Optional, Tuple
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Rows parsed per chunk while streaming the CSV
+CSV_CHUNK_SIZE = 50_000
+
+# Optional: pyarrow keeps strings in compact Arrow-backed columns
+try:
+    import pyarrow  # noqa: F401
+    _pyarrow_available = True
+except ImportError:
+    _pyarrow_available = False
+
+
+def _iter_csv_chunks(csv_path: str, usecols: Optional[List[str]] = None) -> Iterator[pd.DataFrame]:
+    """
+    Stream a CSV in chunks of CSV_CHUNK_SIZE rows
+
+    The pyarrow engine cannot read in chunks, so the C parser is used with
+    Arrow-backed dtypes when pyarrow is available.
+    """
+    kwargs = {"chunksize": CSV_CHUNK_SIZE, "usecols": usecols}
+    if _pyarrow_available:
+        kwargs["dtype_backend"] = "pyarrow"
+    with pd.read_csv(csv_path, **kwargs) as reader:
+        yield from reader
+
 
 class CSVSampler:
     """Samples CSV data intelligently for LLM analysis"""
@@ -30,67 +58,87 @@ class CSVSampler:
         Returns:
             Tuple of (sampled_dataframe, sampling_metadata)
         """
-        df = pd.read_csv(csv_path)
+        columns = pd.read_csv(csv_path, nrows=0).columns
 
         # Check for source_sheet column
-        if 'source_sheet' not in df.columns:
+        if 'source_sheet' not in columns:
             logger.warning("No 'source_sheet' column found, sampling first 200 rows")
-            sampled = df.head(200)
+            sampled = pd.read_csv(csv_path, nrows=200)
+            total_rows = sum(len(chunk) for chunk in _iter_csv_chunks(csv_path, usecols=[columns[0]]))
             metadata = {
-                "total_rows": len(df),
+                "total_rows": total_rows,
                 "sampled_rows": len(sampled),
                 "sheets": [],
                 "strategy": "simple_head"
             }
             return sampled, metadata
 
-        # Sheet-aware sampling
-        sheets = df['source_sheet'].unique()
-        samples = []
-        sheet_metadata = []
+        # Pass 1: row counts per sheet (first-seen order), reading only source_sheet
+        sheet_sizes: Dict[str, int] = {}
+        total_rows = 0
+        for chunk in _iter_csv_chunks(csv_path, usecols=['source_sheet']):
+            total_rows += len(chunk)
+            for sheet, size in chunk.groupby('source_sheet', sort=False).size().items():
+                sheet_sizes[sheet] = sheet_sizes.get(sheet, 0) + int(size)
 
-        logger.info(f"Found {len(sheets)} unique sheets in CSV")
+        logger.info(f"Found {len(sheet_sizes)} unique sheets in CSV")
 
-        for sheet in sheets:
-            sheet_df = df[df['source_sheet'] == sheet]
-            sheet_size = len(sheet_df)
+        # Positions to keep per sheet (in output order, overlaps repeated as before)
+        n = self.rows_per_section
+        wanted = {}
+        for sheet, sheet_size in sheet_sizes.items():
+            if sheet_size <= 30:
+                wanted[sheet] = np.arange(sheet_size)
+            else:
+                mid_start = max((sheet_size - n) // 2, 0)
+                wanted[sheet] = np.r_[0:min(n, sheet_size), mid_start:min(mid_start + n, sheet_size), max(sheet_size - n, 0):sheet_size]
+
+        # Rows are keyed by sheet offset + position within the sheet, so the
+        # final frame comes from one concat and one reordering take
+        offsets = dict(zip(sheet_sizes, np.cumsum([0, *sheet_sizes.values()])))
+
+        # Pass 2: keep only the wanted rows
+        kept: List[pd.DataFrame] = []
+        seen = dict.fromkeys(sheet_sizes, 0)
+        for chunk in _iter_csv_chunks(csv_path):
+            for sheet, group in chunk.groupby('source_sheet', sort=False):
+                positions = np.arange(seen[sheet], seen[sheet] + len(group))
+                seen[sheet] += len(group)
+                mask = np.isin(positions, wanted[sheet])
+                if mask.any():
+                    kept.append(group[mask].set_axis(positions[mask] + offsets[sheet]))
+
+        sheet_metadata = []
+
+        for sheet, sheet_size in sheet_sizes.items():
+            sampled_rows = len(wanted[sheet])
 
             if sheet_size <= 30:
                 # Small sheet - take everything
-                sample = sheet_df
                 strategy = "all"
                 logger.info(f"  📄 {sheet}: {sheet_size} rows (sending all)")
             else:
                 # Large sheet - first N + middle N + last N
-                first_n = sheet_df.head(self.rows_per_section)
-                last_n = sheet_df.tail(self.rows_per_section)
-
-                # Calculate middle section
-                mid_start = (sheet_size - self.rows_per_section) // 2
-                mid_end = mid_start + self.rows_per_section
-                middle_n = sheet_df.iloc[mid_start:mid_end]
-
-                sample = pd.concat([first_n, middle_n, last_n])
-                strategy = f"first_{self.rows_per_section}_middle_{self.rows_per_section}_last_{self.rows_per_section}"
-                logger.info(f"  📄 {sheet}: {sheet_size} rows (first {self.rows_per_section} + middle {self.rows_per_section} + last {self.rows_per_section})")
+                strategy = f"first_{n}_middle_{n}_last_{n}"
+                logger.info(f"  📄 {sheet}: {sheet_size} rows (first {n} + middle {n} + last {n})")
 
-            samples.append(sample)
             sheet_metadata.append({
                 "sheet_name": sheet,
                 "total_rows": sheet_size,
-                "sampled_rows": len(sample),
+                "sampled_rows": sampled_rows,
                 "strategy": strategy
             })
 
-        sampled_df = pd.concat(samples, ignore_index=True)
+        order = np.concatenate([wanted[sheet] + offsets[sheet] for sheet in sheet_sizes])
+        sampled_df = pd.concat(kept).loc[order].reset_index(drop=True)
 
         metadata = {
-            "total_rows": len(df),
+            "total_rows": total_rows,
             "sampled_rows": len(sampled_df),
             "sheets": sheet_metadata,
             "strategy": "sheet_aware"
         }
 
-        logger.info(f"✅ Total sampled: {len(sampled_df)} rows from {len(sheets)} sheets")
+        logger.info(f"✅ Total sampled: {len(sampled_df)} rows from {len(sheet_sizes)} sheets")
 
         return sampled_df, metadata
@@ -2,13 +2,57 @@
 Validator for silver layer JSON against schema
 """
 
-import json
 import logging
+from collections import Counter
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional, Union
+
+import orjson
 
 logger = logging.getLogger(__name__)
 
+# Allowed enum values, in display order for messages; frozensets for O(1) lookup
+_SYSTEM_TYPE_CHOICES = ("AC", "HP", "Ductless", "MultiZone", "Package", "Unknown")
+_COMPONENT_TYPE_CHOICES = ("ODU", "IDU", "Coil", "Furnace", "AirHandler", "AuxHeat",
+                           "Thermostat", "Accessory", "LineSet", "Other")
+_VALID_SYSTEM_TYPES = frozenset(_SYSTEM_TYPE_CHOICES)
+_VALID_COMPONENT_TYPES = frozenset(_COMPONENT_TYPE_CHOICES)
+_INVALID_MODEL_SENTINELS = frozenset({"", "N/A", "nan"})
+_NUMERIC_TYPES = (int, float)
+
+@lru_cache(maxsize=4)
+def _load_schema(schema_path: str) -> dict:
+    """Load and parse a schema file once per path (treat the result as read-only)"""
+    return orjson.loads(Path(schema_path).read_bytes())
+
+
+# Marks a key that is absent, as opposed to present with a null value
+_MISSING = object()
+
+
+def _extend_capped(target: list, items: List[str], cap: Optional[int]) -> int:
+    """
+    Extend target with items without growing it past cap
+
+    Returns:
+        Number of items dropped
+    """
+    if cap is None:
+        target.extend(items)
+        return 0
+    room = max(cap - len(target), 0)
+    target.extend(items[:room])
+    return max(len(items) - room, 0)
+
+
+def _is_member(value: Any, choices: frozenset) -> bool:
+    """Set membership that treats unhashable values (dicts, lists) as non-members"""
+    try:
+        return value in choices
+    except TypeError:
+        return False
+
 
 class SilverValidator:
     """Validates silver layer output against schema"""
@@ -30,22 +74,32 @@ class SilverValidator:
         if not self.schema_path.exists():
             raise FileNotFoundError(f"Schema file not found: {self.schema_path}")
 
-        # Load schema for reference
-        with open(self.schema_path, 'r') as f:
-            self.schema = json.load(f)
+        # Load schema for reference (parsed once per path, shared between validators)
+        self.schema = _load_schema(str(self.schema_path))
 
-    def validate(self, silver_data: dict) -> Dict[str, Any]:
+    def validate(
+        self,
+        silver_data: dict,
+        max_errors: Optional[int] = None,
+        max_warnings: Optional[int] = None
+    ) -> Dict[str, Any]:
         """
         Validate silver layer data
 
         Args:
             silver_data: Dictionary containing systems array
+            max_errors: Stop validating once this many errors are found (None = no cap)
+            max_warnings: Keep at most this many warnings (None = no cap)
 
         Returns:
             Validation result dictionary with:
             - valid: bool
-            - errors: list of error messages
-            - warnings: list of warning messages
+            - errors: list of error messages (at most max_errors)
+            - warnings: list of warning messages (at most max_warnings, plus a
+              stop notice when errors_truncated)
+            - errors_truncated: True if max_errors was reached with errors dropped
+              or systems/components left unchecked
+            - warnings_truncated: True if warnings were dropped
             - stats: statistics about the data
         """
         errors = []
@@ -58,6 +112,8 @@ class SilverValidator:
                 "valid": False,
                 "errors": errors,
                 "warnings": warnings,
+                "errors_truncated": False,
+                "warnings_truncated": False,
                 "stats": {}
             }
 
@@ -67,6 +123,8 @@ class SilverValidator:
                 "valid": False,
                 "errors": errors,
                 "warnings": warnings,
+                "errors_truncated": False,
+                "warnings_truncated": False,
                 "stats": {}
             }
 
@@ -78,14 +136,29 @@ class SilverValidator:
                 "valid": False,
                 "errors": errors,
                 "warnings": warnings,
+                "errors_truncated": False,
+                "warnings_truncated": False,
                 "stats": {}
             }
 
-        # Validate each system
+        # Validate each system, stopping early on badly broken inputs
+        errors_truncated = False
+        warnings_dropped = 0
         for i, system in enumerate(systems):
-            system_errors, system_warnings = self._validate_system(system, i)
-            errors.extend(system_errors)
-            warnings.extend(system_warnings)
+            remaining = None if max_errors is None else max_errors - len(errors)
+            system_errors, system_warnings, stopped_early = self._validate_system(system, i, remaining)
+            errors_dropped = _extend_capped(errors, system_errors, max_errors)
+            warnings_dropped += _extend_capped(warnings, system_warnings, max_warnings)
+
+            if max_errors is not None and len(errors) >= max_errors:
+                # Reaching the cap on the last error of the last system drops nothing
+                errors_truncated = errors_dropped > 0 or stopped_early or i + 1 < len(systems)
+                if errors_truncated:
+                    warnings.append(f"Validation stopped at {max_errors} errors (system {i + 1} of {len(systems)})")
+                break
+
+        if warnings_dropped:
+            logger.info(f"Dropped {warnings_dropped} warnings beyond the cap of {max_warnings}")
 
         # Collect stats
         stats = self._collect_stats(silver_data)
@@ -107,44 +180,55 @@ class SilverValidator:
             "valid": len(errors) == 0,
             "errors": errors,
             "warnings": warnings,
+            "errors_truncated": errors_truncated,
+            "warnings_truncated": warnings_dropped > 0,
             "stats": stats
         }
 
-    def _validate_system(self, system: dict, index: int) -> tuple:
-        """Validate a single system object"""
+    def _validate_system(self, system: dict, index: int, max_errors: Optional[int] = None) -> tuple:
+        """
+        Validate a single system object, checking components until max_errors is hit
+
+        Returns:
+            (errors, warnings, stopped_early) where stopped_early is True if
+            components were left unchecked because of max_errors
+        """
         errors = []
         warnings = []
+        stopped_early = False
 
         if not isinstance(system, dict):
             errors.append(f"System {index}: Must be a dictionary")
-            return errors, warnings
+            return errors, warnings, stopped_early
 
-        # Check required fields
-        if "system_id" not in system:
+        # Check required fields (one lookup per key; _MISSING tells absent from null)
+        system_id = system.get("system_id", _MISSING)
+        if system_id is _MISSING:
             errors.append(f"System {index}: Missing required field 'system_id'")
-        elif not system["system_id"]:
+        elif not system_id:
             errors.append(f"System {index}: 'system_id' cannot be empty")
 
-        if "components" not in system:
+        components = system.get("components", _MISSING)
+        if components is _MISSING:
             errors.append(f"System {index}: Missing required field 'components'")
-        elif not isinstance(system["components"], list):
+        elif not isinstance(components, list):
             errors.append(f"System {index}: 'components' must be an array")
-        elif len(system["components"]) == 0:
+        elif len(components) == 0:
             errors.append(f"System {index}: Must have at least one component")
         else:
-            # Validate components
-            for j, component in enumerate(system["components"]):
-                comp_errors, comp_warnings = self._validate_component(component, index, j)
-                errors.extend(comp_errors)
-                warnings.extend(comp_warnings)
+            # Validate components, appending straight into this system's lists
+            for j, component in enumerate(components):
+                self._validate_component(component, index, j, errors, warnings)
+                if max_errors is not None and len(errors) >= max_errors:
+                    stopped_early = j + 1 < len(components)
+                    break
 
         if "metadata" not in system:
             warnings.append(f"System {index}: Missing 'metadata' field")
 
         # Validate system_attributes if present
-        if "system_attributes" in system and system["system_attributes"] is not None:
-            attrs = system["system_attributes"]
-
+        attrs = system.get("system_attributes")
+        if attrs is not None:
             if not isinstance(attrs, dict):
                 errors.append(f"System {index}: 'system_attributes' must be a dictionary or null")
             else:
@@ -153,65 +237,67 @@ class SilverValidator:
                     warnings.append(f"System {index}: 'system_attributes' missing 'source_sheet'")
 
                 # Check data types
-                if "tonnage" in attrs and attrs["tonnage"] is not None:
-                    if not isinstance(attrs["tonnage"], (int, float)):
-                        errors.append(f"System {index}: 'tonnage' must be a number, got {type(attrs['tonnage'])}")
+                tonnage = attrs.get("tonnage")
+                if tonnage is not None and not isinstance(tonnage, _NUMERIC_TYPES):
+                    errors.append(f"System {index}: 'tonnage' must be a number, got {type(tonnage)}")
 
-                if "capacity_btu" in attrs and attrs["capacity_btu"] is not None:
-                    if not isinstance(attrs["capacity_btu"], int):
-                        errors.append(f"System {index}: 'capacity_btu' must be an integer")
+                capacity_btu = attrs.get("capacity_btu")
+                if capacity_btu is not None and not isinstance(capacity_btu, int):
+                    errors.append(f"System {index}: 'capacity_btu' must be an integer")
 
-                if "total_price" in attrs and attrs["total_price"] is not None:
-                    if not isinstance(attrs["total_price"], (int, float)):
-                        errors.append(f"System {index}: 'total_price' must be a number")
+                total_price = attrs.get("total_price")
+                if total_price is not None and not isinstance(total_price, _NUMERIC_TYPES):
+                    errors.append(f"System {index}: 'total_price' must be a number")
 
                 # Check system_type enum
-                if "system_type" in attrs:
-                    valid_types = ["AC", "HP", "Ductless", "MultiZone", "Package", "Unknown"]
-                    if attrs["system_type"] not in valid_types:
-                        warnings.append(f"System {index}: 'system_type' should be one of {valid_types}, got '{attrs['system_type']}'")
-
-        return errors, warnings
-
-    def _validate_component(self, component: dict, system_index: int, component_index: int) -> tuple:
-        """Validate a single component"""
-        errors = []
-        warnings = []
-
+                system_type = attrs.get("system_type", _MISSING)
+                if system_type is not _MISSING and not _is_member(system_type, _VALID_SYSTEM_TYPES):
+                    warnings.append(f"System {index}: 'system_type' should be one of {list(_SYSTEM_TYPE_CHOICES)}, got '{system_type}'")
+
+        return errors, warnings, stopped_early
+
+    def _validate_component(
+        self,
+        component: dict,
+        system_index: int,
+        component_index: int,
+        errors: List[str],
+        warnings: List[str]
+    ) -> None:
+        """Validate a single component, appending to the caller's errors and warnings"""
         if not isinstance(component, dict):
             errors.append(f"System {system_index}, Component {component_index}: Must be a dictionary")
-            return errors, warnings
+            return
 
         # Check required fields
-        if "component_type" not in component:
+        comp_type = component.get("component_type", _MISSING)
+        if comp_type is _MISSING:
             errors.append(f"System {system_index}, Component {component_index}: Missing 'component_type'")
-        else:
-            valid_types = ["ODU", "IDU", "Coil", "Furnace", "AirHandler", "AuxHeat", "Thermostat", "Accessory", "LineSet", "Other"]
-            if component["component_type"] not in valid_types:
-                warnings.append(f"System {system_index}, Component {component_index}: "
-                              f"'component_type' should be one of {valid_types}, got '{component['component_type']}'")
+        elif not _is_member(comp_type, _VALID_COMPONENT_TYPES):
+            warnings.append(f"System {system_index}, Component {component_index}: "
+                          f"'component_type' should be one of {list(_COMPONENT_TYPE_CHOICES)}, got '{comp_type}'")
 
-        if "model_number" not in component:
+        model = component.get("model_number", _MISSING)
+        if model is _MISSING:
             errors.append(f"System {system_index}, Component {component_index}: Missing 'model_number'")
-        elif not component["model_number"] or component["model_number"] in ["", "N/A", "nan"]:
-            errors.append(f"System {system_index}, Component {component_index}: Invalid 'model_number': {component['model_number']}")
+        elif not model or _is_member(model, _INVALID_MODEL_SENTINELS):
+            errors.append(f"System {system_index}, Component {component_index}: Invalid 'model_number': {model}")
 
         # Check price if present
-        if "price" in component and component["price"] is not None:
-            if not isinstance(component["price"], (int, float)):
+        price = component.get("price")
+        if price is not None:
+            if not isinstance(price, _NUMERIC_TYPES):
                 errors.append(f"System {system_index}, Component {component_index}: 'price' must be a number")
-            elif component["price"] < 0:
-                warnings.append(f"System {system_index}, Component {component_index}: Negative price: {component['price']}")
-
-        return errors, warnings
+            elif price < 0:
+                warnings.append(f"System {system_index}, Component {component_index}: Negative price: {price}")
 
     def _collect_stats(self, silver_data: dict) -> dict:
         """Collect statistics about the data"""
         systems = silver_data.get("systems", [])
 
         total_components = 0
-        component_types = {}
-        system_types = {}
+        component_types = Counter()
+        system_types = Counter()
         data_quality_counts = {"high": 0, "medium": 0, "low": 0}
 
         for system in systems:
@@ -220,14 +306,11 @@ class SilverValidator:
             total_components += len(components)
 
             # Count component types
-            for comp in components:
-                comp_type = comp.get("component_type", "Unknown")
-                component_types[comp_type] = component_types.get(comp_type, 0) + 1
+            component_types.update(comp.get("component_type", "Unknown") for comp in components)
 
             # Count system types
             if system.get("system_attributes"):
-                sys_type = system["system_attributes"].get("system_type", "Unknown")
-                system_types[sys_type] = system_types.get(sys_type, 0) + 1
+                system_types[system["system_attributes"].get("system_type", "Unknown")] += 1
 
             # Count data quality
             if system.get("metadata"):
@@ -239,22 +322,38 @@ class SilverValidator:
             "total_systems": len(systems),
             "total_components": total_components,
             "avg_components_per_system": round(total_components / len(systems), 2) if len(systems) > 0 else 0,
-            "component_types": component_types,
-            "system_types": system_types,
+            "component_types": dict(component_types),
+            "system_types": dict(system_types),
             "data_quality": data_quality_counts
         }
 
 
-def validate_silver(silver_data: dict, schema_path: str = None) -> Dict[str, Any]:
+@lru_cache(maxsize=4)
+def _get_validator(schema_path: str = None) -> SilverValidator:
+    """Reuse one validator per schema path; validators hold no per-call state"""
+    return SilverValidator(schema_path)
+
+
+def validate_silver(
+    silver_data: Union[dict, str, Path],
+    schema_path: str = None,
+    max_errors: Optional[int] = None,
+    max_warnings: Optional[int] = None
+) -> Dict[str, Any]:
     """
     Convenience function for validation
 
     Args:
-        silver_data: Silver layer data to validate
+        silver_data: Silver layer data to validate, or a path to a silver JSON file
         schema_path: Optional path to schema file
+        max_errors: Stop validating once this many errors are found (None = no cap)
+        max_warnings: Keep at most this many warnings (None = no cap)
 
     Returns:
         Validation result dictionary
     """
-    validator = SilverValidator(schema_path)
-    return validator.validate(silver_data)
+    if isinstance(silver_data, (str, Path)):
+        silver_data = orjson.loads(Path(silver_data).read_bytes())
+
+    validator = _get_validator(schema_path)
+    return validator.validate(silver_data, max_errors=max_errors, max_warnings=max_warnings)
@@ -2,20 +2,143 @@
 Validates generated transformer by running its self-tests
 """
 
+import io
+import runpy
 import subprocess
+import sys
+import threading
+import traceback
 import logging
 from pathlib import Path
-from typing import Dict, Any
+from typing import Dict, Any, Tuple
 
 logger = logging.getLogger(__name__)
 
+# Seconds allowed for a transformer's self-tests
+VALIDATION_TIMEOUT = 30
 
-def validate_transformer(transformer_path: str) -> Dict[str, Any]:
+
+# Thread ident -> (stdout, stderr) buffers of in-process runs still capturing
+_captures: Dict[int, Tuple[io.StringIO, io.StringIO]] = {}
+_capture_lock = threading.Lock()
+
+
+class _StreamRouter:
+    """
+    Stand-in for sys.stdout/sys.stderr while transformers run in-process
+
+    Writes from a thread with an active capture go to that thread's buffer;
+    writes from every other thread go to the original stream.
+    """
+
+    def __init__(self, original, index: int):
+        self.original = original
+        self._index = index  # 0 = stdout buffer, 1 = stderr buffer
+
+    def _stream(self):
+        buffers = _captures.get(threading.get_ident())
+        return buffers[self._index] if buffers else self.original
+
+    def write(self, text):
+        return self._stream().write(text)
+
+    def flush(self):
+        self._stream().flush()
+
+    def __getattr__(self, name):
+        return getattr(self.original, name)
+
+
+def _start_capture(stdout: io.StringIO, stderr: io.StringIO) -> None:
+    """Capture the calling thread's output, installing the routers on first use"""
+    with _capture_lock:
+        if not _captures:
+            sys.stdout = _StreamRouter(sys.stdout, 0)
+            sys.stderr = _StreamRouter(sys.stderr, 1)
+        _captures[threading.get_ident()] = (stdout, stderr)
+
+
+def _stop_capture(ident: int) -> None:
+    """Stop capturing a thread's output; the last capture puts the original streams back"""
+    with _capture_lock:
+        _captures.pop(ident, None)
+        if not _captures:
+            if isinstance(sys.stdout, _StreamRouter):
+                sys.stdout = sys.stdout.original
+            if isinstance(sys.stderr, _StreamRouter):
+                sys.stderr = sys.stderr.original
+
+
+def _run_in_process(transformer_path: str, timeout: int) -> Dict[str, Any]:
+    """
+    Execute the transformer's __main__ block in this interpreter
+
+    Runs on a daemon thread so the timeout can be enforced. Only that thread's
+    output is captured, and the process-wide streams are restored when the run
+    ends or times out. A transformer that hangs is abandoned (not killed) and
+    keeps running with whatever global state it changed; runpy also rewrites
+    sys.argv[0] and the script's directory is not on sys.path. Only used for
+    trusted scripts (isolated=False).
+    """
+    stdout, stderr = io.StringIO(), io.StringIO()
+    outcome = {"passed": False, "error": None}
+
+    def _target():
+        _start_capture(stdout, stderr)
+        try:
+            runpy.run_path(transformer_path, run_name="__main__")
+            outcome["passed"] = True
+        except SystemExit as e:
+            # Mirror the interpreter: exit(0) / exit(None) is success
+            outcome["passed"] = e.code in (0, None)
+            if not outcome["passed"]:
+                outcome["error"] = stderr.getvalue() or f"Exited with status {e.code}"
+        except BaseException:
+            outcome["error"] = stderr.getvalue() + traceback.format_exc()
+        finally:
+            _stop_capture(threading.get_ident())
+
+    worker = threading.Thread(target=_target, name="transformer-validate", daemon=True)
+    worker.start()
+    worker.join(timeout)
+
+    if worker.is_alive():
+        # Release the streams now; the abandoned thread's later output goes to them
+        _stop_capture(worker.ident)
+        raise subprocess.TimeoutExpired(transformer_path, timeout)
+
+    return {
+        "passed": outcome["passed"],
+        "output": stdout.getvalue(),
+        "error": outcome["error"]
+    }
+
+
+def _run_isolated(transformer_path: str, timeout: int) -> Dict[str, Any]:
+    """Execute the transformer in a fresh python3 subprocess"""
+    result = subprocess.run(
+        ['python3', transformer_path],
+        capture_output=True,
+        text=True,
+        timeout=timeout
+    )
+
+    return {
+        "passed": result.returncode == 0,
+        "output": result.stdout,
+        "error": None if result.returncode == 0 else result.stderr
+    }
+
+
+def validate_transformer(transformer_path: str, isolated: bool = True) -> Dict[str, Any]:
     """
     Run transformer's self-tests to validate it works
 
     Args:
         transformer_path: Path to generated transformer .py file
+        isolated: Run in a separate python3 process (default, required for
+            generated code). False runs trusted scripts in-process, skipping
+            interpreter startup
 
     Returns:
         Dict with 'passed' (bool), 'output' (str), 'error' (str)
@@ -24,34 +147,23 @@ def validate_transformer(transformer_path: str) -> Dict[str, Any]:
 
     try:
         # Run the transformer (which runs __main__ block with tests)
-        result = subprocess.run(
-            ['python3', transformer_path],
-            capture_output=True,
-            text=True,
-            timeout=30
-        )
-
-        if result.returncode == 0:
+        if isolated:
+            result = _run_isolated(transformer_path, VALIDATION_TIMEOUT)
+        else:
+            result = _run_in_process(transformer_path, VALIDATION_TIMEOUT)
+
+        if result["passed"]:
             logger.info("✅ Transformer self-tests passed")
-            return {
-                "passed": True,
-                "output": result.stdout,
-                "error": None
-            }
         else:
-            logger.error(f"❌ Transformer self-tests failed:\n{result.stderr}")
-            return {
-                "passed": False,
-                "output": result.stdout,
-                "error": result.stderr
-            }
+            logger.error(f"❌ Transformer self-tests failed:\n{result['error']}")
+        return result
 
     except subprocess.TimeoutExpired:
         logger.error("❌ Transformer validation timed out")
         return {
             "passed": False,
             "output": "",
-            "error": "Validation timeout (30s)"
+            "error": f"Validation timeout ({VALIDATION_TIMEOUT}s)"
         }
     except Exception as e:
         logger.error(f"❌ Validation error: {e}")
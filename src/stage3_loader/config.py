@@ -2,12 +2,13 @@
 Configuration for Stage 3 Excel Loader
 """
 import os
+from types import MappingProxyType
 
 # Path to taxonomy configuration
 TAXONOMY_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), "config", "taxonomy.json")
 
-# Excel column definitions (32 columns total)
-EXCEL_COLUMNS = [
+# Excel column definitions (32 columns total, immutable)
+EXCEL_COLUMNS = (
     "Costbook Title",
     "Job Name",
     "Job Description",
@@ -40,10 +41,13 @@ EXCEL_COLUMNS = [
     "Custom Filter 10", # Reserved
     "Custom Filter 11", # Reserved
     "Custom Filter 12", # Reserved
-]
+)
+
+# Column name -> position in EXCEL_COLUMNS (rows are stored as lists in this order)
+COLUMN_INDEX = MappingProxyType({name: i for i, name in enumerate(EXCEL_COLUMNS)})
 
-# Header row descriptions for columns (row 0 in Excel)
-EXCEL_COLUMN_DESCRIPTIONS = [
+# Header row descriptions for columns (row 0 in Excel, immutable)
+EXCEL_COLUMN_DESCRIPTIONS = (
     "This is the Costbook name. Every item within this importshould have this coumn filled will the correct costbook.",
     "This is the Flat Rate Job name. Each item with the same 'Job Name' will be a part of the same flat rate job.",
     "This is the description of the 'Flat Rate Job'. The first 'Job Description' for each flat rate job will be used.",
@@ -76,7 +80,7 @@ EXCEL_COLUMN_DESCRIPTIONS = [
     "Custom Filter 10",
     "Custom Filter 11",
     "Custom Filter 12",
-]
+)
 
 # Custom filter definitions (taxonomy v2.0)
 CUSTOM_FILTERS = [
@@ -89,17 +93,19 @@ CUSTOM_FILTERS = [
     {"name": "Compressor", "type": "Multi-Select"},
 ]
 
-# Filter sheet column names
-FILTER_COLUMNS = [
+# Filter sheet column names (immutable)
+FILTER_COLUMNS = (
     "Enter all filter types listed in Sheet 1, columns U to AC.",
     "Choose a type: Single Select or Multi-Select.",
-]
+)
 
-# Filter sheet header row
-FILTER_HEADER = [
+# Filter sheet header row (immutable)
+FILTER_HEADER = (
     "Filter Name",
     "Filter Type",
-]
+)
+
+# Display-name lookups below are read-only views so callers cannot mutate them
 
 # Default values for item fields
 DEFAULT_APPLY_TAX = "Yes"
@@ -108,7 +114,7 @@ DEFAULT_PRODUCT_OR_SERVICE = "Product"
 DEFAULT_PRICEBOOK_CATEGORY = "-"
 
 # Component type display names
-COMPONENT_TYPE_DISPLAY = {
+COMPONENT_TYPE_DISPLAY = MappingProxyType({
     "ODU": "AC",
     "Coil": "Evap Coil",
     "Furnace": "Furnace",
@@ -117,10 +123,10 @@ COMPONENT_TYPE_DISPLAY = {
     "Outdoor Unit": "AC",
     "Evaporator": "Evap Coil",
     "Air Handler": "Air Handler",
-}
+})
 
 # System type display names (v3.0 - granular packaged types)
-SYSTEM_TYPE_DISPLAY = {
+SYSTEM_TYPE_DISPLAY = MappingProxyType({
     "AC": "AC",
     "Heat Pump": "Heat Pump",
     "HP": "Heat Pump",
@@ -128,10 +134,10 @@ SYSTEM_TYPE_DISPLAY = {
     "Ductless": "Ductless",
     "Packaged": "Packaged AC",  # Legacy fallback
     "Package": "Packaged AC",   # Legacy fallback
-}
+})
 
 # Stages display names (v3.0)
-STAGES_DISPLAY = {
+STAGES_DISPLAY = MappingProxyType({
     "single": "Single Stage",
     "single_stage": "Single Stage",
     "two": "Two Stage",
@@ -142,20 +148,20 @@ STAGES_DISPLAY = {
     "inverter": "Variable Speed",
     "modulating": "Variable Speed",
     "multi": "Multi Stage",
-}
+})
 
 # Orientation display names for item descriptions
-ORIENTATION_DISPLAY = {
+ORIENTATION_DISPLAY = MappingProxyType({
     "upflow": "Upflow",
     "downflow": "Downflow",
     "horizontal": "Horizontal",
     "multi": "Multi-Position",
     "multiposition": "Multi-Position",
     "multi-position": "Multi-Position",
-}
+})
 
 # Efficiency rating labels for item descriptions
-EFFICIENCY_LABELS = {
+EFFICIENCY_LABELS = MappingProxyType({
     "seer2": "SEER2",
     "seer": "SEER",
     "eer2": "EER2",
@@ -163,10 +169,10 @@ EFFICIENCY_LABELS = {
     "hspf2": "HSPF2",
     "hspf": "HSPF",
     "afue": "AFUE",
-}
+})
 
 # Component description display names (more descriptive than COMPONENT_TYPE_DISPLAY)
-COMPONENT_DESC_DISPLAY = {
+COMPONENT_DESC_DISPLAY = MappingProxyType({
     "ODU": "Condenser",
     "Coil": "Evaporator Coil",
     "Furnace": "Furnace",
@@ -179,4 +185,4 @@ COMPONENT_DESC_DISPLAY = {
     "Thermostat": "Thermostat",
     "Accessory": "Accessory",
     "LineSet": "Line Set",
-}
+})
@@ -1,7 +1,11 @@
 """
 Excel Formatter - Formats silver JSON data into Excel structure
 """
-from typing import Dict, List, Optional
+import bisect
+import re
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
 from .taxonomy_classifier import TaxonomyClassifier
 from .config import (
     COMPONENT_TYPE_DISPLAY,
@@ -12,23 +16,216 @@ from .config import (
     DEFAULT_PRODUCT_OR_SERVICE,
     DEFAULT_PRICEBOOK_CATEGORY,
     ORIENTATION_DISPLAY,
-    COMPONENT_DESC_DISPLAY
+    COMPONENT_DESC_DISPLAY,
+    EXCEL_COLUMNS,
+    COLUMN_INDEX
 )
 
+# Column keys for the pricebook categories and custom filters, formatted once
+_PRICEBOOK_KEYS = tuple(f"Pricebook Category {i}" for i in range(1, 11))
+_FILTER_KEYS = tuple(f"Custom Filter {i}" for i in range(1, 13))
+
+# Row positions; rows are built as lists in EXCEL_COLUMNS order
+_JOB_NAME = COLUMN_INDEX["Job Name"]
+_JOB_DESCRIPTION = COLUMN_INDEX["Job Description"]
+_ITEM_NAME = COLUMN_INDEX["Item Name"]
+_ITEM_DESCRIPTION = COLUMN_INDEX["Item Description"]
+_ITEM_SKU = COLUMN_INDEX["Item #/SKU"]
+_UNIT_COST = COLUMN_INDEX["Unit Cost"]
+_CATEGORY_1 = COLUMN_INDEX[_PRICEBOOK_KEYS[0]]
+_CATEGORY_2 = COLUMN_INDEX[_PRICEBOOK_KEYS[1]]
+_FILTER_INDEXES = tuple(COLUMN_INDEX[key] for key in _FILTER_KEYS)
+
+# Capacity range upper bounds (inclusive) and their labels; the last label is open-ended
+_CAP_THRESHOLDS = (18000, 24000, 30000, 36000, 42000, 48000, 60000)
+_CAP_LABELS = (
+    '12,000-18,000 BTU',
+    '18,001-24,000 BTU',
+    '24,001-30,000 BTU',
+    '30,001-36,000 BTU',
+    '36,001-42,000 BTU',
+    '42,001-48,000 BTU',
+    '48,001-60,000 BTU',
+    '60,001+ BTU',
+)
+
+
+def _try_int(value) -> Optional[int]:
+    """int(value), or None when it cannot be converted (numbers skip the try/except)"""
+    if isinstance(value, int):
+        return int(value)
+    if isinstance(value, float):
+        return None if value != value else int(value)
+    try:
+        return int(value)
+    except (ValueError, TypeError):
+        return None
+
+
+def _round_rating(value):
+    """Round a rating for filter display; empty and non-numeric values pass through"""
+    if not value:
+        return value
+    if type(value) is int:
+        return value
+    if type(value) is float:
+        return value if value != value else round(value)
+    try:
+        return round(float(value))
+    except (ValueError, TypeError):
+        return value
+
+
+# System attributes the taxonomy classifier reads (part of the classification cache key)
+_CLASSIFY_ATTR_KEYS = ('tonnage', 'system_type', 'stages', 'seer2', 'seer', 'hspf2', 'hspf', 'configuration')
+
+# Model numbers repeat heavily across a catalog, so model-only inferences are memoized
+_MODEL_CACHE_SIZE = 4096
+
+
+# Model-number patterns behind the heat pump, coil and air handler checks, one named group per tag:
+# GSZ/ASZ = Goodman/Amana heat pump prefixes, NC prefix = cased coil, VS/ECM = variable speed motor
+_MODEL_TAG_RE = re.compile(r'^(?P<hp_prefix>GSZ|ASZ)|^(?P<cased_prefix>NC)|(?P<variable_speed>VS|ECM)')
+
+
+@lru_cache(maxsize=_MODEL_CACHE_SIZE)
+def _model_tags(model_upper: str) -> frozenset:
+    """Tags of every model-number pattern present, found in one regex pass"""
+    return frozenset(match.lastgroup for match in _MODEL_TAG_RE.finditer(model_upper))
+
+
+@lru_cache(maxsize=_MODEL_CACHE_SIZE)
+def _fuel_type_from_model(model_upper: str) -> str:
+    """Furnace fuel type from model number patterns (defaults to gas)"""
+    if model_upper.startswith('G') or 'GAS' in model_upper:
+        return "Gas"
+    if model_upper.startswith('E') and not model_upper.startswith('EV'):
+        return "Electric"
+    return "Gas"
+
+
+@lru_cache(maxsize=_MODEL_CACHE_SIZE)
+def _afue_from_model(model_upper: str) -> Optional[int]:
+    """AFUE percentage from common model number patterns"""
+    if '97' in model_upper or '98' in model_upper:
+        return 97
+    if '96' in model_upper:
+        return 96
+    if '95' in model_upper:
+        return 95
+    if '92' in model_upper:
+        return 92
+    if '80' in model_upper:
+        return 80
+    return None
+
+
+# Stage/orientation values come from a small vocabulary, so their display labels are memoized
+_LABEL_CACHE_SIZE = 256
+
+
+@lru_cache(maxsize=_LABEL_CACHE_SIZE)
+def _stages_label(stages: str) -> str:
+    """Display label for a stages value (mapped name, else title case)"""
+    return STAGES_DISPLAY.get(stages.lower(), stages.title())
+
+
+@lru_cache(maxsize=_LABEL_CACHE_SIZE)
+def _orientation_label(orientation: str) -> str:
+    """Display label for an orientation value (mapped name, else title case)"""
+    return ORIENTATION_DISPLAY.get(orientation.lower(), orientation.title())
+
+
+# Orientation codes in priority order (first match wins when a model has several)
+_ORIENTATIONS = (('U', 'Upflow'), ('D', 'Downflow'), ('H', 'Horizontal'), ('M', 'Multi-Position'))
+
+# Orientation letter at the end of the model, after a dash, or before a dash
+_MODEL_ORIENT_RE = re.compile(r'-([UDHM])|([UDHM])(?=-|$)')
+
+# Orientation letter at the end of the model or before a dash
+_SYSTEM_ORIENT_RE = re.compile(r'[UDHM](?=-|$)')
+
+
+def _pick_orientation(codes) -> str:
+    """Highest-priority orientation among the matched letter codes"""
+    found = set(codes)
+    for code, orientation in _ORIENTATIONS:
+        if code in found:
+            return orientation
+    return ""
+
+
+@lru_cache(maxsize=_MODEL_CACHE_SIZE)
+def _orientation_from_model(model_upper: str) -> str:
+    """Orientation from model number suffix and common patterns (one regex pass)"""
+    return _pick_orientation(
+        after or before for after, before in _MODEL_ORIENT_RE.findall(model_upper)
+    )
+
+
+@dataclass
+class _DescriptionContext:
+    """Component fields used by the item description, resolved once"""
+    comp_type: str
+    model: str
+    model_upper: str = ""            # Normalized once for the model-number checks
+    desc_lower: str = ""             # Normalized once for the description checks
+    model_tags: frozenset = frozenset()  # Model-number pattern tags (see _MODEL_TAG_RE)
+    tonnage: object = None
+    capacity: object = None
+    stages: object = None            # System stages only
+    component_stages: object = None  # System stages, else component spec stages
+    voltage: object = None
+    is_heat_pump: bool = False
+    seer: object = None
+    seer_label: str = "SEER"
+    hspf: object = None
+    hspf_label: str = "HSPF"
+    eer: object = None
+    eer_label: str = "EER"
+
 
 class ExcelFormatter:
     """Formats system data into Excel rows"""
 
-    def __init__(self, costbook_title: str = "WinSupply"):
+    def __init__(self, costbook_title: str = "WinSupply", build_descriptions: bool = True):
         """
         Initialize formatter
 
         Args:
             costbook_title: The costbook title for all items
+            build_descriptions: Generate rich item descriptions; when False the
+                "Item Description" column is left blank (for exports that drop it)
         """
         self.costbook_title = costbook_title
+        self.build_descriptions = build_descriptions
         self.classifier = TaxonomyClassifier()
 
+        # Static defaults for all 32 columns; each row starts as a copy of this
+        template = dict.fromkeys(EXCEL_COLUMNS, "")
+        template.update({
+            "Costbook Title": costbook_title,
+            "Apply Tax": DEFAULT_APPLY_TAX,
+            "Quantity": DEFAULT_QUANTITY,
+            "Product or Service": DEFAULT_PRODUCT_OR_SERVICE,
+        })
+        template.update(dict.fromkeys(_PRICEBOOK_KEYS, DEFAULT_PRICEBOOK_CATEGORY))
+        template.update(dict.fromkeys(_FILTER_KEYS, ""))
+        self._row_template = list(template.values())
+
+        # Classification signature -> (categories, category string); catalogs repeat system shapes
+        self._classify_cache: Dict[tuple, Tuple[List[str], str]] = {}
+
+        # Component type -> describer returning (display name, line 2, line 3 parts)
+        self._describers = {
+            'ODU': self._describe_odu,
+            'Furnace': self._describe_furnace,
+            'Coil': self._describe_coil,
+            'AHU': self._describe_air_handler,
+            'AirHandler': self._describe_air_handler,
+            'Air Handler': self._describe_air_handler,
+        }
+
     def _safe_get_specs(self, component: Dict) -> Dict:
         """
         Safely get specifications dict from component.
@@ -54,7 +251,9 @@ class ExcelFormatter:
     def _build_item_description(
         self,
         component: Dict,
-        system_attrs: Optional[Dict] = None
+        system_attrs: Optional[Dict] = None,
+        model_text: Optional[str] = None,
+        description_text: Optional[str] = None
     ) -> str:
         """
         Build a rich 2-3 line description for a component.
@@ -62,276 +261,244 @@ class ExcelFormatter:
         Args:
             component: Component dict from silver JSON
             system_attrs: System attributes (optional, for system components)
+            model_text: str(model_number or '') if the caller already has it
+            description_text: str(description or '') if the caller already has it
 
         Returns:
             Multi-line description string
         """
-        lines = []
         attrs = system_attrs or {}
         specs = self._safe_get_specs(component)
-        comp_type = component.get('component_type', '')
-        model = component.get('model_number', '')
-
-        # Line 1: Component type with capacity info
-        line1 = self._build_description_line1(component, attrs, specs)
-        if line1:
-            lines.append(line1)
+        ctx = self._build_description_context(component, attrs, specs, model_text, description_text)
+        comp_type = ctx.comp_type
 
-        # Line 2: Efficiency ratings
-        line2 = self._build_description_line2(component, attrs, specs)
-        if line2:
-            lines.append(line2)
+        # One lookup on component type yields the display name (line 1),
+        # the efficiency/feature line (line 2) and the configuration parts (line 3)
+        describe = self._describers.get(comp_type, self._describe_default)
+        display_name, line2, config_parts = describe(specs, ctx)
 
-        # Line 3: Configuration and model
-        line3 = self._build_description_line3(component, attrs, specs)
-        if line3:
-            lines.append(line3)
+        # Line 1: Component type with capacity info
+        capacity_parts = [display_name]
+        if ctx.tonnage:
+            capacity_parts.append(f"{ctx.tonnage} Ton")
+        if ctx.capacity:
+            capacity = _try_int(ctx.capacity)
+            if capacity is not None:
+                capacity_parts.append(f"{capacity:,} BTU")
+        # No join for a bare display name: it may be None/non-str for malformed component types
+        line1 = " - ".join(capacity_parts) if len(capacity_parts) > 1 else display_name
+
+        # Line 3: Configuration and model (model number always last)
+        config_parts = [part for part in config_parts if part]
+        if ctx.model:
+            config_parts.append(f"Model: {ctx.model}")
+        line3 = " | ".join(config_parts)
+
+        lines = [line for line in (line1, line2, line3) if line]
 
         # Fallback: if no lines generated, use basic description
         if not lines:
             comp_display = COMPONENT_DESC_DISPLAY.get(comp_type, comp_type)
-            return f"{comp_display}\nModel: {model}" if model else comp_display
+            return f"{comp_display}\nModel: {ctx.model}" if ctx.model else comp_display
 
         return "\n".join(lines)
 
-    def _build_description_line1(
+    def _build_description_context(
         self,
         component: Dict,
         attrs: Dict,
-        specs: Dict
-    ) -> str:
-        """Build line 1: Component type with capacity info"""
-        comp_type = component.get('component_type', '')
-
-        # Determine display name based on component type
-        if comp_type == 'ODU':
-            display_name = "Heat Pump" if self._is_heat_pump_odu(component, attrs) else "AC Condenser"
-        elif comp_type == 'Furnace':
-            fuel_type = self._infer_furnace_fuel_type(component, specs)
-            display_name = f"{fuel_type} Furnace" if fuel_type else "Furnace"
-        elif comp_type == 'Coil':
-            coil_type = self._infer_coil_type(component)
-            display_name = f"{coil_type} Evaporator Coil" if coil_type else "Evaporator Coil"
-        else:
-            display_name = COMPONENT_DESC_DISPLAY.get(comp_type, comp_type)
-
-        # Build capacity info
-        parts = [display_name]
+        specs: Dict,
+        model_text: Optional[str] = None,
+        description_text: Optional[str] = None
+    ) -> _DescriptionContext:
+        """Resolve the component fields the description needs (system attributes win over specs)"""
+        if model_text is None:
+            model_text = str(component.get('model_number') or '')
+        if description_text is None:
+            description_text = str(component.get('description') or '')
+
+        attr_stages = attrs.get('stages')
+        model_upper = model_text.upper()
+        ctx = _DescriptionContext(
+            comp_type=component.get('component_type', ''),
+            model=component.get('model_number', ''),
+            model_upper=model_upper,
+            model_tags=_model_tags(model_upper),
+            desc_lower=description_text.lower(),
+            tonnage=attrs.get('tonnage') or specs.get('tonnage'),
+            capacity=attrs.get('capacity_btu') or specs.get('capacity_btu'),
+            stages=attr_stages,
+            component_stages=attr_stages or specs.get('stages'),
+            voltage=attrs.get('voltage') or specs.get('voltage'),
+        )
 
-        # Add tonnage
-        tonnage = attrs.get('tonnage') or specs.get('tonnage')
-        if tonnage:
-            parts.append(f"{tonnage} Ton")
+        # Efficiency ratings only appear on condenser descriptions
+        if ctx.comp_type == 'ODU':
+            ctx.is_heat_pump = self._is_heat_pump_odu(attrs, ctx.model_tags, ctx.desc_lower)
+            for key in ('seer', 'hspf', 'eer'):
+                rated2 = attrs.get(f'{key}2')
+                spec_rated2 = specs.get(f'{key}2')
+                setattr(ctx, key, rated2 or attrs.get(key) or spec_rated2 or specs.get(key))
+                if rated2 or spec_rated2:
+                    setattr(ctx, f'{key}_label', f"{key.upper()}2")
 
-        # Add BTU capacity
-        capacity = attrs.get('capacity_btu') or specs.get('capacity_btu')
-        if capacity:
-            try:
-                parts.append(f"{int(capacity):,} BTU")
-            except (ValueError, TypeError):
-                pass
+        return ctx
 
-        return " - ".join(parts) if len(parts) > 1 else parts[0]
+    def _describe_odu(self, specs: Dict, ctx: _DescriptionContext) -> Tuple[str, str, list]:
+        """Condenser: heat pump vs AC, SEER/HSPF/EER ratings, stages and voltage"""
+        display_name = "Heat Pump" if ctx.is_heat_pump else "AC Condenser"
 
-    def _build_description_line2(
-        self,
-        component: Dict,
-        attrs: Dict,
-        specs: Dict
-    ) -> str:
-        """Build line 2: Efficiency ratings"""
-        comp_type = component.get('component_type', '')
         efficiency_parts = []
+        if ctx.seer:
+            efficiency_parts.append(f"{ctx.seer_label}: {ctx.seer}")
+        if ctx.is_heat_pump and ctx.hspf:
+            efficiency_parts.append(f"{ctx.hspf_label}: {ctx.hspf}")
+        if ctx.eer:
+            efficiency_parts.append(f"{ctx.eer_label}: {ctx.eer}")
 
-        if comp_type == 'ODU':
-            # SEER2/SEER
-            seer = attrs.get('seer2') or attrs.get('seer') or specs.get('seer2') or specs.get('seer')
-            if seer:
-                label = "SEER2" if (attrs.get('seer2') or specs.get('seer2')) else "SEER"
-                efficiency_parts.append(f"{label}: {seer}")
-
-            # HSPF2/HSPF (for heat pumps)
-            if self._is_heat_pump_odu(component, attrs):
-                hspf = attrs.get('hspf2') or attrs.get('hspf') or specs.get('hspf2') or specs.get('hspf')
-                if hspf:
-                    label = "HSPF2" if (attrs.get('hspf2') or specs.get('hspf2')) else "HSPF"
-                    efficiency_parts.append(f"{label}: {hspf}")
-
-            # EER2/EER
-            eer = attrs.get('eer2') or attrs.get('eer') or specs.get('eer2') or specs.get('eer')
-            if eer:
-                label = "EER2" if (attrs.get('eer2') or specs.get('eer2')) else "EER"
-                efficiency_parts.append(f"{label}: {eer}")
-
-        elif comp_type == 'Furnace':
-            # AFUE
-            afue = specs.get('afue') or self._infer_afue_from_model(component.get('model_number', ''))
-            if afue:
-                efficiency_parts.append(f"{afue}% AFUE")
-
-            # Stages
-            stages = self._format_stages_display(attrs.get('stages') or specs.get('stages'))
-            if stages:
-                efficiency_parts.append(stages)
-
-        elif comp_type == 'Coil':
-            # For coils, show system compatibility
-            stages = self._format_stages_display(attrs.get('stages'))
-            if stages:
-                return f"For use with {stages.lower()} systems"
-
-        elif comp_type in ('AHU', 'AirHandler', 'Air Handler'):
-            # Air handler speed type
-            speed_type = self._infer_air_handler_speed(component)
-            if speed_type:
-                return speed_type
-
-        return " | ".join(efficiency_parts) if efficiency_parts else ""
-
-    def _build_description_line3(
-        self,
-        component: Dict,
-        attrs: Dict,
-        specs: Dict
-    ) -> str:
-        """Build line 3: Configuration and model number"""
-        parts = []
-        model = component.get('model_number', '')
-        comp_type = component.get('component_type', '')
-
-        # Add stages for ODU
-        if comp_type == 'ODU':
-            stages = self._format_stages_display(attrs.get('stages'))
-            if stages:
-                parts.append(stages)
-
-        # Add orientation for furnaces, coils, air handlers
-        if comp_type in ('Furnace', 'Coil', 'AHU', 'AirHandler', 'Air Handler'):
-            orientation = self._infer_orientation_from_model(model) or specs.get('orientation')
-            if orientation:
-                # Convert to display format
-                orientation_display = ORIENTATION_DISPLAY.get(orientation.lower(), orientation.title())
-                parts.append(orientation_display)
-
-        # Add voltage if available
-        voltage = attrs.get('voltage') or specs.get('voltage')
-        if voltage and comp_type == 'ODU':
-            parts.append(voltage)
+        return display_name, " | ".join(efficiency_parts), [self._format_stages_display(ctx.stages), ctx.voltage]
 
-        # Always add model number
-        if model:
-            parts.append(f"Model: {model}")
+    def _describe_furnace(self, specs: Dict, ctx: _DescriptionContext) -> Tuple[str, str, list]:
+        """Furnace: fuel type, AFUE and stages, orientation"""
+        fuel_type = self._infer_furnace_fuel_type(specs, ctx.model_upper, ctx.desc_lower)
+        display_name = f"{fuel_type} Furnace" if fuel_type else "Furnace"
 
-        return " | ".join(parts) if parts else ""
+        efficiency_parts = []
+        afue = specs.get('afue') or _afue_from_model(ctx.model_upper)
+        if afue:
+            efficiency_parts.append(f"{afue}% AFUE")
+        stages = self._format_stages_display(ctx.component_stages)
+        if stages:
+            efficiency_parts.append(stages)
+
+        return display_name, " | ".join(efficiency_parts), [self._orientation_display(ctx.model_upper, specs)]
+
+    def _describe_coil(self, specs: Dict, ctx: _DescriptionContext) -> Tuple[str, str, list]:
+        """Evaporator coil: cased vs uncased, system compatibility, orientation"""
+        coil_type = self._infer_coil_type(ctx.model_tags, ctx.desc_lower)
+        display_name = f"{coil_type} Evaporator Coil" if coil_type else "Evaporator Coil"
+
+        # For coils, show system compatibility
+        stages = self._format_stages_display(ctx.stages)
+        line2 = f"For use with {stages.lower()} systems" if stages else ""
+
+        return display_name, line2, [self._orientation_display(ctx.model_upper, specs)]
+
+    def _describe_air_handler(self, specs: Dict, ctx: _DescriptionContext) -> Tuple[str, str, list]:
+        """Air handler: motor/speed type, orientation"""
+        display_name = COMPONENT_DESC_DISPLAY.get(ctx.comp_type, ctx.comp_type)
+        line2 = self._infer_air_handler_speed(ctx.model_tags, ctx.desc_lower)
+        return display_name, line2, [self._orientation_display(ctx.model_upper, specs)]
+
+    def _describe_default(self, specs: Dict, ctx: _DescriptionContext) -> Tuple[str, str, list]:
+        """Any other component: display name only"""
+        return COMPONENT_DESC_DISPLAY.get(ctx.comp_type, ctx.comp_type), "", []
+
+    def _orientation_display(self, model_upper: str, specs: Dict) -> str:
+        """Orientation display name from the model number, else the component specs"""
+        orientation = _orientation_from_model(model_upper) or specs.get('orientation')
+        if not orientation:
+            return ""
+        if type(orientation) is str:
+            return _orientation_label(orientation)
+        return ORIENTATION_DISPLAY.get(orientation.lower(), orientation.title())
 
     # ==================== Inference Helper Methods ====================
 
-    def _is_heat_pump_odu(self, component: Dict, system_attrs: Dict) -> bool:
-        """Determine if ODU is a heat pump"""
+    def _is_heat_pump_odu(self, system_attrs: Dict, model_tags: frozenset, desc_lower: str) -> bool:
+        """Determine if ODU is a heat pump (description lower-cased)"""
         system_type = str(system_attrs.get('system_type') or '').upper()
         has_hspf = system_attrs.get('hspf2') or system_attrs.get('hspf')
-        model = str(component.get('model_number') or '').upper()
-        description = str(component.get('description') or '').lower()
 
         return (
             system_type in ('HP', 'HEAT PUMP', 'HEATPUMP') or
             has_hspf or
-            'heat pump' in description or
-            model.startswith('GSZ') or  # Goodman heat pump prefix
-            model.startswith('ASZ')     # Amana heat pump prefix
+            'heat pump' in desc_lower or
+            'hp_prefix' in model_tags
         )
 
     def _format_stages_display(self, stages: Optional[str]) -> str:
         """Format stages value for description display"""
         if not stages:
             return ""
-        return STAGES_DISPLAY.get(str(stages).lower(), str(stages).title())
+        return _stages_label(str(stages))
 
-    def _infer_furnace_fuel_type(self, component: Dict, specs: Dict) -> str:
-        """Infer furnace fuel type from model number or specs"""
+    def _infer_furnace_fuel_type(self, specs: Dict, model_upper: str, desc_lower: str) -> str:
+        """Infer furnace fuel type from specs, description or model number"""
         if specs.get('fuel_type'):
             return specs['fuel_type'].title()
 
-        model = str(component.get('model_number') or '').upper()
-        description = str(component.get('description') or '').lower()
-
-        if 'electric' in description:
+        if 'electric' in desc_lower:
             return "Electric"
-        if 'gas' in description:
-            return "Gas"
-
-        # Model number patterns
-        if model.startswith('G') or 'GAS' in model:
+        if 'gas' in desc_lower:
             return "Gas"
-        if model.startswith('E') and not model.startswith('EV'):
-            return "Electric"
-
-        return "Gas"  # Default to gas
-
-    def _infer_afue_from_model(self, model: str) -> Optional[int]:
-        """Infer AFUE percentage from model number"""
-        model_upper = str(model).upper()
-
-        # Look for common AFUE patterns in model numbers
-        if '97' in model_upper or '98' in model_upper:
-            return 97
-        if '96' in model_upper:
-            return 96
-        if '95' in model_upper:
-            return 95
-        if '92' in model_upper:
-            return 92
-        if '80' in model_upper:
-            return 80
 
-        return None
-
-    def _infer_orientation_from_model(self, model: str) -> str:
-        """Infer orientation from model number suffix"""
-        model_upper = str(model).upper()
-
-        # Check suffixes and common patterns
-        if model_upper.endswith('U') or '-U' in model_upper or 'U-' in model_upper:
-            return "Upflow"
-        if model_upper.endswith('D') or '-D' in model_upper or 'D-' in model_upper:
-            return "Downflow"
-        if model_upper.endswith('H') or '-H' in model_upper or 'H-' in model_upper:
-            return "Horizontal"
-        if model_upper.endswith('M') or '-M' in model_upper or 'M-' in model_upper:
-            return "Multi-Position"
-
-        return ""
+        # Model number patterns (defaults to gas)
+        return _fuel_type_from_model(model_upper)
 
-    def _infer_coil_type(self, component: Dict) -> str:
+    def _infer_coil_type(self, model_tags: frozenset, desc_lower: str) -> str:
         """Infer if coil is cased or uncased"""
-        description = str(component.get('description') or '').lower()
-        model = str(component.get('model_number') or '').upper()
-
-        if 'uncased' in description or 'bare' in description:
+        if 'uncased' in desc_lower or 'bare' in desc_lower:
             return "Uncased"
-        if 'cased' in description or 'cabinet' in description:
+        if 'cased' in desc_lower or 'cabinet' in desc_lower:
             return "Cased"
 
         # Model number patterns - NC prefix often means cased
-        if model.startswith('NC'):
+        if 'cased_prefix' in model_tags:
             return "Cased"
 
         return "Cased"  # Default to cased
 
-    def _infer_air_handler_speed(self, component: Dict) -> str:
+    def _infer_air_handler_speed(self, model_tags: frozenset, desc_lower: str) -> str:
         """Infer air handler motor/speed type"""
-        description = str(component.get('description') or '').lower()
-        model = str(component.get('model_number') or '').lower()
-
-        if 'variable' in description or 'vs' in model or 'ecm' in description or 'ecm' in model:
+        if 'variable' in desc_lower or 'ecm' in desc_lower or 'variable_speed' in model_tags:
             return "Variable Speed ECM Motor"
-        if 'multi' in description or 'multi-speed' in description:
+        if 'multi' in desc_lower or 'multi-speed' in desc_lower:
             return "Multi-Speed Motor"
 
         return ""
 
     # ==================== End Description Builder Methods ====================
 
+    def format_systems(self, systems: Iterable[Dict]) -> List[Dict]:
+        """
+        Format many systems into Excel rows in one pass
+
+        Systems that fail to format are reported and skipped.
+
+        Args:
+            systems: System dicts from silver JSON
+
+        Returns:
+            List of row dicts, in system then component order
+        """
+        return [dict(zip(EXCEL_COLUMNS, row)) for row in self._iter_system_rows(systems)]
+
+    def iter_rows(self, systems: Iterable[Dict]) -> Iterator[List]:
+        """
+        Stream formatted rows as lists in EXCEL_COLUMNS order
+
+        Suited to writers that take positional rows (openpyxl write-only
+        worksheets, csv.writer). Systems that fail to format are reported and skipped.
+
+        Args:
+            systems: System dicts from silver JSON
+
+        Yields:
+            One list of 32 cell values per component row
+        """
+        return self._iter_system_rows(systems)
+
+    def _iter_system_rows(self, systems: Iterable[Dict]) -> Iterator[List]:
+        """Yield list rows system by system, skipping systems that fail to format"""
+        for system in systems:
+            try:
+                rows = self._format_system_rows(system)
+            except Exception as e:
+                print(f"Warning: Error formatting system {system.get('system_id', 'unknown')}: {e}")
+                continue
+            yield from rows
+
     def format_system(self, system: Dict) -> List[Dict]:
         """
         Format a system into one or more Excel rows (one per component)
@@ -342,6 +509,10 @@ class ExcelFormatter:
         Returns:
             List of row dicts, one per component
         """
+        return [dict(zip(EXCEL_COLUMNS, row)) for row in self._format_system_rows(system)]
+
+    def _format_system_rows(self, system: Dict) -> List[List]:
+        """Format a system into list rows (EXCEL_COLUMNS order), one per component"""
         # Check if this is a single item (not a full system)
         if self._is_single_item(system):
             return self._format_single_item(system)
@@ -355,14 +526,15 @@ class ExcelFormatter:
         if not isinstance(components, list):
             components = []
 
-        # Generate shared fields
+        # Generate shared fields (fuel source feeds both the description and filters)
         job_name = self._generate_job_name(system)
-        job_description = self._generate_job_description(system)
-        categories = self.classifier.classify_system(system)
-        category_string = self.classifier.build_category_string(system)
+        fuel_source = self._determine_fuel_source(system)
+        job_description = self._generate_job_description(system, fuel_source)
+        categories, category_string = self._classify(system)
 
-        # Get custom filter values
-        custom_filters = self._extract_custom_filters(system)
+        # Get custom filter values, in column order
+        custom_filters = self._extract_custom_filters(system, fuel_source)
+        filter_values = [custom_filters[key] for key in _FILTER_KEYS]
 
         # Create one row per component
         rows = []
@@ -375,13 +547,73 @@ class ExcelFormatter:
                 job_description=job_description,
                 categories=categories,
                 category_string=category_string,
-                custom_filters=custom_filters,
+                filter_values=filter_values,
                 system_attrs=attrs
             )
             rows.append(row)
 
         return rows
 
+    def _classify(self, system: Dict) -> Tuple[List[str], str]:
+        """
+        Taxonomy categories and category string, cached by classification signature
+
+        The signature holds every field the classifier reads; systems with
+        unhashable values there are classified without caching.
+        """
+        key = self._classification_key(system)
+        if key is not None:
+            try:
+                return self._classify_cache[key]
+            except KeyError:
+                pass
+            except TypeError:
+                key = None
+
+        categories = self.classifier.classify_system(system)
+        result = (categories, self.classifier.build_category_string(system, categories))
+        if key is not None:
+            self._classify_cache[key] = result
+        return result
+
+    @staticmethod
+    def _classification_key(system: Dict) -> Optional[tuple]:
+        """
+        Hashable signature of the fields TaxonomyClassifier reads, or None if not cacheable
+
+        Values are paired with their type so that 1, 1.0 and True (equal as
+        keys, but stringified differently by the classifier) stay distinct.
+        """
+        components = system.get('components', [])
+        if not isinstance(components, list):
+            return None
+
+        attrs = system.get('system_attributes')
+        if isinstance(attrs, dict):
+            attrs_key = (bool(attrs),) + tuple(
+                (type(value), value) for value in map(attrs.get, _CLASSIFY_ATTR_KEYS)
+            )
+        else:
+            attrs_key = (type(attrs), bool(attrs))
+
+        types_key = tuple(
+            (type(c.get('component_type')), c.get('component_type')) if isinstance(c, dict) else None
+            for c in components
+        )
+
+        # Standalone components are classified from the first component's details
+        first_key = None
+        if components and isinstance(components[0], dict):
+            first = components[0]
+            specs = first.get('specifications')
+            afue = specs.get('afue') if isinstance(specs, dict) else None
+            first_key = tuple(
+                (type(value), value)
+                for value in (first.get('model_number'), first.get('description'), afue)
+            )
+
+        return attrs_key, types_key, first_key
+
     def _generate_job_name(self, system: Dict) -> str:
         """
         Generate job name like:
@@ -401,7 +633,7 @@ class ExcelFormatter:
         system_id = str(ahri_number or system.get('system_id') or '')
 
         # Format stages
-        stages_display = STAGES_DISPLAY.get(stages.lower(), stages.title())
+        stages_display = _stages_label(stages)
 
         # Format system type
         system_type_display = SYSTEM_TYPE_DISPLAY.get(system_type, system_type)
@@ -425,9 +657,13 @@ class ExcelFormatter:
 
         return " ".join(parts)
 
-    def _generate_job_description(self, system: Dict) -> str:
+    def _generate_job_description(self, system: Dict, fuel_source: Optional[str] = None) -> str:
         """
         Generate detailed job description with all components listed
+
+        Args:
+            system: System dict from silver JSON
+            fuel_source: Precomputed fuel source (determined here if None)
         """
         attrs = system.get('system_attributes') or {}
         components = system.get('components', [])
@@ -444,7 +680,7 @@ class ExcelFormatter:
         stages = str(attrs.get('stages') or 'single')
         configuration = str(attrs.get('configuration') or 'split')
 
-        stages_display = STAGES_DISPLAY.get(stages.lower(), stages.title())
+        stages_display = _stages_label(stages)
 
         lines.append(f"{stages_display} {configuration.title()} System")
         lines.append("")
@@ -486,7 +722,8 @@ class ExcelFormatter:
             lines.append(f"* HSPF: {attrs['hspf']}")
 
         # Determine fuel source
-        fuel_source = self._determine_fuel_source(system)
+        if fuel_source is None:
+            fuel_source = self._determine_fuel_source(system)
         if fuel_source:
             lines.append(f"* Fuel Source: {fuel_source}")
 
@@ -499,10 +736,10 @@ class ExcelFormatter:
         job_description: str,
         categories: List[str],
         category_string: str,
-        custom_filters: Dict,
+        filter_values: List,
         system_attrs: Optional[Dict] = None
-    ) -> Dict:
-        """Create a single row for a component"""
+    ) -> List:
+        """Create a single row (list in EXCEL_COLUMNS order) for a component"""
 
         # Format item name like "* AC: NS16A18SA5"
         comp_type = component.get('component_type', 'Component')
@@ -511,44 +748,36 @@ class ExcelFormatter:
         item_name = f"* {comp_display}: {model}"
 
         # Format item description using the rich description builder
-        description = self._build_item_description(component, system_attrs)
+        description = self._build_item_description(component, system_attrs) if self.build_descriptions else ""
 
         # Get price
         price = component.get('price', '')
 
-        # Build row dict with all 32 columns
-        row = {
-            "Costbook Title": self.costbook_title,
-            "Job Name": job_name,
-            "Job Description": job_description,
-            "Item Name": item_name,
-            "Item Description": description,
-            "Item #/SKU": model,
-            "Unit Cost": price,
-            "Apply Tax": DEFAULT_APPLY_TAX,
-            "Quantity": DEFAULT_QUANTITY,
-            "Product or Service": DEFAULT_PRODUCT_OR_SERVICE,
-        }
+        # Start from the 32-column template (categories 3-10 stay at the default)
+        row = self._row_template.copy()
+        row[_JOB_NAME] = job_name
+        row[_JOB_DESCRIPTION] = job_description
+        row[_ITEM_NAME] = item_name
+        row[_ITEM_DESCRIPTION] = description
+        row[_ITEM_SKU] = model
+        row[_UNIT_COST] = price
 
         # Add pricebook categories (up to 10) - v3.0 2-level taxonomy
         # Category 1: System Type or Component Category
-        row["Pricebook Category 1"] = categories[0] if len(categories) > 0 else DEFAULT_PRICEBOOK_CATEGORY
+        if len(categories) > 0:
+            row[_CATEGORY_1] = categories[0]
 
         # Category 2: Staging (for systems) or Component Type (for standalone components)
-        row["Pricebook Category 2"] = categories[1] if len(categories) > 1 else DEFAULT_PRICEBOOK_CATEGORY
-
-        # Categories 3-10: Reserved for future use (Orientation, Brand, etc.)
-        for i in range(3, 11):
-            row[f"Pricebook Category {i}"] = DEFAULT_PRICEBOOK_CATEGORY
+        if len(categories) > 1:
+            row[_CATEGORY_2] = categories[1]
 
-        # Add custom filters (12 filters)
-        for i in range(1, 13):
-            key = f"Custom Filter {i}"
-            row[key] = custom_filters.get(key, "")
+        # Add custom filters (12 filters, in column order)
+        for index, value in zip(_FILTER_INDEXES, filter_values):
+            row[index] = value
 
         return row
 
-    def _extract_custom_filters(self, system: Dict) -> Dict:
+    def _extract_custom_filters(self, system: Dict, fuel_source: Optional[str] = None) -> Dict:
         """Extract custom filter values from system attributes (taxonomy v2.0)"""
         attrs = system.get('system_attributes', {})
 
@@ -563,23 +792,9 @@ class ExcelFormatter:
         if tonnage and tonnage != 0:
             tonnage = round(float(tonnage))
 
-        if seer2:
-            try:
-                seer2 = round(float(seer2))
-            except (ValueError, TypeError):
-                pass
-
-        if eer2:
-            try:
-                eer2 = round(float(eer2))
-            except (ValueError, TypeError):
-                pass
-
-        if hspf2:
-            try:
-                hspf2 = round(float(hspf2))
-            except (ValueError, TypeError):
-                pass
+        seer2 = _round_rating(seer2)
+        eer2 = _round_rating(eer2)
+        hspf2 = _round_rating(hspf2)
 
         # Convert capacity to range
         if capacity_btu:
@@ -591,7 +806,7 @@ class ExcelFormatter:
             "Custom Filter 3": seer2,            # SEER 2 (rounded)
             "Custom Filter 4": eer2,             # EER2 (rounded)
             "Custom Filter 5": hspf2,            # HSPF 2 (rounded)
-            "Custom Filter 6": self._determine_fuel_source(system),  # Fuel Source
+            "Custom Filter 6": fuel_source if fuel_source is not None else self._determine_fuel_source(system),  # Fuel Source
             "Custom Filter 7": self._extract_compressor_type(system),  # Compressor
             "Custom Filter 8": '',  # Reserved
             "Custom Filter 9": '',  # Reserved
@@ -609,43 +824,36 @@ class ExcelFormatter:
         except (ValueError, TypeError):
             return ''
 
-        if btu <= 18000:
-            return '12,000-18,000 BTU'
-        elif btu <= 24000:
-            return '18,001-24,000 BTU'
-        elif btu <= 30000:
-            return '24,001-30,000 BTU'
-        elif btu <= 36000:
-            return '30,001-36,000 BTU'
-        elif btu <= 42000:
-            return '36,001-42,000 BTU'
-        elif btu <= 48000:
-            return '42,001-48,000 BTU'
-        elif btu <= 60000:
-            return '48,001-60,000 BTU'
-        else:
-            return '60,001+ BTU'
+        # NaN fails every comparison, so it lands in the open-ended range as before
+        if btu != btu:
+            return _CAP_LABELS[-1]
+
+        return _CAP_LABELS[bisect.bisect_left(_CAP_THRESHOLDS, btu)]
 
     def _determine_fuel_source(self, system: Dict) -> str:
         """Determine fuel source from system components"""
         components = system.get('components', [])
 
-        has_furnace = any('furnace' in c.get('component_type', '').lower() for c in components)
-        has_heat_pump = any('heat pump' in str(c).lower() for c in components)
-
         attrs = system.get('system_attributes', {})
         system_type = (attrs.get('system_type') or '').lower()
 
-        if 'heat pump' in system_type or has_heat_pump:
-            return 'Electric'
-        elif has_furnace:
-            # Check model number for gas indicators
-            for c in components:
-                if 'furnace' in c.get('component_type', '').lower():
-                    model = c.get('model_number', '').lower()
-                    if 'g' in model or 'gas' in model:
-                        return 'Gas'
+        # One pass over the components collects every flag the decision needs
+        has_furnace = furnace_is_gas = False
+        is_heat_pump = 'heat pump' in system_type
+        for c in components:
+            # Numeric or null fields are read as text so they cannot drop the system
+            if 'furnace' in str(c.get('component_type') or '').lower():
+                has_furnace = True
+                # 'g' also covers 'gas'
+                if not furnace_is_gas and 'g' in str(c.get('model_number') or '').lower():
+                    furnace_is_gas = True
+            if not is_heat_pump and 'heat pump' in str(c).lower():
+                is_heat_pump = True
+
+        if is_heat_pump:
             return 'Electric'
+        elif has_furnace and furnace_is_gas:
+            return 'Gas'
         else:
             return 'Electric'
 
@@ -657,14 +865,9 @@ class ExcelFormatter:
             model = comp.get('model_number', '').upper()
 
             # Check for orientation suffixes
-            if model.endswith('U') or 'U-' in model:
-                return 'Upflow'
-            elif model.endswith('D') or 'D-' in model:
-                return 'Downflow'
-            elif model.endswith('H') or 'H-' in model:
-                return 'Horizontal'
-            elif model.endswith('M') or 'M-' in model:
-                return 'Multi-Position'
+            orientation = _pick_orientation(_SYSTEM_ORIENT_RE.findall(model))
+            if orientation:
+                return orientation
 
         return 'Horizontal'  # Default
 
@@ -722,28 +925,23 @@ class ExcelFormatter:
         if not isinstance(components, list):
             return True
 
-        # If no components or more than 1, check attributes
+        # Zero or several components is never a single item, whatever the attributes say
+        if len(components) != 1:
+            return False
+
         attrs = system.get('system_attributes')
         if not isinstance(attrs, dict) or not attrs:
             # Missing system attributes = single item
-            return len(components) == 1
+            return True
 
-        # Check if key system attributes are missing
-        has_tonnage = attrs.get('tonnage') is not None and attrs.get('tonnage') != 0
+        # One component AND missing most key attributes (tonnage, stages, system type)
+        tonnage = attrs.get('tonnage')
+        has_tonnage = tonnage is not None and tonnage != 0
         has_stages = attrs.get('stages') is not None
         has_system_type = attrs.get('system_type') is not None
+        return has_tonnage + has_stages + has_system_type < 2
 
-        # If missing key attributes, treat as single item
-        if not (has_tonnage or has_stages or has_system_type):
-            return len(components) == 1
-
-        # If only 1 component AND missing most attributes, it's a single item
-        if len(components) == 1 and sum([has_tonnage, has_stages, has_system_type]) < 2:
-            return True
-
-        return False
-
-    def _format_single_item(self, system: Dict) -> List[Dict]:
+    def _format_single_item(self, system: Dict) -> List[List]:
         """
         Format a single item (not a full system)
 
@@ -783,38 +981,28 @@ class ExcelFormatter:
         item_name = base_name
 
         # Generate rich item description for single items too
-        item_description = self._build_item_description(component, None)
-
-        # Build row
-        row = {
-            "Costbook Title": self.costbook_title,
-            "Job Name": item_name,
-            "Job Description": "",  # Blank for single items
-            "Item Name": item_name,
-            "Item Description": item_description,  # Rich description for single items
-            "Item #/SKU": model,
-            "Unit Cost": price,
-            "Apply Tax": DEFAULT_APPLY_TAX,
-            "Quantity": DEFAULT_QUANTITY,
-            "Product or Service": DEFAULT_PRODUCT_OR_SERVICE,
-        }
+        item_description = (
+            self._build_item_description(component, None, model, description)
+            if self.build_descriptions else ""
+        )
+
+        # Build row from the 32-column template (Job Description and custom filters stay blank)
+        row = self._row_template.copy()
+        row[_JOB_NAME] = item_name
+        row[_ITEM_NAME] = item_name
+        row[_ITEM_DESCRIPTION] = item_description  # Rich description for single items
+        row[_ITEM_SKU] = model
+        row[_UNIT_COST] = price
 
         # Use taxonomy classifier for single items (same as complete systems)
-        categories = self.classifier.classify_system(system)
-        category_string = self.classifier.build_category_string(system)
+        categories, category_string = self._classify(system)
 
         # Category 1: Component category (e.g., "Furnaces", "Air Handlers")
-        row["Pricebook Category 1"] = categories[0] if len(categories) > 0 else DEFAULT_PRICEBOOK_CATEGORY
+        if len(categories) > 0:
+            row[_CATEGORY_1] = categories[0]
 
         # Category 2: Component subcategory (e.g., "High Efficiency (95%+ AFUE)")
-        row["Pricebook Category 2"] = categories[1] if len(categories) > 1 else DEFAULT_PRICEBOOK_CATEGORY
-
-        # Fill remaining categories with default
-        for i in range(3, 11):
-            row[f"Pricebook Category {i}"] = DEFAULT_PRICEBOOK_CATEGORY
-
-        # Add empty custom filters (no system-level specs for single items)
-        for i in range(1, 13):
-            row[f"Custom Filter {i}"] = ""
+        if len(categories) > 1:
+            row[_CATEGORY_2] = categories[1]
 
         return [row]
@@ -3,15 +3,23 @@ Silver to Excel Loader - Main loader module
 Converts Silver JSON to formatted Excel workbook
 """
 import json
+import math
+import multiprocessing
+import operator
 import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import List, Dict
-import pandas as pd
-from openpyxl import load_workbook
+from typing import Iterable, Iterator, List, Dict, Optional, Sequence
+import orjson
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
 from openpyxl.styles import Font
+from openpyxl.utils import get_column_letter
 
 from .excel_formatter import ExcelFormatter
 from .config import (
+    COLUMN_INDEX,
     EXCEL_COLUMNS,
     EXCEL_COLUMN_DESCRIPTIONS,
     CUSTOM_FILTERS,
@@ -19,6 +27,101 @@ from .config import (
     FILTER_HEADER
 )
 
+# Optional: ijson streams systems out of the silver file one at a time
+try:
+    import ijson
+    _ijson_available = True
+except ImportError:
+    _ijson_available = False
+
+# Optional: xlsxwriter streams rows to disk in constant memory (preferred writer)
+try:
+    import xlsxwriter
+    _xlsxwriter_available = True
+except ImportError:
+    _xlsxwriter_available = False
+
+# Header font shared by every bold cell (openpyxl styles are immutable)
+_BOLD_FONT = Font(bold=True)
+
+# Values of a formatted row dict in EXCEL_COLUMNS order
+_row_values = operator.itemgetter(*EXCEL_COLUMNS)
+
+_JOB_NAME_INDEX = COLUMN_INDEX['Job Name']
+
+# 'Filters ' sheet data rows: (Filter Name, Filter Type) per custom filter
+_FILTER_ROWS = tuple((filter_def["name"], filter_def["type"]) for filter_def in CUSTOM_FILTERS)
+
+
+def _text_length(value) -> int:
+    """Displayed length of a cell value (strings skip the str() round trip)"""
+    return len(value) if type(value) is str else len(str(value))
+
+
+def _blank_non_finite(row: Sequence) -> Sequence:
+    """The row with NaN/inf floats replaced by None, so every writer leaves them blank"""
+    if any(isinstance(value, float) and not math.isfinite(value) for value in row):
+        return [None if isinstance(value, float) and not math.isfinite(value) else value for value in row]
+    return row
+
+
+# Systems below which format_rows stays serial (pool startup outweighs the gain)
+PARALLEL_MIN_SYSTEMS = 100
+
+# Systems handed to a worker process per task
+PARALLEL_CHUNK_SIZE = 64
+
+# Formatter owned by each worker process (see _init_format_worker)
+_worker_formatter: Optional[ExcelFormatter] = None
+
+
+def _init_format_worker(costbook_title: str, build_descriptions: bool) -> None:
+    """Build the formatter a worker process reuses for every chunk"""
+    global _worker_formatter
+    _worker_formatter = ExcelFormatter(costbook_title, build_descriptions=build_descriptions)
+
+
+def _format_system_chunk(systems: List[Dict]) -> List[List]:
+    """Format a chunk of systems into positional rows in a worker process"""
+    return list(_worker_formatter.iter_rows(systems))
+
+
+# Low-cardinality labels the formatter compares and looks up for every system/component
+_INTERNED_ATTRS = ('system_type', 'stages', 'configuration')
+
+
+def _intern_labels(silver_data: Dict) -> None:
+    """
+    Intern repeated label strings in place
+
+    JSON decoding allocates a fresh string per value; interned copies let the
+    formatter's equality checks and dispatch lookups match on identity.
+    """
+    systems = silver_data.get('systems')
+    if not isinstance(systems, list):
+        return
+
+    for system in systems:
+        if isinstance(system, dict):
+            _intern_system_labels(system)
+
+
+def _intern_system_labels(system: Dict) -> None:
+    """Intern one system's label strings in place (see _intern_labels)"""
+    attrs = system.get('system_attributes')
+    if isinstance(attrs, dict):
+        for key in _INTERNED_ATTRS:
+            value = attrs.get(key)
+            if type(value) is str:
+                attrs[key] = sys.intern(value)
+    components = system.get('components')
+    if isinstance(components, list):
+        for component in components:
+            if isinstance(component, dict):
+                comp_type = component.get('component_type')
+                if type(comp_type) is str:
+                    component['component_type'] = sys.intern(comp_type)
+
 
 class SilverToExcelLoader:
     """Loads silver JSON and generates Excel workbook"""
@@ -34,69 +137,236 @@ class SilverToExcelLoader:
         self.formatter = ExcelFormatter(costbook_title)
 
     def load_silver_json(self, input_path: str) -> Dict:
-        """Load silver JSON file"""
-        with open(input_path, 'r') as f:
-            return json.load(f)
+        """Load silver JSON file (repeated label strings are interned)"""
+        raw = Path(input_path).read_bytes()
+        try:
+            silver_data = orjson.loads(raw)
+        except orjson.JSONDecodeError:
+            # json.dump writes NaN/Infinity for missing floats, which orjson rejects
+            silver_data = json.loads(raw)
+        if isinstance(silver_data, dict):
+            _intern_labels(silver_data)
+        return silver_data
+
+    def iter_silver_systems(self, input_path: str) -> Iterator[Dict]:
+        """
+        Stream systems out of a silver JSON file (repeated label strings are interned)
 
-    def process_systems(self, silver_data: Dict) -> List[Dict]:
+        The parsed JSON is never held whole, but convert still buffers every
+        formatted row, so peak memory grows with the workbook. Requires ijson,
+        which raises ijson.JSONError on input it cannot parse, such as the NaN
+        literals json.dump writes for missing floats.
+        """
+        with open(input_path, 'rb') as f:
+            for system in ijson.items(f, 'systems.item', use_float=True):
+                if isinstance(system, dict):
+                    _intern_system_labels(system)
+                yield system
+
+    def _iter_systems(self, input_path: str) -> Iterator[Dict]:
+        """
+        Systems from a silver JSON file, streamed when ijson can parse it
+
+        If streaming fails partway, the file is loaded whole and only the
+        systems not yet yielded follow, so none is formatted twice.
+        """
+        streamed = 0
+        if _ijson_available:
+            try:
+                for system in self.iter_silver_systems(input_path):
+                    yield system
+                    streamed += 1
+                return
+            except ijson.JSONError as e:
+                print(f"Warning: Could not stream silver JSON, loading it whole: {e}")
+
+        silver_data = self.load_silver_json(input_path)
+        yield from silver_data.get('systems', [])[streamed:]
+
+    def process_systems(self, silver_data: Dict, max_workers: Optional[int] = 1) -> List[Dict]:
         """
         Process all systems and generate row data
 
         Args:
             silver_data: Silver JSON data
+            max_workers: Worker processes to format with (see format_rows)
 
         Returns:
             List of row dicts for the main sheet
         """
-        systems = silver_data.get('systems', [])
-        all_rows = []
+        rows = self.format_rows(silver_data.get('systems', []), max_workers)
+        return [dict(zip(EXCEL_COLUMNS, row)) for row in rows]
 
-        for system in systems:
-            try:
-                rows = self.formatter.format_system(system)
-                all_rows.extend(rows)
-            except Exception as e:
-                print(f"Warning: Error formatting system {system.get('system_id', 'unknown')}: {e}")
-                continue
+    def format_rows(self, systems: Iterable[Dict], max_workers: Optional[int] = 1) -> List[List]:
+        """
+        Format systems into positional rows (EXCEL_COLUMNS order)
 
-        return all_rows
+        Args:
+            systems: System dicts from silver JSON
+            max_workers: Worker processes to format with (None = one per CPU);
+                inputs under PARALLEL_MIN_SYSTEMS systems are formatted serially
 
-    def create_excel(self, rows: List[Dict], output_path: str):
+        Returns:
+            List of row lists, in system then component order
+        """
+        if max_workers == 1:
+            return list(self.formatter.iter_rows(systems))
+
+        # Workers need the systems in memory to split them into chunks
+        systems = list(systems)
+        if len(systems) < PARALLEL_MIN_SYSTEMS:
+            return list(self.formatter.iter_rows(systems))
+
+        chunks = [
+            systems[i:i + PARALLEL_CHUNK_SIZE]
+            for i in range(0, len(systems), PARALLEL_CHUNK_SIZE)
+        ]
+
+        # Spawned (not forked) workers, since the API runs loaders on threads
+        rows = []
+        with ProcessPoolExecutor(
+            max_workers=max_workers,
+            mp_context=multiprocessing.get_context('spawn'),
+            initializer=_init_format_worker,
+            initargs=(self.costbook_title, self.formatter.build_descriptions)
+        ) as executor:
+            for chunk_rows in executor.map(_format_system_chunk, chunks):
+                rows.extend(chunk_rows)
+        return rows
+
+    def create_excel(self, rows: Sequence, output_path: str) -> int:
         """
         Create Excel workbook with two sheets
 
         Args:
-            rows: List of row dicts
+            rows: Row dicts (see process_systems), or lists in EXCEL_COLUMNS
+                order as streamed by ExcelFormatter.iter_rows
             output_path: Path to output Excel file
+
+        Returns:
+            Number of data rows written
         """
-        # Ensure output directory exists
-        os.makedirs(os.path.dirname(output_path), exist_ok=True)
+        if rows and isinstance(rows[0], dict):
+            rows = [_row_values(row) for row in rows]
+        system_count = self._write_workbook(rows, output_path)
 
-        # Create writer object
-        with pd.ExcelWriter(output_path, engine='openpyxl') as writer:
-            # Create filters sheet first
-            self._create_filters_sheet(writer)
+        print(f"Excel file created: {output_path}")
+        print(f"Total rows: {len(rows)}")
+        print(f"Total systems: {system_count}")
 
-            # Create main sheet
-            self._create_main_sheet(rows, writer)
+        return len(rows)
 
-        # Apply additional formatting
-        self._apply_formatting(output_path)
+    def _write_workbook(self, rows: List[Sequence], output_path: str) -> int:
+        """
+        Write the Filters and main sheets in a single streaming pass
 
-        print(f"Excel file created: {output_path}")
-        print(f"Total rows: {len(rows)}")
-        print(f"Total systems: {len(set(row['Job Name'] for row in rows))}")
+        Uses xlsxwriter in constant_memory mode when it is installed (rows are
+        flushed to disk as they are written), otherwise an openpyxl write-only
+        workbook. Either way the bold header rows and column widths are set
+        while writing, so the file is saved once and never reloaded.
+
+        Args:
+            rows: Data rows as sequences in EXCEL_COLUMNS order
+            output_path: Path to output Excel file
+
+        Returns:
+            Number of distinct job names (systems) among the rows
+        """
+        # Ensure output directory exists
+        os.makedirs(os.path.dirname(output_path), exist_ok=True)
 
-    def _create_main_sheet(self, rows: List[Dict], writer: pd.ExcelWriter):
-        """Create the main 'Flatrate Jobs & Catagories' sheet"""
+        header_rows = [EXCEL_COLUMN_DESCRIPTIONS, EXCEL_COLUMNS, self._filter_labels()]
 
-        # Create header row with descriptions
-        header_df = pd.DataFrame([EXCEL_COLUMN_DESCRIPTIONS], columns=EXCEL_COLUMNS)
+        # Missing floats arrive as NaN (json.dump writes them); xlsxwriter rejects
+        # NaN/inf, and the cells should be blank like the pandas output was
+        rows = [_blank_non_finite(row) for row in rows]
 
-        # Create column names row
-        columns_df = pd.DataFrame([EXCEL_COLUMNS], columns=EXCEL_COLUMNS)
+        # Column widths must be set before the first row is written.
+        # The same column scan counts distinct job names for the summary
+        widths = []
+        system_count = 0
+        for i, column in enumerate(zip(*header_rows, *rows)):
+            width = max(map(_text_length, filter(None, column)), default=0)
+            widths.append(min(width + 2, 50))
+            if i == _JOB_NAME_INDEX:
+                system_count = len(set(column[len(header_rows):]))
 
-        # Create filter labels row (dashes for standard columns, filter names for custom filters)
+        if _xlsxwriter_available:
+            self._write_with_xlsxwriter(header_rows, rows, widths, output_path)
+        else:
+            self._write_with_openpyxl(header_rows, rows, widths, output_path)
+
+        return system_count
+
+    @staticmethod
+    def _write_with_xlsxwriter(header_rows: List[Sequence], rows: List[Sequence],
+                               widths: List[int], output_path: str):
+        """Stream both sheets with xlsxwriter (see _write_workbook)"""
+        # Cell text is written as-is, never turned into hyperlinks
+        wb = xlsxwriter.Workbook(output_path, {'constant_memory': True, 'strings_to_urls': False})
+        bold = wb.add_format({'bold': True})
+
+        # Filters sheet first (note the space after 'Filters')
+        ws = wb.add_worksheet('Filters ')
+        ws.write_row(0, 0, FILTER_COLUMNS)
+        ws.write_row(1, 0, FILTER_HEADER, bold)
+        for r, filter_row in enumerate(_FILTER_ROWS, start=2):
+            ws.write_row(r, 0, filter_row)
+
+        # Main sheet; widths in pixels (7 per character) so the stored
+        # width matches the character count exactly
+        ws = wb.add_worksheet('Flatrate Jobs & Catagories')
+        for i, width in enumerate(widths):
+            ws.set_column_pixels(i, i, width * 7)
+
+        # Empty strings and None are skipped, leaving blank cells
+        ws.write_row(0, 0, header_rows[0])
+        ws.write_row(1, 0, header_rows[1], bold)
+        ws.write_row(2, 0, header_rows[2])
+        for r, row in enumerate(rows, start=len(header_rows)):
+            ws.write_row(r, 0, row)
+
+        wb.close()
+
+    def _write_with_openpyxl(self, header_rows: List[Sequence], rows: List[Sequence],
+                             widths: List[int], output_path: str):
+        """Stream both sheets with an openpyxl write-only workbook (see _write_workbook)"""
+        wb = Workbook(write_only=True)
+
+        # Filters sheet first (note the space after 'Filters')
+        ws = wb.create_sheet('Filters ')
+        ws.append(FILTER_COLUMNS)
+        ws.append(self._bold_cells(ws, FILTER_HEADER))
+        for filter_row in _FILTER_ROWS:
+            ws.append(filter_row)
+
+        # Main sheet
+        ws = wb.create_sheet('Flatrate Jobs & Catagories')
+        for i, width in enumerate(widths, start=1):
+            ws.column_dimensions[get_column_letter(i)].width = width
+
+        # Empty strings are left as blank cells rather than empty text cells
+        ws.append([value or None for value in header_rows[0]])
+        ws.append(self._bold_cells(ws, header_rows[1]))
+        ws.append([value or None for value in header_rows[2]])
+        for row in rows:
+            ws.append([None if value == '' else value for value in row])
+
+        wb.save(output_path)
+
+    @staticmethod
+    def _bold_cells(ws, values) -> List[WriteOnlyCell]:
+        """Wrap values as bold cells for a write-only worksheet"""
+        cells = []
+        for value in values:
+            cell = WriteOnlyCell(ws, value=value)
+            cell.font = _BOLD_FONT
+            cells.append(cell)
+        return cells
+
+    @staticmethod
+    def _filter_labels() -> List[str]:
+        """Filter label row: dashes for columns A-T, then custom filter names, padded to width"""
         filter_labels = ['-'] * 20  # Dashes for columns A-T (indices 0-19)
         # Add filter names from CUSTOM_FILTERS for columns U onwards
         for filter_def in CUSTOM_FILTERS:
@@ -104,104 +374,19 @@ class SilverToExcelLoader:
         # Pad with empty strings if we have fewer than 12 custom filters
         while len(filter_labels) < len(EXCEL_COLUMNS):
             filter_labels.append('')
+        return filter_labels
 
-        filter_labels_df = pd.DataFrame([filter_labels], columns=EXCEL_COLUMNS)
-
-        # Create data rows
-        if rows:
-            data_df = pd.DataFrame(rows, columns=EXCEL_COLUMNS)
-        else:
-            data_df = pd.DataFrame(columns=EXCEL_COLUMNS)
-
-        # Combine all rows: descriptions, column names, filter labels, then data
-        combined_df = pd.concat([header_df, columns_df, filter_labels_df, data_df], ignore_index=True)
-
-        # Write to Excel
-        combined_df.to_excel(
-            writer,
-            sheet_name='Flatrate Jobs & Catagories',
-            index=False,
-            header=False
-        )
-
-    def _create_filters_sheet(self, writer: pd.ExcelWriter):
-        """Create the 'Filters ' sheet"""
-
-        # Create header row with descriptions
-        header_row = pd.DataFrame([FILTER_COLUMNS], columns=FILTER_HEADER)
-
-        # Create column names row
-        columns_row = pd.DataFrame([FILTER_HEADER], columns=FILTER_HEADER)
-
-        # Create filter data rows
-        filter_data = []
-        for filter_def in CUSTOM_FILTERS:
-            filter_data.append({
-                "Filter Name": filter_def["name"],
-                "Filter Type": filter_def["type"]
-            })
-
-        if filter_data:
-            data_df = pd.DataFrame(filter_data, columns=FILTER_HEADER)
-        else:
-            data_df = pd.DataFrame(columns=FILTER_HEADER)
-
-        # Combine all rows
-        combined_df = pd.concat([header_row, columns_row, data_df], ignore_index=True)
-
-        # Write to Excel (note the space after 'Filters')
-        combined_df.to_excel(
-            writer,
-            sheet_name='Filters ',
-            index=False,
-            header=False
-        )
-
-    def _apply_formatting(self, output_path: str):
-        """Apply additional formatting to the Excel file"""
-        try:
-            wb = load_workbook(output_path)
-
-            # Format main sheet
-            if 'Flatrate Jobs & Catagories' in wb.sheetnames:
-                ws = wb['Flatrate Jobs & Catagories']
-
-                # Bold the column names row (row 2)
-                for cell in ws[2]:
-                    cell.font = Font(bold=True)
-
-                # Auto-adjust column widths (basic)
-                for column in ws.columns:
-                    max_length = 0
-                    column_letter = column[0].column_letter
-                    for cell in column:
-                        try:
-                            if cell.value:
-                                max_length = max(max_length, len(str(cell.value)))
-                        except:
-                            pass
-                    adjusted_width = min(max_length + 2, 50)
-                    ws.column_dimensions[column_letter].width = adjusted_width
-
-            # Format filters sheet
-            if 'Filters ' in wb.sheetnames:
-                ws = wb['Filters ']
-
-                # Bold the column names row (row 2)
-                for cell in ws[2]:
-                    cell.font = Font(bold=True)
-
-            wb.save(output_path)
-        except Exception as e:
-            print(f"Warning: Could not apply formatting: {e}")
-
-    def convert(self, input_path: str, output_path: str = None):
+    def convert(self, input_path: str, output_path: str = None, max_workers: Optional[int] = 1):
         """
         Main conversion method
 
+        Systems are formatted into positional rows as they are parsed (see
+        _iter_systems); row dicts are never built.
+
         Args:
             input_path: Path to silver JSON file
             output_path: Path to output Excel file (optional)
+            max_workers: Worker processes to format with (see format_rows)
         """
         # Generate output path if not provided
         if output_path is None:
@@ -211,15 +396,15 @@ class SilverToExcelLoader:
             output_path = output_dir / f"{input_file.stem}_output.xlsx"
 
         print(f"Loading silver JSON: {input_path}")
-        silver_data = self.load_silver_json(input_path)
+        output_path = str(output_path)
 
-        print(f"Processing {len(silver_data.get('systems', []))} systems...")
-        rows = self.process_systems(silver_data)
+        print("Processing systems...")
+        rows = self.format_rows(self._iter_systems(input_path), max_workers)
 
-        print(f"Creating Excel file...")
-        self.create_excel(rows, str(output_path))
+        print("Creating Excel file...")
+        self.create_excel(rows, output_path)
 
-        return str(output_path)
+        return output_path
 
 
 def main(input_path: str, output_path: str = None, costbook_title: str = "WinSupply"):
@@ -239,8 +424,6 @@ def main(input_path: str, output_path: str = None, costbook_title: str = "WinSup
 
 
 if __name__ == "__main__":
-    import sys
-
     if len(sys.argv) < 2:
         print("Usage: python -m src.stage3_loader.silver_to_excel_loader <input_json> [output_xlsx] [costbook_title]")
         sys.exit(1)
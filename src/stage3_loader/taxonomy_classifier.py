@@ -1,23 +1,118 @@
 """
 Taxonomy Classifier v2.0 - Categorizes HVAC systems and standalone components
 """
-import json
+import re
+from functools import lru_cache
+from pathlib import Path
 from typing import Dict, List, Optional, Tuple
+
+import orjson
+
 from .config import TAXONOMY_PATH
 
+# Lowercased text tokens checked during system classification
+_DUCTLESS_RE = re.compile(r'ductless|mini')
+_VARIABLE_STAGE_RE = re.compile(r'variable|inverter|modulating')
+
+# Standalone component subcategory tokens (descriptions lowercased, furnace models as-is)
+_HEAT_PUMP_DESC_RE = re.compile(r'heat pump|heating')
+_VARIABLE_SPEED_DESC_RE = re.compile(r'variable|ecm')
+_HIGH_EFFICIENCY_MODEL_RE = re.compile(r'9[5-8]')
+_CASED_DESC_RE = re.compile(r'cased|cabinet')
+_UNCASED_DESC_RE = re.compile(r'uncased|bare')
+
+# Level 1 component category display name -> level_2 subcategory config key
+_LEVEL1_CONFIG_KEYS = {
+    'Condensers': 'condensers',
+    'Air Handlers': 'air_handlers',
+    'Furnaces': 'furnaces',
+    'Evaporator Coils': 'evaporator_coils',
+    'Ductless Indoor Units': 'ductless_indoor',
+    'Heat Kits': 'default',
+    'Thermostats & Controls': 'default',
+    'Accessories': 'default'
+}
+
+# Distinct model/description texts remembered by the subcategory helpers below
+_SUBCAT_CACHE_SIZE = 4096
+
+
+@lru_cache(maxsize=_SUBCAT_CACHE_SIZE)
+def _condenser_subcat(model: str, description: str) -> str:
+    """Condenser subcategory from model and description text (same SKU repeats across systems)"""
+    # Check for heat pump indicators
+    if 'HP' in model.upper() or _HEAT_PUMP_DESC_RE.search(description.lower()):
+        return 'Heat Pump Condensers'
+    else:
+        return 'AC Condensers'
+
+
+@lru_cache(maxsize=_SUBCAT_CACHE_SIZE)
+def _air_handler_subcat(model: str, description: str) -> str:
+    """Air handler subcategory from model and description text"""
+    description = description.lower()
+
+    # Check for variable speed indicators
+    if 'vs' in model.lower() or _VARIABLE_SPEED_DESC_RE.search(description):
+        return 'Variable Speed Air Handlers'
+    elif 'multi' in description:
+        return 'Multi-Speed Air Handlers'
+    else:
+        return 'Single Speed Air Handlers'
+
+
+@lru_cache(maxsize=_SUBCAT_CACHE_SIZE)
+def _furnace_subcat_from_model(model: str) -> str:
+    """Furnace subcategory inferred from the model number when AFUE is missing"""
+    if _HIGH_EFFICIENCY_MODEL_RE.search(model):
+        return 'High Efficiency (95%+ AFUE)'
+    elif '80' in model:
+        return 'Standard Efficiency (80% AFUE)'
+
+    # Default to standard efficiency
+    return 'Standard Efficiency (80% AFUE)'
+
+
+@lru_cache(maxsize=_SUBCAT_CACHE_SIZE)
+def _coil_subcat(description: str) -> str:
+    """Coil subcategory from description text"""
+    description = description.lower()
+
+    if _CASED_DESC_RE.search(description):
+        return 'Cased Coils'
+    elif _UNCASED_DESC_RE.search(description):
+        return 'Uncased Coils'
+    else:
+        # Default to cased
+        return 'Cased Coils'
+
 
 class TaxonomyClassifier:
     """Classifies HVAC systems and components based on taxonomy v2.0"""
 
     def __init__(self, taxonomy_path: str = TAXONOMY_PATH):
         """Initialize classifier with taxonomy configuration"""
-        with open(taxonomy_path, 'r') as f:
-            self.taxonomy = json.load(f)
+        self.taxonomy = orjson.loads(Path(taxonomy_path).read_bytes())
 
         self.systems_config = self.taxonomy.get('systems', {})
         self.components_config = self.taxonomy.get('components', {})
         self.filters_config = self.taxonomy.get('filters', {})
 
+        # component_type -> Level 1 category display name (first listing category wins)
+        self._component_categories: Dict[str, str] = {}
+        for category in self.components_config.get('level_1', {}).get('categories', []):
+            display_name = category.get('display_name', '-')
+            for comp_type in category.get('component_types', []):
+                self._component_categories.setdefault(comp_type, display_name)
+
+        # Level 1 categories with specific Level 2 logic; others use the config default
+        self._subcat_classifiers = {
+            'Condensers': self._classify_condenser_subcat,
+            'Air Handlers': self._classify_air_handler_subcat,
+            'Furnaces': self._classify_furnace_subcat,
+            'Evaporator Coils': self._classify_coil_subcat,
+        }
+
     def classify_system(self, system: Dict) -> List[str]:
         """
         Classify a system or component into taxonomy categories
@@ -28,13 +123,32 @@ class TaxonomyClassifier:
         Returns:
             List of category display names [level1, level2, ...]
         """
+        # Component type counts are shared by the checks below (one pass)
+        components = system.get('components', [])
+        type_counts = self._count_component_types(components) if isinstance(components, list) else None
+
         # Determine if this is a complete system or standalone component
-        if self._is_complete_system(system):
-            return self._classify_complete_system(system)
+        if self._is_complete_system(system, type_counts):
+            return self._classify_complete_system(system, type_counts)
         else:
             return self._classify_standalone_component(system)
 
-    def _is_complete_system(self, system: Dict) -> bool:
+    @staticmethod
+    def _count_component_types(components) -> Dict[str, int]:
+        """Count ODU, Furnace and IDU components in one pass (non-dict entries are skipped)"""
+        counts = {'ODU': 0, 'Furnace': 0, 'IDU': 0}
+        for c in components:
+            if isinstance(c, dict):
+                comp_type = c.get('component_type')
+                if comp_type == 'ODU':
+                    counts['ODU'] += 1
+                elif comp_type == 'Furnace':
+                    counts['Furnace'] += 1
+                elif comp_type == 'IDU':
+                    counts['IDU'] += 1
+        return counts
+
+    def _is_complete_system(self, system: Dict, type_counts: Optional[Dict[str, int]] = None) -> bool:
         """
         Determine if this is a complete HVAC system
 
@@ -42,6 +156,8 @@ class TaxonomyClassifier:
         - Valid system_attributes dict
         - Key attributes like tonnage, system_type, or stages
         - An outdoor unit component (ODU)
+
+        type_counts is the result of _count_component_types, if already computed.
         """
         attrs = system.get('system_attributes')
 
@@ -49,32 +165,30 @@ class TaxonomyClassifier:
             return False
 
         # Check for outdoor unit component - REQUIRED for complete systems
-        components = system.get('components', [])
-        has_outdoor_unit = any(
-            c.get('component_type') == 'ODU'
-            for c in components
-            if isinstance(c, dict)
-        )
+        if type_counts is None:
+            type_counts = self._count_component_types(system.get('components', []))
+        has_outdoor_unit = type_counts['ODU'] > 0
 
         # If no outdoor unit, this is a standalone component
         if not has_outdoor_unit:
             return False
 
-        # Check for key system attributes
-        has_tonnage = attrs.get('tonnage') is not None and attrs.get('tonnage') != 0
-        has_system_type = attrs.get('system_type') is not None
-        has_stages = attrs.get('stages') is not None
-        has_seer = attrs.get('seer2') is not None or attrs.get('seer') is not None
+        # Check for key system attributes (a null value counts as missing)
+        tonnage = attrs.get('tonnage')
+        key_attrs_count = (
+            (tonnage is not None and tonnage != 0)
+            + (attrs.get('system_type') is not None)
+            + (attrs.get('stages') is not None)
+            + (attrs.get('seer2') is not None or attrs.get('seer') is not None)
+        )
 
         # If has ODU + at least 2 key attributes, it's a complete system
-        key_attrs_count = sum([has_tonnage, has_system_type, has_stages, has_seer])
-
         return key_attrs_count >= 2
 
-    def _classify_complete_system(self, system: Dict) -> List[str]:
+    def _classify_complete_system(self, system: Dict, type_counts: Optional[Dict[str, int]] = None) -> List[str]:
         """Classify a complete HVAC system"""
         # Level 1: System Type
-        level1 = self._classify_system_type(system)
+        level1 = self._classify_system_type(system, type_counts)
 
         # Level 2: Staging (v3.0 simplified)
         level2 = self._classify_staging(system)
@@ -100,7 +214,7 @@ class TaxonomyClassifier:
 
         return [level1, level2]
 
-    def _classify_system_type(self, system: Dict) -> str:
+    def _classify_system_type(self, system: Dict, type_counts: Optional[Dict[str, int]] = None) -> str:
         """Classify Level 1 system type using priority logic (v3.0)"""
         attrs = system.get('system_attributes') or {}
         if not isinstance(attrs, dict):
@@ -112,26 +226,23 @@ class TaxonomyClassifier:
 
         # Extract key attributes
         system_type = str(attrs.get('system_type') or '').upper()
+        system_type_lower = system_type.lower()
         configuration = str(attrs.get('configuration') or '').lower()
         has_hspf = attrs.get('hspf2') is not None or attrs.get('hspf') is not None
+        is_heat_pump = system_type == 'HP' or has_hspf or 'heat pump' in system_type_lower
 
         # Check component types
-        has_furnace = any(
-            c.get('component_type') == 'Furnace'
-            for c in components if isinstance(c, dict)
-        )
-        has_idu = any(
-            c.get('component_type') == 'IDU'
-            for c in components if isinstance(c, dict)
-        )
+        if type_counts is None:
+            type_counts = self._count_component_types(components)
+        idu_count = type_counts['IDU']
+        has_furnace = type_counts['Furnace'] > 0
+        has_idu = idu_count > 0
 
         # Apply classification priority (v3.0 - granular packaged types)
 
-        # 1. Packaged Units (v3.0: split into AC/HP/Gas)
-        if 'package' in configuration or 'packaged' in configuration:
+        # 1. Packaged Units (v3.0: split into AC/HP/Gas); 'package' also covers 'packaged'
+        if 'package' in configuration:
             # Determine packaged type
-            is_heat_pump = system_type == 'HP' or has_hspf or 'heat pump' in system_type.lower()
-
             if is_heat_pump:
                 return 'Packaged Heat Pump'
             elif has_furnace:
@@ -140,19 +251,13 @@ class TaxonomyClassifier:
                 return 'Packaged AC'
 
         # 2. Ductless systems
-        if 'ductless' in system_type.lower() or 'mini' in system_type.lower() or has_idu:
-            idu_count = sum(
-                1 for c in components
-                if isinstance(c, dict) and c.get('component_type') == 'IDU'
-            )
+        if has_idu or _DUCTLESS_RE.search(system_type_lower):
             if idu_count > 1:
                 return 'Ductless Multi Zone'
             else:
                 return 'Ductless Single Zone'
 
         # 3. Heat Pump systems
-        is_heat_pump = system_type == 'HP' or has_hspf or 'heat pump' in system_type.lower()
-
         if is_heat_pump:
             if has_furnace:
                 return 'Split Dual Fuel'
@@ -181,7 +286,7 @@ class TaxonomyClassifier:
             return 'Single Stage'
         elif 'two' in stages or '2' in stages:
             return 'Two Stage'
-        elif 'variable' in stages or 'inverter' in stages or 'modulating' in stages:
+        elif _VARIABLE_STAGE_RE.search(stages):
             return 'Variable Speed'
         else:
             # Default based on SEER2 if available
@@ -197,74 +302,41 @@ class TaxonomyClassifier:
         """Classify standalone component into Level 1 category"""
         comp_type = str(component.get('component_type') or '')
 
-        # Map component_type to category using taxonomy
-        categories = self.components_config.get('level_1', {}).get('categories', [])
-
-        for category in categories:
-            if comp_type in category.get('component_types', []):
-                return category.get('display_name', '-')
-
-        # Default to Accessories
-        return 'Accessories'
+        # Map component_type to category using taxonomy (default to Accessories)
+        return self._component_categories.get(comp_type, 'Accessories')
 
     def _classify_component_subcategory(self, component: Dict, level1: str) -> str:
         """Classify standalone component into Level 2 subcategory"""
+        # Apply specific logic based on component type
+        classify = self._subcat_classifiers.get(level1)
+        if classify is not None:
+            return classify(component)
+
         # Get subcategories for this component category
         subcats_config = self.components_config.get('level_2', {}).get('subcategories', {})
 
         # Map level1 display name to config key
-        level1_key_map = {
-            'Condensers': 'condensers',
-            'Air Handlers': 'air_handlers',
-            'Furnaces': 'furnaces',
-            'Evaporator Coils': 'evaporator_coils',
-            'Ductless Indoor Units': 'ductless_indoor',
-            'Heat Kits': 'default',
-            'Thermostats & Controls': 'default',
-            'Accessories': 'default'
-        }
-
-        config_key = level1_key_map.get(level1, 'default')
+        config_key = _LEVEL1_CONFIG_KEYS.get(level1, 'default')
         subcats = subcats_config.get(config_key, subcats_config.get('default', []))
 
-        # Apply specific logic based on component type
-        if level1 == 'Condensers':
-            return self._classify_condenser_subcat(component)
-        elif level1 == 'Air Handlers':
-            return self._classify_air_handler_subcat(component)
-        elif level1 == 'Furnaces':
-            return self._classify_furnace_subcat(component)
-        elif level1 == 'Evaporator Coils':
-            return self._classify_coil_subcat(component)
-        else:
-            # Default subcategory
-            if subcats:
-                return subcats[0].get('display_name', 'Miscellaneous')
-            return 'Miscellaneous'
+        # Default subcategory
+        if subcats:
+            return subcats[0].get('display_name', 'Miscellaneous')
+        return 'Miscellaneous'
 
     def _classify_condenser_subcat(self, component: Dict) -> str:
         """Classify condenser into AC vs Heat Pump"""
-        model = str(component.get('model_number') or '').upper()
-        description = str(component.get('description') or '').lower()
-
-        # Check for heat pump indicators
-        if 'HP' in model or 'heat pump' in description or 'heating' in description:
-            return 'Heat Pump Condensers'
-        else:
-            return 'AC Condensers'
+        return _condenser_subcat(
+            str(component.get('model_number') or ''),
+            str(component.get('description') or '')
+        )
 
     def _classify_air_handler_subcat(self, component: Dict) -> str:
         """Classify air handler by speed type"""
-        description = str(component.get('description') or '').lower()
-        model = str(component.get('model_number') or '').lower()
-
-        # Check for variable speed indicators
-        if 'variable' in description or 'vs' in model or 'ecm' in description:
-            return 'Variable Speed Air Handlers'
-        elif 'multi' in description:
-            return 'Multi-Speed Air Handlers'
-        else:
-            return 'Single Speed Air Handlers'
+        return _air_handler_subcat(
+            str(component.get('model_number') or ''),
+            str(component.get('description') or '')
+        )
 
     def _classify_furnace_subcat(self, component: Dict) -> str:
         """Classify furnace by AFUE efficiency"""
@@ -281,38 +353,28 @@ class TaxonomyClassifier:
                 return 'Standard Efficiency (80% AFUE)'
 
         # Try to infer from model number
-        model = str(component.get('model_number') or '')
-        if '95' in model or '96' in model or '97' in model or '98' in model:
-            return 'High Efficiency (95%+ AFUE)'
-        elif '80' in model:
-            return 'Standard Efficiency (80% AFUE)'
-
-        # Default to standard efficiency
-        return 'Standard Efficiency (80% AFUE)'
+        return _furnace_subcat_from_model(str(component.get('model_number') or ''))
 
     def _classify_coil_subcat(self, component: Dict) -> str:
         """Classify evaporator coil as cased vs uncased"""
-        description = str(component.get('description') or '').lower()
+        return _coil_subcat(str(component.get('description') or ''))
 
-        if 'cased' in description or 'cabinet' in description:
-            return 'Cased Coils'
-        elif 'uncased' in description or 'bare' in description:
-            return 'Uncased Coils'
-        else:
-            # Default to cased
-            return 'Cased Coils'
-
-    def build_category_string(self, system: Dict) -> str:
+    def build_category_string(self, system: Dict, categories: Optional[List[str]] = None) -> str:
         """
         Build a complete category string for a system
 
         For complete systems: Returns Level 2 pattern string
         For components: Returns Level 2 subcategory
 
+        Args:
+            system: System dict from silver JSON
+            categories: Result of classify_system(system), if already computed
+
         Returns:
             Category string like "GXV6 Two Stage HP Upflow" or "High Efficiency (95%+ AFUE)"
         """
-        categories = self.classify_system(system)
+        if categories is None:
+            categories = self.classify_system(system)
 
         if len(categories) >= 2:
             return categories[1]
@@ -0,0 +1,55 @@
+"""
+Tests for the Stage 3 silver to Excel loader
+"""
+import functools
+import json
+
+import pytest
+from openpyxl import load_workbook
+
+from src.stage3_loader import excel_formatter
+from src.stage3_loader import silver_to_excel_loader
+from src.stage3_loader.config import COLUMN_INDEX
+from src.stage3_loader.silver_to_excel_loader import SilverToExcelLoader
+from src.stage3_loader.taxonomy_classifier import TaxonomyClassifier
+
+WRITERS = [False]
+if silver_to_excel_loader._xlsxwriter_available:
+    WRITERS.append(True)
+
+
+@pytest.fixture
+def loader(tmp_path, monkeypatch):
+    """Loader whose classifier reads a minimal taxonomy"""
+    taxonomy_path = tmp_path / "taxonomy.json"
+    taxonomy_path.write_text(json.dumps({"systems": {}, "components": {}}))
+    monkeypatch.setattr(
+        excel_formatter, "TaxonomyClassifier",
+        functools.partial(TaxonomyClassifier, str(taxonomy_path))
+    )
+    return SilverToExcelLoader()
+
+
+@pytest.mark.parametrize("use_xlsxwriter", WRITERS)
+def test_nan_rating_is_written_as_blank_cell(loader, tmp_path, monkeypatch, use_xlsxwriter):
+    monkeypatch.setattr(silver_to_excel_loader, "_xlsxwriter_available", use_xlsxwriter)
+
+    silver = {"systems": [{
+        "system_id": "s1",
+        "system_attributes": {"tonnage": 3, "seer2": float("nan")},
+        "components": [
+            {"component_type": "ODU", "model_number": "GSZ140361", "price": 100},
+            {"component_type": "Coil", "model_number": "CAPF3636B6", "price": 50},
+        ],
+    }]}
+    input_path = tmp_path / "silver.json"
+    # json.dump writes the NaN literal, which forces the full-load fallback
+    input_path.write_text(json.dumps(silver))
+    output_path = tmp_path / "out" / "costbook.xlsx"
+
+    loader.convert(str(input_path), str(output_path))
+
+    ws = load_workbook(output_path)["Flatrate Jobs & Catagories"]
+    row = [cell.value for cell in ws[4]]
+    assert row[COLUMN_INDEX["Custom Filter 1"]] == 3
+    assert row[COLUMN_INDEX["Custom Filter 3"]] is None